@@ -4,6 +4,7 @@ Home Assistant Package
 This package provides an API client for interacting with the Smart Home Assistant backend.
 """
 from .client import HomeAssistantClient
+from .async_client import AsyncHomeAssistantClient
 
 # Expose all service classes for direct import
 from .auth_service import AuthService
@@ -0,0 +1,190 @@
+"""
+Async Home Assistant Client
+
+asyncio counterpart of HomeAssistantClient on a shared, pooled httpx.AsyncClient.
+Backend calls get the retry policy of the synchronous session: idempotent
+methods are retried up to MAX_RETRIES times with full-jitter backoff on
+transport errors and RETRY_STATUSES; POST is never retried.
+The schedule and consumable services are the synchronous ones running on an
+async base service: every endpoint method returns a coroutine, so the two
+clients expose exactly the same API and cannot drift apart.
+"""
+import asyncio
+import copy
+import json
+import logging
+import os
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from .base_service import SUPPORTED_METHODS, BaseService
+from .http_session import (
+    CONNECT_TIMEOUT, IDEMPOTENT_METHODS, MAX_RETRIES, POOL_SIZE, READ_TIMEOUT, RETRY_BACKOFF_MAX, RETRY_STATUSES,
+    backoff_delay,
+)
+from .schedule_service import ScheduleService
+from .consumable_service import ConsumableService
+
+# Same timeouts as the synchronous session layer
+HTTP_TIMEOUT = httpx.Timeout(READ_TIMEOUT, connect=CONNECT_TIMEOUT)
+HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv('LINEBOT_HTTP_MAX_CONNECTIONS', '100')),
+    max_keepalive_connections=POOL_SIZE,
+)
+
+
+def create_async_http_client() -> httpx.AsyncClient:
+    """Pooled client meant to be shared by every outbound call of the process."""
+    # Follows redirects like requests does; the services call canonical paths, so this is only a fallback
+    return httpx.AsyncClient(timeout=HTTP_TIMEOUT, limits=HTTP_LIMITS, follow_redirects=True)
+
+
+class AsyncBaseService(BaseService):
+    """BaseService whose make_request is a coroutine running on an httpx.AsyncClient."""
+
+    def __init__(self, client: httpx.AsyncClient, base_url: str, headers: Dict[str, str], logger: logging.Logger):
+        super().__init__(base_url, headers, logger)
+        self.client = client
+
+    async def make_request(self, method: str, endpoint: str, data: Any = None) -> Dict[str, Any]:
+        """Make HTTP request to the backend API."""
+        if method not in SUPPORTED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+        url = f"{self.base_url}{endpoint}"
+        if not self.breaker.allow():
+            return self._unavailable_response(method, url)
+        headers = dict(self.headers)
+        cached = None
+        if method == "GET":
+            with self._etag_lock:
+                cached = self._etag_cache.get(url)
+            if cached:
+                headers["If-None-Match"] = cached[0]
+        recorded = False
+        try:
+            response = await self._send(method, url, headers, data)
+            self.breaker.record_status(response.status_code)
+            recorded = True
+            if response.status_code == 304 and cached:
+                # Unchanged on the server: reuse the body we already have
+                return copy.deepcopy(cached[1])
+            response.raise_for_status()
+
+            # Handle empty responses (like 204 No Content)
+            if response.status_code == 204 or not response.content:
+                return {"success": True, "message": "操作成功完成"}
+
+            try:
+                result = response.json()
+                if method == "GET":
+                    self._remember_etag(url, response, result)
+                return result
+            except json.JSONDecodeError:
+                # If we can't parse JSON but the status is OK, return success
+                return {"success": True, "message": "操作成功完成"}
+
+        except httpx.HTTPError as e:
+            self.logger.error(f"API request error: {e}")
+            return {"error": str(e)}
+        finally:
+            if not recorded:
+                # No response at all (connection error, timeout, cancellation, httpx.InvalidURL, ...);
+                # error statuses were recorded above. Always recording frees a half-open probe slot
+                self.breaker.record_failure()
+
+
+    async def _send(self, method: str, url: str, headers: Dict[str, str], data: Any) -> httpx.Response:
+        """Send one request, retrying idempotent methods like the synchronous session does."""
+        retries = MAX_RETRIES if method in IDEMPOTENT_METHODS else 0
+        attempt = 0
+        while True:
+            delay = None
+            try:
+                # request() rather than delete(), which cannot carry the body of bulk deletes
+                response = await self.client.request(method, url, headers=headers, json=data)
+            except httpx.TransportError as e:
+                if attempt >= retries:
+                    raise
+                self.logger.warning(f"{method} {url} failed ({e}), retrying")
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt >= retries:
+                    return response
+                self.logger.warning(f"{method} {url} returned {response.status_code}, retrying")
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = min(float(retry_after), RETRY_BACKOFF_MAX)
+            await asyncio.sleep(backoff_delay(attempt) if delay is None else delay)
+            attempt += 1
+
+
+class AsyncScheduleService(ScheduleService):
+    """ScheduleService on an AsyncBaseService; every method must be awaited."""
+
+    async def get_all_schedules(self, page_size: int = 100) -> List[Dict[str, Any]]:
+        """Get every schedule by following next_cursor until the last page."""
+        schedules = []
+        cursor = None
+        while True:
+            page = await self.get_schedules_page(cursor=cursor, limit=page_size)
+            if page.get("error"):
+                return page
+            schedules.extend(page.get("items", []))
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return schedules
+
+
+class AsyncConsumableService(ConsumableService):
+    """ConsumableService on an AsyncBaseService; every method must be awaited."""
+
+    async def get_all_consumables(self, page_size: int = 100) -> List[Dict[str, Any]]:
+        """Get every consumable by following next_cursor until the last page."""
+        consumables = []
+        cursor = None
+        while True:
+            page = await self.get_consumables_page(cursor=cursor, limit=page_size)
+            if page.get("error"):
+                return page
+            consumables.extend(page.get("items", []))
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return consumables
+
+
+class AsyncHomeAssistantClient:
+    """Async client for the Smart Home Assistant backend API."""
+
+    def __init__(self, base_url: str, api_key: Optional[str] = None, client: Optional[httpx.AsyncClient] = None):
+        """Initialize with backend API URL, optional API key and an optional shared httpx client."""
+        self.base_url = base_url.rstrip('/')
+        self.api_key = api_key
+        self.headers = {
+            "Content-Type": "application/json"
+        }
+        if api_key:
+            self.headers["Authorization"] = f"Bearer {api_key}"
+        self.logger = logging.getLogger(__name__)
+
+        # A client passed in belongs to the caller, who closes it
+        self._owns_client = client is None
+        self.client = client or create_async_http_client()
+
+        base_service = AsyncBaseService(self.client, self.base_url, self.headers, self.logger)
+        self.schedules = AsyncScheduleService(base_service)
+        self.consumables = AsyncConsumableService(base_service)
+
+    def update_auth_header(self, api_key: str) -> None:
+        """Update authorization header with new API key."""
+        self.api_key = api_key
+        self.headers["Authorization"] = f"Bearer {api_key}"
+
+    async def aclose(self) -> None:
+        if self._owns_client:
+            await self.client.aclose()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
@@ -3,35 +3,73 @@ Base Service
 
 Contains common functionality for all service classes.
 """
+import copy
 import json
 import requests
 import logging
-from typing import Dict, Any
+import threading
+from collections import OrderedDict
+from typing import Dict, Any, Optional
+
+from .circuit_breaker import CircuitBreaker, get_breaker
+from .http_session import get_session
+
+# Number of GET responses kept for conditional (If-None-Match) revalidation
+ETAG_CACHE_SIZE = 128
+SUPPORTED_METHODS = ("GET", "POST", "PUT", "PATCH", "DELETE")
+
 
 class BaseService:
     """Base service class with common functionality for API calls."""
     
-    def __init__(self, base_url: str, headers: Dict[str, str], logger: logging.Logger):
-        """Initialize with base URL, headers, and logger."""
+    def __init__(self, base_url: str, headers: Dict[str, str], logger: logging.Logger,
+                 session: Optional[requests.Session] = None, breaker: Optional[CircuitBreaker] = None):
+        """Initialize with base URL, headers, logger, and optionally a session and circuit breaker
+        (default: the shared ones)."""
         self.base_url = base_url
         self.headers = headers
         self.logger = logger
+        self.session = session or get_session()
+        self.breaker = breaker or get_breaker("backend")
+        # url -> (etag, parsed body) of recent GET responses
+        self._etag_cache = OrderedDict()
+        self._etag_lock = threading.Lock()
     
     def make_request(self, method: str, endpoint: str, data: Any = None) -> Dict[str, Any]:
         """Make HTTP request to the backend API."""
+        if method not in SUPPORTED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
         url = f"{self.base_url}{endpoint}"
+        if not self.breaker.allow():
+            return self._unavailable_response(method, url)
+        cached = None
+        recorded = False
         try:
             if method == "GET":
-                response = requests.get(url, headers=self.headers)
+                with self._etag_lock:
+                    cached = self._etag_cache.get(url)
+                headers = dict(self.headers)
+                if cached:
+                    headers["If-None-Match"] = cached[0]
+                response = self.session.get(url, headers=headers)
             elif method == "POST":
-                response = requests.post(url, headers=self.headers, json=data)
+                response = self.session.post(url, headers=self.headers, json=data)
             elif method == "PUT":
-                response = requests.put(url, headers=self.headers, json=data)
+                response = self.session.put(url, headers=self.headers, json=data)
+            elif method == "PATCH":
+                response = self.session.patch(url, headers=self.headers, json=data)
             elif method == "DELETE":
-                response = requests.delete(url, headers=self.headers)
-            else:
-                raise ValueError(f"Unsupported HTTP method: {method}")
+                # Bulk deletes carry the ids in the request body
+                if data is None:
+                    response = self.session.delete(url, headers=self.headers)
+                else:
+                    response = self.session.delete(url, headers=self.headers, json=data)
             
+            self.breaker.record_status(response.status_code)
+            recorded = True
+            if response.status_code == 304 and cached:
+                # Unchanged on the server: reuse the body we already have
+                return copy.deepcopy(cached[1])
             response.raise_for_status()  # Raise exception for error status codes
             
             # Handle empty responses (like 204 No Content)
@@ -39,7 +77,10 @@ class BaseService:
                 return {"success": True, "message": "操作成功完成"}
             
             try:
-                return response.json()
+                result = response.json()
+                if method == "GET":
+                    self._remember_etag(url, response, result)
+                return result
             except json.JSONDecodeError:
                 # If we can't parse JSON but the status is OK, return success
                 if response.status_code < 400:
@@ -51,3 +92,31 @@ class BaseService:
         except requests.exceptions.RequestException as e:
             self.logger.error(f"API request error: {e}")
             return {"error": str(e)}
+        finally:
+            if not recorded:
+                # No response at all (connection error, timeout, any other exception); error
+                # statuses were recorded above. Always recording frees a half-open probe slot
+                self.breaker.record_failure()
+    
+    def _unavailable_response(self, method: str, url: str) -> Any:
+        """Answer for a call refused by the open breaker: the last known body for GETs, else an error."""
+        if method == "GET":
+            with self._etag_lock:
+                cached = self._etag_cache.get(url)
+            if cached:
+                self.logger.warning(f"Backend circuit open, serving cached response for {url}")
+                return copy.deepcopy(cached[1])
+        self.logger.warning(f"Backend circuit open, skipping {method} {url}")
+        return {"error": "Backend temporarily unavailable (circuit open)", "circuit_open": True}
+    
+    def _remember_etag(self, url: str, response, result: Any) -> None:
+        """Keep the body of an ETag-bearing GET so the next call can revalidate it."""
+        etag = response.headers.get("ETag")
+        with self._etag_lock:
+            if not etag:
+                self._etag_cache.pop(url, None)
+                return
+            self._etag_cache[url] = (etag, copy.deepcopy(result))
+            self._etag_cache.move_to_end(url)
+            while len(self._etag_cache) > ETAG_CACHE_SIZE:
+                self._etag_cache.popitem(last=False)
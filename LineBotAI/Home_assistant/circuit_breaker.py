@@ -0,0 +1,176 @@
+"""
+Circuit Breaker
+
+Per-dependency circuit breakers for the LineBot's outbound calls ("backend",
+"openai"). A breaker tracks the outcomes of calls in a sliding time window and
+opens once at least MIN_CALLS calls were made and the failure rate reaches
+FAILURE_RATE. While open, calls are refused at once instead of waiting for
+the struggling dependency to time out. After OPEN_SECONDS it lets a limited
+number of probe calls through (half-open): a successful probe closes the
+breaker, a failed one opens it again.
+
+Only dependency trouble counts as a failure: connection errors, timeouts,
+5xx and 429. Client errors such as 404 or 412 mean the dependency is healthy.
+"""
+import logging
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+WINDOW_SECONDS = float(os.getenv('LINEBOT_BREAKER_WINDOW', '30'))
+MIN_CALLS = int(os.getenv('LINEBOT_BREAKER_MIN_CALLS', '5'))
+FAILURE_RATE = float(os.getenv('LINEBOT_BREAKER_FAILURE_RATE', '0.5'))
+OPEN_SECONDS = float(os.getenv('LINEBOT_BREAKER_OPEN_SECONDS', '30'))
+# Concurrent trial calls allowed while half-open
+HALF_OPEN_PROBES = int(os.getenv('LINEBOT_BREAKER_PROBES', '1'))
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+logger = logging.getLogger(__name__)
+
+
+class CircuitOpenError(Exception):
+    """Raised by callers whose call was refused by an open (or busy half-open) breaker."""
+
+
+def is_dependency_failure(status_code: Optional[int]) -> bool:
+    """Whether a call outcome should count against the dependency; None means no response at all."""
+    return status_code is None or status_code >= 500 or status_code == 429
+
+
+class CircuitBreaker:
+    """Thread-safe failure-rate circuit breaker; also usable from asyncio code."""
+
+    def __init__(self, name: str, window_seconds: float = WINDOW_SECONDS, min_calls: int = MIN_CALLS,
+                 failure_rate: float = FAILURE_RATE, open_seconds: float = OPEN_SECONDS,
+                 half_open_probes: int = HALF_OPEN_PROBES):
+        self.name = name
+        self.window_seconds = window_seconds
+        self.min_calls = max(1, min_calls)
+        self.failure_rate = failure_rate
+        self.open_seconds = open_seconds
+        self.half_open_probes = max(1, half_open_probes)
+        self._lock = threading.Lock()
+        self._state = CLOSED
+        # (time.monotonic(), failed) of recent calls
+        self._outcomes = deque()
+        self._opened_at = 0.0
+        self._opened_at_wall: Optional[datetime] = None
+        self._probes_in_flight = 0
+        self._rejected = 0
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            self._advance(time.monotonic())
+            return self._state
+
+    @property
+    def is_open(self) -> bool:
+        """True unless closed; while half-open only probe calls get through"""
+        return self.state != CLOSED
+
+    def allow(self) -> bool:
+        """Whether a call may go ahead now; every allowed call must be followed by record_*()."""
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            if self._state == CLOSED:
+                return True
+            if self._state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                return True
+            self._rejected += 1
+            return False
+
+    def record_success(self) -> None:
+        self._record(False)
+
+    def record_failure(self) -> None:
+        self._record(True)
+
+    def record_status(self, status_code: Optional[int]) -> None:
+        self._record(is_dependency_failure(status_code))
+
+    def _record(self, failed: bool) -> None:
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            if self._state == HALF_OPEN:
+                self._probes_in_flight = max(0, self._probes_in_flight - 1)
+                if failed:
+                    self._open(now, "probe failed")
+                else:
+                    self._state = CLOSED
+                    self._outcomes.clear()
+                    logger.info(f"Circuit breaker '{self.name}' closed after a successful probe")
+                return
+            if self._state == OPEN:
+                # A call allowed before the breaker opened; its outcome is already stale
+                return
+
+            self._outcomes.append((now, failed))
+            self._trim(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, outcome in self._outcomes if outcome)
+            if failed and calls >= self.min_calls and failures / calls >= self.failure_rate:
+                self._open(now, f"{failures}/{calls} calls failed in the last {self.window_seconds:g}s")
+
+    def _open(self, now: float, reason: str) -> None:
+        self._state = OPEN
+        self._opened_at = now
+        self._opened_at_wall = datetime.now(timezone.utc)
+        self._probes_in_flight = 0
+        self._outcomes.clear()
+        logger.warning(f"Circuit breaker '{self.name}' opened: {reason}")
+
+    def _advance(self, now: float) -> None:
+        if self._state == OPEN and now - self._opened_at >= self.open_seconds:
+            self._state = HALF_OPEN
+            self._probes_in_flight = 0
+            logger.info(f"Circuit breaker '{self.name}' half-open, letting a probe through")
+
+    def _trim(self, now: float) -> None:
+        while self._outcomes and now - self._outcomes[0][0] > self.window_seconds:
+            self._outcomes.popleft()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """State and window statistics for the health endpoint"""
+        with self._lock:
+            now = time.monotonic()
+            self._advance(now)
+            self._trim(now)
+            calls = len(self._outcomes)
+            failures = sum(1 for _, outcome in self._outcomes if outcome)
+            return {
+                "state": self._state,
+                "calls_in_window": calls,
+                "failure_rate": round(failures / calls, 3) if calls else 0.0,
+                "rejected_calls": self._rejected,
+                "opened_at": self._opened_at_wall.isoformat() if self._state != CLOSED and self._opened_at_wall else None,
+                "retry_in_seconds": round(max(0.0, self.open_seconds - (now - self._opened_at)), 1) if self._state == OPEN else None,
+            }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(name: str) -> CircuitBreaker:
+    """The process-wide breaker of a dependency, shared by every client talking to it."""
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            breaker = _breakers[name] = CircuitBreaker(name)
+        return breaker
+
+
+def breaker_snapshots() -> Dict[str, Dict[str, Any]]:
+    with _breakers_lock:
+        breakers = list(_breakers.values())
+    return {breaker.name: breaker.snapshot() for breaker in breakers}
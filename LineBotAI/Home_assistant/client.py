@@ -6,6 +6,8 @@ Main client class that integrates all service modules.
 import logging
 from typing import Optional
 
+import requests
+
 from .base_service import BaseService
 from .auth_service import AuthService
 from .schedule_service import ScheduleService
@@ -16,8 +18,8 @@ from .device_service import DeviceService
 class HomeAssistantClient:
     """Client for interacting with Smart Home Assistant backend API."""
     
-    def __init__(self, base_url: str, api_key: Optional[str] = None):
-        """Initialize the Home Assistant Client with backend API URL and optional API key."""
+    def __init__(self, base_url: str, api_key: Optional[str] = None, session: Optional[requests.Session] = None):
+        """Initialize the Home Assistant Client with backend API URL, optional API key and optional session."""
         self.base_url = base_url.rstrip('/')  # Remove trailing slash if present
         self.api_key = api_key
         self.headers = {
@@ -28,7 +30,7 @@ class HomeAssistantClient:
         self.logger = logging.getLogger(__name__)
         
         # Initialize service objects
-        base_service = BaseService(base_url, self.headers, self.logger)
+        base_service = BaseService(base_url, self.headers, self.logger, session)
         self.auth = AuthService(base_service, self)
         self.schedules = ScheduleService(base_service)
         self.consumables = ConsumableService(base_service)
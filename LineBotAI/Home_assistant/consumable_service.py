@@ -5,6 +5,7 @@ Handles consumable-related operations.
 """
 from typing import Dict, List, Any, Optional
 from datetime import date
+from urllib.parse import quote
 
 from .base_service import BaseService
 
@@ -18,7 +19,39 @@ class ConsumableService:
     
     def get_consumables(self, skip: int = 0, limit: int = 100) -> List[Dict[str, Any]]:
         """Get all consumables with pagination."""
-        endpoint = f"/api/consumables?skip={skip}&limit={limit}"
+        endpoint = f"/api/consumables/?skip={skip}&limit={limit}"
+        return self.base.make_request("GET", endpoint)
+    
+    def get_consumables_page(self, cursor: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """Get one keyset-paginated page of consumables ({"items": [...], "next_cursor": ...})."""
+        endpoint = f"/api/consumables/page?limit={limit}"
+        if cursor:
+            endpoint += f"&cursor={cursor}"
+        return self.base.make_request("GET", endpoint)
+    
+    def get_all_consumables(self, page_size: int = 100) -> List[Dict[str, Any]]:
+        """Get every consumable by following next_cursor until the last page."""
+        consumables = []
+        cursor = None
+        while True:
+            page = self.get_consumables_page(cursor=cursor, limit=page_size)
+            if page.get("error"):
+                return page
+            consumables.extend(page.get("items", []))
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return consumables
+    
+    def get_expiring_consumables(self, within_days: int = 14, category: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Get consumables expiring within the given number of days, soonest first."""
+        endpoint = f"/api/consumables/expiring?within_days={within_days}"
+        if category:
+            endpoint += f"&category={quote(category)}"
+        return self.base.make_request("GET", endpoint)
+    
+    def search_consumables(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Find consumables by name / notes; results carry a relevance score, best first."""
+        endpoint = f"/api/consumables/search?q={quote(query)}&limit={limit}"
         return self.base.make_request("GET", endpoint)
     
     def get_consumable_by_id(self, consumable_id: str) -> Optional[Dict[str, Any]]:
@@ -28,7 +61,7 @@ class ConsumableService:
     
     def create_consumable(self, consumable_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new consumable."""
-        endpoint = "/api/consumables"
+        endpoint = "/api/consumables/"
         return self.base.make_request("POST", endpoint, data=consumable_data)
     
     def update_consumable(self, consumable_id: str, update_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -39,4 +72,26 @@ class ConsumableService:
     def delete_consumable(self, consumable_id: str) -> Dict[str, Any]:
         """Delete a consumable by its ID."""
         endpoint = f"/api/consumables/{consumable_id}"
-        return self.base.make_request("DELETE", endpoint)
\ No newline at end of file
+        return self.base.make_request("DELETE", endpoint)
+    
+    def create_consumables_bulk(self, consumables: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create many consumables in one request; returns per-item results."""
+        endpoint = "/api/consumables/bulk"
+        return self.base.make_request("POST", endpoint, data=consumables)
+    
+    def update_consumables_bulk(self, consumables: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Partially update many consumables in one request; each item must include its id."""
+        endpoint = "/api/consumables/bulk"
+        return self.base.make_request("PATCH", endpoint, data=consumables)
+    
+    def delete_consumables_bulk(self, consumable_ids: List[int]) -> Dict[str, Any]:
+        """Delete many consumables in one request; returns per-id results."""
+        endpoint = "/api/consumables/bulk"
+        return self.base.make_request("DELETE", endpoint, data={"ids": consumable_ids})
+    
+    def renew_consumables(self, consumable_ids: Optional[List[int]] = None, category: Optional[str] = None,
+                          installation_date: Optional[str] = None) -> Dict[str, Any]:
+        """Mark consumables as replaced (installation_date reset, default today) by ids or by category."""
+        endpoint = "/api/consumables/bulk/renew"
+        data = {"ids": consumable_ids, "category": category, "installation_date": installation_date}
+        return self.base.make_request("POST", endpoint, data={k: v for k, v in data.items() if v is not None})
@@ -0,0 +1,90 @@
+"""
+HTTP Session
+
+One shared requests session for every outbound call of the synchronous
+LineBot (backend API, LINE replies, OpenAI). Connections are kept alive in a
+pool per host, so repeated calls skip the TCP and TLS handshakes; every
+request gets connect/read timeouts unless it passes its own; and idempotent
+methods (GET, PUT, DELETE, ...) are retried a bounded number of times with
+jittered exponential backoff on connection errors and 429/502/503/504.
+POST is never retried: a LINE reply token is single-use and a repeated
+completion or create would run twice.
+"""
+import os
+import random
+import threading
+from typing import Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+CONNECT_TIMEOUT = float(os.getenv('LINEBOT_HTTP_CONNECT_TIMEOUT', '5'))
+# Read timeout; long enough for an OpenAI completion
+READ_TIMEOUT = float(os.getenv('LINEBOT_HTTP_TIMEOUT', '30'))
+# Keep-alive connections kept per host
+POOL_SIZE = int(os.getenv('LINEBOT_HTTP_POOL_SIZE', '20'))
+MAX_RETRIES = int(os.getenv('LINEBOT_HTTP_RETRIES', '2'))
+# Base of the exponential backoff in seconds; each wait is drawn from [0, base * 2^n]
+RETRY_BACKOFF = float(os.getenv('LINEBOT_HTTP_BACKOFF', '0.5'))
+RETRY_BACKOFF_MAX = 10.0
+RETRY_STATUSES = (429, 502, 503, 504)
+# urllib3's default allow-list: excludes POST and PATCH
+IDEMPOTENT_METHODS = Retry.DEFAULT_ALLOWED_METHODS
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+class JitteredRetry(Retry):
+    """Retry with "full jitter" backoff, so clients retrying together do not hit the host in lockstep."""
+
+    def get_backoff_time(self) -> float:
+        return random.uniform(0, super().get_backoff_time())
+
+
+def backoff_delay(retry_number: int) -> float:
+    """Full-jitter wait before retry number retry_number (counting from 0), for callers not on a session."""
+    return random.uniform(0, min(RETRY_BACKOFF_MAX, RETRY_BACKOFF * 2 ** retry_number))
+
+
+class TimeoutSession(requests.Session):
+    """Session that applies default connect/read timeouts to every request."""
+
+    def __init__(self, timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)):
+        super().__init__()
+        self.timeout = timeout
+
+    def request(self, method, url, **kwargs):
+        kwargs.setdefault('timeout', self.timeout)
+        return super().request(method, url, **kwargs)
+
+
+def create_session(retries: int = MAX_RETRIES, pool_size: int = POOL_SIZE,
+                   timeout=(CONNECT_TIMEOUT, READ_TIMEOUT)) -> requests.Session:
+    """New pooled session with timeouts and retries; most callers want get_session()."""
+    retry = JitteredRetry(
+        total=retries,
+        allowed_methods=IDEMPOTENT_METHODS,
+        status_forcelist=RETRY_STATUSES,
+        backoff_factor=RETRY_BACKOFF,
+        backoff_max=RETRY_BACKOFF_MAX,
+        respect_retry_after_header=True,
+        # Hand the last response back so callers handle the status as before
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=pool_size, max_retries=retry)
+    session = TimeoutSession(timeout)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def get_session() -> requests.Session:
+    """The process-wide shared session, created on first use."""
+    global _session
+    if _session is None:
+        with _session_lock:
+            if _session is None:
+                _session = create_session()
+    return _session
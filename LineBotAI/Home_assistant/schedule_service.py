@@ -5,6 +5,7 @@ Handles schedule-related operations.
 """
 from typing import Dict, List, Any, Optional
 from datetime import datetime
+from urllib.parse import quote
 
 from .base_service import BaseService
 
@@ -20,19 +21,44 @@ class ScheduleService:
         """Get all schedules with pagination and optional date filtering."""
         if date:
             # Use the date filter parameter
-            endpoint = f"/api/schedules?skip={skip}&limit={limit}&date_filter={date}"
+            endpoint = f"/api/schedules/?skip={skip}&limit={limit}&date_filter={date}"
         else:
-            endpoint = f"/api/schedules?skip={skip}&limit={limit}"
+            endpoint = f"/api/schedules/?skip={skip}&limit={limit}"
         return self.base.make_request("GET", endpoint)
     
+    def get_schedules_page(self, cursor: Optional[str] = None, limit: int = 100) -> Dict[str, Any]:
+        """Get one keyset-paginated page of schedules ({"items": [...], "next_cursor": ...})."""
+        endpoint = f"/api/schedules/page?limit={limit}"
+        if cursor:
+            endpoint += f"&cursor={cursor}"
+        return self.base.make_request("GET", endpoint)
+    
+    def get_all_schedules(self, page_size: int = 100) -> List[Dict[str, Any]]:
+        """Get every schedule by following next_cursor until the last page."""
+        schedules = []
+        cursor = None
+        while True:
+            page = self.get_schedules_page(cursor=cursor, limit=page_size)
+            if page.get("error"):
+                return page
+            schedules.extend(page.get("items", []))
+            cursor = page.get("next_cursor")
+            if not cursor:
+                return schedules
+    
     def get_schedules_by_date(self, date: str) -> List[Dict[str, Any]]:
         """Get schedules for a specific date (YYYY-MM-DD format)."""
         endpoint = f"/api/schedules/by-date/{date}"
         return self.base.make_request("GET", endpoint)
     
+    def search_schedules(self, query: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Find schedules by title / description; results carry a relevance score, best first."""
+        endpoint = f"/api/schedules/search?q={quote(query)}&limit={limit}"
+        return self.base.make_request("GET", endpoint)
+    
     def create_schedule(self, schedule_data: Dict[str, Any]) -> Dict[str, Any]:
         """Create a new schedule."""
-        endpoint = "/api/schedules"
+        endpoint = "/api/schedules/"
         return self.base.make_request("POST", endpoint, schedule_data)
     
     def update_schedule(self, schedule_id: str, schedule_data: Dict[str, Any]) -> Dict[str, Any]:
@@ -45,6 +71,21 @@ class ScheduleService:
         endpoint = f"/api/schedules/{schedule_id}"
         return self.base.make_request("DELETE", endpoint)
     
+    def create_schedules_bulk(self, schedules: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Create many schedules in one request; returns per-item results."""
+        endpoint = "/api/schedules/bulk"
+        return self.base.make_request("POST", endpoint, schedules)
+    
+    def update_schedules_bulk(self, schedules: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Partially update many schedules in one request; each item must include its id."""
+        endpoint = "/api/schedules/bulk"
+        return self.base.make_request("PATCH", endpoint, schedules)
+    
+    def delete_schedules_bulk(self, schedule_ids: List[int]) -> Dict[str, Any]:
+        """Delete many schedules in one request; returns per-id results."""
+        endpoint = "/api/schedules/bulk"
+        return self.base.make_request("DELETE", endpoint, {"ids": schedule_ids})
+    
     def get_schedule_by_id(self, schedule_id: str) -> Optional[Dict[str, Any]]:
         """Get a schedule by its ID."""
         endpoint = f"/api/schedules/{schedule_id}"
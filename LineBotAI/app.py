@@ -1,5 +1,8 @@
 import sys
 import os
+import atexit
+import signal
+from concurrent import futures
 
 # Add the LineBotAI directory to the Python path
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -11,6 +14,8 @@ import logging
 from dotenv import load_dotenv
 from services.line_service import LineService
 from services.chatgpt_service import ChatGPTService
+from services.event_dispatcher import EventDispatcher
+from Home_assistant.circuit_breaker import CLOSED, breaker_snapshots
 from config.url_config import get_backend_url
 
 # Load environment variables
@@ -25,11 +30,25 @@ LINE_CHANNEL_ACCESS_TOKEN = os.getenv('LINE_CHANNEL_ACCESS_TOKEN', '')
 CHATGPT_API_KEY = os.getenv('CHATGPT_API_KEY', '')
 DEBUG_MODE = os.getenv('DEBUG_MODE', 'false').lower() == 'true'
 DEBUG_STAGE = os.getenv('DEBUG_STAGE', 'false').lower() == 'true'
+# flask: threaded Flask server; asgi: asyncio runtime in asgi_app.py served by uvicorn
+SERVER = os.getenv('LINEBOT_SERVER', 'flask').lower()
+# sync: process events before answering the webhook; async: acknowledge first, process in the background
+PROCESSING_MODE = os.getenv('LINEBOT_PROCESSING_MODE', 'sync').lower()
+# Users whose events are processed concurrently; events of one user always run in order
+WORKER_COUNT = int(os.getenv('LINEBOT_WORKERS', '4'))
+QUEUE_SIZE = int(os.getenv('LINEBOT_QUEUE_SIZE', '100'))
+# Seconds a webhook waits for queue space before processing the event itself
+QUEUE_PUT_TIMEOUT = float(os.getenv('LINEBOT_QUEUE_TIMEOUT', '2'))
+# Seconds queued events may take to finish on shutdown
+DRAIN_TIMEOUT = float(os.getenv('LINEBOT_DRAIN_TIMEOUT', '30'))
+# Events processed at once by the asgi server; waiting on I/O costs no thread there
+ASYNC_CONCURRENCY = int(os.getenv('LINEBOT_ASYNC_CONCURRENCY', '256'))
 
 # Get backend URL using centralized configuration
 BACKEND_API_URL = get_backend_url()
 logger.info(f"Using backend URL: {BACKEND_API_URL}")
 logger.info(f"Debug mode: {DEBUG_MODE}, Debug stage: {DEBUG_STAGE}")
+logger.info(f"Server: {SERVER}, processing mode: {PROCESSING_MODE}")
 
 def create_app():
     from routes.debug_routes import debug_blueprint  # 延遲匯入
@@ -39,6 +58,11 @@ def create_app():
     line_service = LineService(LINE_CHANNEL_ACCESS_TOKEN, BACKEND_API_URL)
     chatgpt_service = ChatGPTService(CHATGPT_API_KEY, BACKEND_API_URL)
     
+    dispatcher = EventDispatcher(WORKER_COUNT, QUEUE_SIZE, QUEUE_PUT_TIMEOUT)
+    dispatcher.start()
+    atexit.register(dispatcher.shutdown, DRAIN_TIMEOUT)
+    app.config['EVENT_DISPATCHER'] = dispatcher
+    
     @app.route('/webhook', methods=['POST'])
     def webhook():
         """Handle LINE webhook events"""
@@ -48,6 +72,7 @@ def create_app():
                 return jsonify({'error': 'Invalid JSON or empty body'}), 400
             
             events = body.get('events', [])
+            pending = []
             for event in events:
                 reply_token = event.get('replyToken')
                 user_message = event.get('message', {}).get('text', '')
@@ -56,7 +81,12 @@ def create_app():
                 
                 if reply_token and user_message:
                     # Use the new sequence diagram flow with user_id for conversation history
-                    line_service.process_user_message(user_message, reply_token, chatgpt_service, user_id)
+                    # Keyed by user: one user's messages stay in order, different users run in parallel
+                    pending.append(dispatcher.submit(
+                        user_id, line_service.process_user_message, user_message, reply_token, chatgpt_service, user_id
+                    ))
+            if PROCESSING_MODE != 'async':
+                futures.wait(pending)
             return jsonify({'status': 'success'})
         except Exception as e:
             logger.error(f"Error processing webhook: {e}")
@@ -73,12 +103,18 @@ def create_app():
     @app.route('/linebot/health')
     def linebot_health():
         """LineBot specific health check endpoint"""
+        breakers = breaker_snapshots()
         return jsonify({
-            "status": "ok",
+            # degraded: a dependency's circuit breaker is not closed
+            "status": "ok" if all(b["state"] == CLOSED for b in breakers.values()) else "degraded",
             "service": "linebot",
             "backend_url": BACKEND_API_URL,
             "debug_mode": DEBUG_MODE,
-            "debug_stage": DEBUG_STAGE
+            "debug_stage": DEBUG_STAGE,
+            "server": "flask",
+            "processing_mode": PROCESSING_MODE,
+            "event_queue": dispatcher.stats(),
+            "circuit_breakers": breakers
         })
     
     return app
@@ -88,6 +124,14 @@ if __name__ == '__main__':
     host = '0.0.0.0'  # Make the app accessible externally in Docker
     
     logger.info(f"Starting LineBotAI with DEBUG_MODE={DEBUG_MODE}")
+    if SERVER == 'asgi':
+        import uvicorn
+        # uvicorn handles SIGTERM itself; the asgi app drains its events on lifespan shutdown
+        uvicorn.run('asgi_app:app', host=host, port=port, log_level='debug' if DEBUG_MODE else 'info')
+        sys.exit(0)
+
     app = create_app()
+    # Turn SIGTERM (docker stop) into a normal exit so atexit drains the event queue
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
 
     app.run(host=host, port=port, debug=DEBUG_MODE)
\ No newline at end of file
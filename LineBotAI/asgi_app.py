@@ -0,0 +1,119 @@
+"""
+ASGI entry point for the LineBot.
+
+Serves the same webhook and health endpoints as app.py on asyncio: ChatGPT,
+backend and LINE calls are awaited on one shared, pooled httpx client, so a
+single process handles hundreds of in-flight conversations without a thread
+each. Start with LINEBOT_SERVER=asgi python app.py, or directly with
+uvicorn asgi_app:app. The debug blueprint is only available on the Flask server.
+"""
+import sys
+import os
+
+# Add the LineBotAI directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import contextlib
+
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app import (
+    ASYNC_CONCURRENCY,
+    BACKEND_API_URL,
+    CHATGPT_API_KEY,
+    DEBUG_MODE,
+    DEBUG_STAGE,
+    DRAIN_TIMEOUT,
+    LINE_CHANNEL_ACCESS_TOKEN,
+    PROCESSING_MODE,
+    QUEUE_SIZE,
+    logger,
+)
+from Home_assistant.async_client import AsyncHomeAssistantClient, create_async_http_client
+from Home_assistant.circuit_breaker import CLOSED, breaker_snapshots
+from services.async_chatgpt_service import AsyncChatGPTService
+from services.async_line_service import AsyncLineService
+from services.event_dispatcher import AsyncEventDispatcher
+
+
+@contextlib.asynccontextmanager
+async def lifespan(app):
+    http_client = create_async_http_client()
+    ha_client = AsyncHomeAssistantClient(BACKEND_API_URL, client=http_client)
+    app.state.line_service = AsyncLineService(LINE_CHANNEL_ACCESS_TOKEN, ha_client, http_client)
+    app.state.chatgpt_service = AsyncChatGPTService(CHATGPT_API_KEY, ha_client, http_client)
+    app.state.dispatcher = AsyncEventDispatcher(ASYNC_CONCURRENCY, QUEUE_SIZE)
+    logger.info(f"Async LineBot started, concurrency {ASYNC_CONCURRENCY}")
+    try:
+        yield
+    finally:
+        await app.state.dispatcher.shutdown(DRAIN_TIMEOUT)
+        await http_client.aclose()
+
+
+async def webhook(request: Request):
+    """Handle LINE webhook events"""
+    try:
+        try:
+            body = await request.json()
+        except ValueError:
+            body = None
+        if body is None:
+            return JSONResponse({'error': 'Invalid JSON or empty body'}, status_code=400)
+
+        state = request.app.state
+        pending = []
+        for event in body.get('events', []):
+            reply_token = event.get('replyToken')
+            user_message = event.get('message', {}).get('text', '')
+            user_id = event.get('source', {}).get('userId')
+
+            if reply_token and user_message:
+                # Keyed by user: one user's messages stay in order, different users run concurrently
+                pending.append(await state.dispatcher.submit(
+                    user_id, state.line_service.process_user_message,
+                    user_message, reply_token, state.chatgpt_service, user_id
+                ))
+        if PROCESSING_MODE != 'async' and pending:
+            await asyncio.wait(pending)
+        return JSONResponse({'status': 'success'})
+    except Exception as e:
+        logger.error(f"Error processing webhook: {e}")
+        return JSONResponse({'error': str(e)}, status_code=400)
+
+
+async def health_check(request: Request):
+    """Health check endpoint"""
+    return JSONResponse({"status": "ok"})
+
+
+async def linebot_health(request: Request):
+    """LineBot specific health check endpoint"""
+    breakers = breaker_snapshots()
+    return JSONResponse({
+        # degraded: a dependency's circuit breaker is not closed
+        "status": "ok" if all(b["state"] == CLOSED for b in breakers.values()) else "degraded",
+        "service": "linebot",
+        "backend_url": BACKEND_API_URL,
+        "debug_mode": DEBUG_MODE,
+        "debug_stage": DEBUG_STAGE,
+        "server": "asgi",
+        "processing_mode": PROCESSING_MODE,
+        "event_queue": request.app.state.dispatcher.stats(),
+        "circuit_breakers": breakers
+    })
+
+
+app = Starlette(
+    debug=DEBUG_MODE,
+    routes=[
+        Route('/webhook', webhook, methods=['POST']),
+        Route('/api/health', health_check),
+        Route('/linebot/health', linebot_health),
+    ],
+    lifespan=lifespan,
+)
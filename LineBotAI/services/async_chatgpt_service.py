@@ -0,0 +1,95 @@
+import asyncio
+import logging
+
+import httpx
+
+from Home_assistant.async_client import AsyncHomeAssistantClient
+from Home_assistant.circuit_breaker import OPEN, CircuitOpenError, get_breaker
+from services.chatgpt_service import (
+    CONSUMABLE_KEYWORDS,
+    OPENAI_CHAT_COMPLETIONS_URL,
+    SCHEDULE_KEYWORDS,
+    ChatGPTService,
+)
+
+
+class AsyncChatGPTService(ChatGPTService):
+    """ChatGPTService for the asyncio runtime.
+
+    Prompt building, response parsing and conversation history are inherited;
+    the OpenAI request and the backend context lookups are awaited on the shared
+    httpx client, and both context lookups run concurrently.
+    """
+
+    def __init__(self, api_key, ha_client: AsyncHomeAssistantClient, http_client: httpx.AsyncClient):
+        self.api_key = api_key
+        self.logger = logging.getLogger(__name__)
+        self.backend_url = ha_client.base_url
+        self.ha_client = ha_client
+        self.http = http_client
+        self.openai_breaker = get_breaker("openai")
+        self.backend_breaker = get_breaker("backend")
+
+        # 對話歷史記錄 - 使用字典來為每個用戶維護獨立的對話歷史
+        self.conversation_histories = {}
+        self.max_history_length = 5  # 保留最近 5 輪對話
+
+        self.logger.info(f"Async ChatGPT service initialized with backend URL: {self.backend_url}")
+
+    async def process_message(self, user_message, user_id=None):
+        """Process user message using ChatGPT API with backend integration and conversation history"""
+        if user_id is None:
+            user_id = "default_user"
+
+        if self.openai_breaker.state == OPEN:
+            return self._degraded_response(user_message)
+
+        try:
+            context = await self._get_backend_context(user_message)
+
+            headers, data = self._build_completion_request(user_message, user_id, context)
+            response = await self._post_completion(headers, data)
+
+            return self._handle_completion(response.json(), user_message, user_id)
+
+        except CircuitOpenError:
+            # Half-open and another call is already probing
+            return self._degraded_response(user_message)
+        except Exception as e:
+            return self._error_reply(e, user_message, user_id)
+
+    async def _post_completion(self, headers, data):
+        """POST the completion request, recording the outcome on the OpenAI breaker"""
+        if not self.openai_breaker.allow():
+            raise CircuitOpenError("openai")
+        try:
+            response = await self.http.post(OPENAI_CHAT_COMPLETIONS_URL, headers=headers, json=data)
+        except BaseException:
+            # Cancellation included, so a half-open probe slot is never left taken
+            self.openai_breaker.record_failure()
+            raise
+        self.openai_breaker.record_status(response.status_code)
+        response.raise_for_status()
+        return response
+
+    async def _get_backend_context(self, user_message):
+        """Get relevant context from backend API"""
+        if self.backend_breaker.is_open:
+            # Degraded: answer without context rather than queue behind a failing backend
+            return {}
+        lookups = {}
+        if self._mentions(user_message, SCHEDULE_KEYWORDS):
+            lookups['schedules'] = self.ha_client.schedules.get_schedules()
+        if self._mentions(user_message, CONSUMABLE_KEYWORDS):
+            lookups['consumables'] = self.ha_client.consumables.get_consumables()
+        if not lookups:
+            return {}
+
+        context = {}
+        results = await asyncio.gather(*lookups.values(), return_exceptions=True)
+        for key, result in zip(lookups, results):
+            if isinstance(result, Exception):
+                self.logger.warning(f"Could not get backend context: {result}")
+            elif self._is_usable(result):
+                context[key] = result
+        return context
@@ -0,0 +1,114 @@
+import logging
+
+import httpx
+
+from Home_assistant.async_client import AsyncHomeAssistantClient
+from services.line_service import LINE_REPLY_URL, LineService
+
+
+class AsyncLineService(LineService):
+    """LineService for the asyncio runtime: backend calls and LINE replies go through a shared httpx client.
+
+    Message formatting and search-hit selection are inherited unchanged.
+    """
+
+    def __init__(self, access_token, ha_client: AsyncHomeAssistantClient, http_client: httpx.AsyncClient):
+        self.access_token = access_token
+        self.logger = logging.getLogger(__name__)
+        self.backend_url = ha_client.base_url
+        self.ha_client = ha_client
+        self.http = http_client
+
+        self.logger.info(f"Async LineBot service initialized with backend URL: {self.backend_url}")
+
+    async def process_user_message(self, user_message, reply_token, chatgpt_service, user_id=None):
+        """Process user message according to the sequence diagram flow"""
+        try:
+            chatgpt_response = await chatgpt_service.process_message(user_message, user_id)
+
+            if not isinstance(chatgpt_response, dict):
+                # Fallback if not JSON
+                await self.reply_to_line(reply_token, str(chatgpt_response))
+                return
+
+            action = chatgpt_response.get('action')
+            parameters = chatgpt_response.get('parameters', {})
+            reply_text = chatgpt_response.get('reply', '')
+
+            if action == 'text_reply':
+                await self.reply_to_line(reply_token, reply_text)
+            else:
+                backend_result = await self._perform_backend_operation(action, parameters)
+                final_reply = self._format_backend_response(reply_text, backend_result, action, parameters)
+                await self.reply_to_line(reply_token, final_reply)
+
+        except Exception as e:
+            self.logger.error(f"Error processing user message: {e}")
+            await self.reply_to_line(reply_token, "抱歉，處理您的請求時發生錯誤。請稍後再試。")
+
+    async def _perform_backend_operation(self, action, parameters):
+        """Perform backend API operation based on action"""
+        schedules = self.ha_client.schedules
+        consumables = self.ha_client.consumables
+        try:
+            if action == 'create_schedule':
+                return await schedules.create_schedule(parameters)
+            elif action == 'get_schedule':
+                if parameters.get('query'):
+                    return await schedules.search_schedules(parameters['query'])
+                date_param = parameters.get('date')
+                if date_param:
+                    return await schedules.get_schedules(date=date_param)
+                return await schedules.get_schedules()
+            elif action == 'update_schedule':
+                schedule_id, error = await self._resolve_id(schedules.search_schedules, parameters, '排程', 'title')
+                if schedule_id:
+                    return await schedules.update_schedule(schedule_id, self._without_query(parameters))
+                return error or {"error": "Schedule ID required for update"}
+            elif action == 'delete_schedule':
+                schedule_id, error = await self._resolve_id(schedules.search_schedules, parameters, '排程', 'title')
+                if schedule_id:
+                    return await schedules.delete_schedule(schedule_id)
+                return error or {"error": "Schedule ID required for deletion"}
+            elif action == 'create_consumable':
+                return await consumables.create_consumable(parameters)
+            elif action == 'get_consumable':
+                if parameters.get('query'):
+                    return await consumables.search_consumables(parameters['query'])
+                return await consumables.get_consumables()
+            elif action == 'update_consumable':
+                consumable_id, error = await self._resolve_id(consumables.search_consumables, parameters, '消耗品', 'name')
+                if consumable_id:
+                    return await consumables.update_consumable(consumable_id, self._without_query(parameters))
+                return error or {"error": "Consumable ID required for update"}
+            elif action == 'delete_consumable':
+                consumable_id, error = await self._resolve_id(consumables.search_consumables, parameters, '消耗品', 'name')
+                if consumable_id:
+                    return await consumables.delete_consumable(consumable_id)
+                return error or {"error": "Consumable ID required for deletion"}
+            else:
+                return {"error": f"Unknown action: {action}"}
+
+        except Exception as e:
+            self.logger.error(f"Backend operation error: {e}")
+            return {"error": str(e)}
+
+    async def _resolve_id(self, search, parameters, label, name_field):
+        """Return (id, error) for parameters["id"], or for parameters["query"] via the backend search."""
+        if parameters.get('id'):
+            return parameters['id'], None
+        query = parameters.get('query')
+        if not query:
+            return None, None
+
+        return self._pick_search_hit(await search(query, limit=5), query, label, name_field)
+
+    async def reply_to_line(self, reply_token, message):
+        """Send response back to LINE"""
+        headers, data = self._reply_request(reply_token, message)
+        try:
+            response = await self.http.post(LINE_REPLY_URL, headers=headers, json=data)
+            response.raise_for_status()
+            self.logger.info("Successfully sent reply to LINE")
+        except Exception as e:
+            self.logger.error(f"Error replying to LINE: {e}")
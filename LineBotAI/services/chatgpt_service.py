@@ -1,9 +1,10 @@
-import requests
 import logging
 import os
 import json
 from collections import deque
+from Home_assistant.circuit_breaker import OPEN, CircuitOpenError, get_breaker
 from Home_assistant.client import HomeAssistantClient
+from Home_assistant.http_session import get_session
 
 from datetime import datetime, timezone, timedelta
 
@@ -19,16 +20,28 @@ now_tw = now + timedelta(hours=8)
 today_iso = now_tw.strftime("%Y-%m-%d")
 weekday = weekday_map[now_tw.weekday()]
 
+OPENAI_CHAT_COMPLETIONS_URL = 'https://api.openai.com/v1/chat/completions'
+
+# Messages mentioning these get the current schedules / consumables as context
+SCHEDULE_KEYWORDS = ['schedule', 'appointment', 'reminder', 'time', '排程', '行程', '提醒', '時間', '預約', '會議']
+CONSUMABLE_KEYWORDS = ['supply', 'consumable', 'inventory', 'stock', '消耗品', '庫存', '用品', '補給', '耗材']
+
+# Replies while the OpenAI circuit breaker is open
+DEGRADED_LOOKUP_REPLY = "AI 助理暫時無法使用，以下是目前的資料："
+DEGRADED_TEXT_REPLY = "AI 助理暫時無法使用，目前只能查詢排程與消耗品，請稍後再試。"
 
 
 class ChatGPTService:
-    def __init__(self, api_key, backend_url=None):
+    def __init__(self, api_key, backend_url=None, session=None):
         self.api_key = api_key
         self.logger = logging.getLogger(__name__)
+        self.session = session or get_session()
+        self.openai_breaker = get_breaker("openai")
+        self.backend_breaker = get_breaker("backend")
         
         # Initialize Home Assistant client for backend API calls
         self.backend_url = backend_url or os.getenv('BACKEND_API_URL', 'http://backend:8000')
-        self.ha_client = HomeAssistantClient(self.backend_url)
+        self.ha_client = HomeAssistantClient(self.backend_url, session=self.session)
         
         # 對話歷史記錄 - 使用字典來為每個用戶維護獨立的對話歷史
         self.conversation_histories = {}
@@ -85,210 +98,267 @@ class ChatGPTService:
         # 如果沒有提供 user_id，使用預設值
         if user_id is None:
             user_id = "default_user"
+        
+        if self.openai_breaker.state == OPEN:
+            return self._degraded_response(user_message)
             
         try:
             # First, try to get context from backend API
             context = self._get_backend_context(user_message)
             
-            # Enhance the prompt with backend context
-            enhanced_prompt = self._enhance_prompt(user_message, context)
-            
-            # Build conversation context from history
-            conversation_context = self._build_conversation_context(user_id)
-            
-            # Call ChatGPT API
-            headers = {
-                'Authorization': f'Bearer {self.api_key}',
-                'Content-Type': 'application/json'
-            }
+            headers, data = self._build_completion_request(user_message, user_id, context)
+            response = self._post_completion(headers, data)
             
-            # 構建訊息序列：系統提示 + 對話歷史 + 當前訊息
-            messages = [
-                {
-                    'role': 'system',
-                    'content': (
-                        "You are a smart home assistant integrated with a LINE Bot.\n"
-                        f"Today's date is {today_iso} ({weekday}).\n"
-                        "Time zone: UTC+8.\n\n"
-                        "\n"
-                        "Your role:\n"
-                        "- Understand user messages in Chinese.\n"
-                        "- If the message requires performing backend operations related to schedules or consumables, return a JSON object with the specific action and parameters.\n"
-                        "- If the user is only chatting or asking general questions, return a JSON object with action:\"text_reply\" and provide the reply text.\n"
-                        "- If the user request does not contain all required information (e.g., missing schedule ID), do not guess. Instead, return an action that helps retrieve or clarify the needed information and include a reply asking the user.\n"
+            return self._handle_completion(response.json(), user_message, user_id)
+                
+        except CircuitOpenError:
+            # Half-open and another call is already probing
+            return self._degraded_response(user_message)
+        except Exception as e:
+            return self._error_reply(e, user_message, user_id)
+
+    def _post_completion(self, headers, data):
+        """POST the completion request, recording the outcome on the OpenAI breaker"""
+        if not self.openai_breaker.allow():
+            raise CircuitOpenError("openai")
+        try:
+            response = self.session.post(OPENAI_CHAT_COMPLETIONS_URL, headers=headers, json=data)
+        except BaseException:
+            # Any exception, so a half-open probe slot is never left taken
+            self.openai_breaker.record_failure()
+            raise
+        self.openai_breaker.record_status(response.status_code)
+        response.raise_for_status()
+        return response
+
+    def _degraded_response(self, user_message):
+        """Best-effort action while OpenAI is unavailable.
+
+        Only read-only lookups are recognised, by keyword; they are answered by the
+        backend, or from the client's response cache if the backend is down as well.
+        Nothing is written to the conversation history.
+        """
+        self.logger.warning("OpenAI circuit open, answering in degraded mode")
+        if self._mentions(user_message, SCHEDULE_KEYWORDS):
+            parameters = {}
+            if '今天' in user_message or 'today' in user_message.lower():
+                parameters['date'] = (datetime.now(timezone.utc) + timedelta(hours=8)).strftime("%Y-%m-%d")
+            return {"action": "get_schedule", "parameters": parameters, "reply": DEGRADED_LOOKUP_REPLY, "degraded": True}
+        if self._mentions(user_message, CONSUMABLE_KEYWORDS):
+            return {"action": "get_consumable", "parameters": {}, "reply": DEGRADED_LOOKUP_REPLY, "degraded": True}
+        return {"action": "text_reply", "reply": DEGRADED_TEXT_REPLY, "degraded": True}
+
+    def _error_reply(self, error, user_message, user_id):
+        """Fallback reply when the completion request fails; recorded in the history like any reply"""
+        self.logger.error(f"ChatGPT API error: {error}")
+        error_response = {
+            "action": "text_reply",
+            "reply": "Error processing message. Please try again."
+        }
+        
+        # 將對話添加到歷史記錄
+        self._add_to_conversation_history(user_id, user_message, error_response)
+        
+        return error_response
+
+    def _build_completion_request(self, user_message, user_id, context):
+        """Headers and body of the chat completion request: system prompt, conversation history and the message"""
+        # Enhance the prompt with backend context
+        enhanced_prompt = self._enhance_prompt(user_message, context)
+        
+        # Build conversation context from history
+        conversation_context = self._build_conversation_context(user_id)
+        
+        # Call ChatGPT API
+        headers = {
+            'Authorization': f'Bearer {self.api_key}',
+            'Content-Type': 'application/json'
+        }
+        
+        # 構建訊息序列：系統提示 + 對話歷史 + 當前訊息
+        messages = [
+            {
+                'role': 'system',
+                'content': (
+                    "You are a smart home assistant integrated with a LINE Bot.\n"
+                    f"Today's date is {today_iso} ({weekday}).\n"
+                    "Time zone: UTC+8.\n\n"
+                    "\n"
+                    "Your role:\n"
+                    "- Understand user messages in Chinese.\n"
+                    "- If the message requires performing backend operations related to schedules or consumables, return a JSON object with the specific action and parameters.\n"
+                    "- If the user is only chatting or asking general questions, return a JSON object with action:\"text_reply\" and provide the reply text.\n"
+                    "- If the user request does not contain all required information (e.g., missing schedule ID), do not guess. Instead, return an action that helps retrieve or clarify the needed information and include a reply asking the user.\n"
+                    "- Remember the conversation context and refer to previous messages when relevant.\n"
+                    "\n"                            
+                     "Important:\n"
+                        "- If the user describes a new event with date and time, assume create_schedule by default, unless they clearly mention '查詢', '顯示', or '看看'.\n"
+                        "- Only use get_schedule when the user explicitly asks to see or list schedules.\n"
+                        "- Always respond with a valid JSON object.\n"
+                        "- Dates must be in ISO 8601 format (e.g., 2025-07-08T12:00:00Z) if needed.\n"
+                        "- Never guess IDs or date ranges.\n"
                         "- Remember the conversation context and refer to previous messages when relevant.\n"
-                        "\n"                            
-                         "Important:\n"
-                            "- If the user describes a new event with date and time, assume create_schedule by default, unless they clearly mention '查詢', '顯示', or '看看'.\n"
-                            "- Only use get_schedule when the user explicitly asks to see or list schedules.\n"
-                            "- Always respond with a valid JSON object.\n"
-                            "- Dates must be in ISO 8601 format (e.g., 2025-07-08T12:00:00Z) if needed.\n"
-                            "- Never guess IDs or date ranges.\n"
-                            "- Remember the conversation context and refer to previous messages when relevant.\n"
-                            "- Use conversation history to understand context and references (like 'it', 'that', 'the previous one').\n"
-                            "- When the conversation context already includes schedule list information, and the user specifies which schedule to modify or delete (e.g., by ID or name), directly generate the corresponding update_schedule or delete_schedule action.\n"
-                        "\n"
-                        "Output format:\n"
-                        "{\n"
-                        "  \"action\": \"one of [create_schedule, get_schedule, update_schedule, delete_schedule, create_consumable, get_consumable, update_consumable, delete_consumable, text_reply]\",\n"
-                        "  \"parameters\": { ... },\n"
-                        "  \"reply\": \"text to show to user\"\n"
-                        "}\n"
-                        "\n"
-                        "Examples:\n"
-                        "\n"
-                        "1) User says: \"這週六中午和朋友吃飯\"\n"
-                        "Return:\n"
-                        "{\n"
-                        "  \"action\": \"create_schedule\",\n"
-                        "  \"parameters\": {\n"
-                        "    \"title\": \"和朋友吃飯\",\n"
-                        "    \"description\": \"這週六中午聚餐\",\n"
-                        "    \"start_time\": \"2025-07-12T12:00:00Z\"\n"
-                        "  },\n"
-                        "  \"reply\": \"已為您建立7月12日中午的聚餐排程。\"\n"
-                        "}\n"
-                        "\n"
-                        "2) User says: \"把今天晨跑改成一小時\"\n"
-                        "Return:\n"
-                        "{\n"
-                        "  \"action\": \"get_schedule\",\n"
-                        "  \"parameters\": {\n"
-                        "    \"date\": \"2025-07-08\"\n"
-                        "  },\n"
-                        "  \"reply\": \"請告訴我要修改哪一筆排程，請提供名稱或ID。\"\n"
-                        "}\n"
-                        "\n"
-                        "3) User says: \"更新ID 2，改成一小時\"\n"
-                        "Return:\n"
-                        "{\n"
-                        "  \"action\": \"update_schedule\",\n"
-                        "  \"parameters\": {\n"
-                        "    \"id\": 2,\n"
-                        "    \"end_time\": \"2025-07-08T07:00:00Z\"\n"
-                        "  },\n"
-                        "  \"reply\": \"已更新ID 2的排程，時間已延長至一小時。\"\n"
-                        "}\n"
-                        "\n"
-                        "4) User says: \"取消這週六的活動\"\n"
-                        "Return:\n"
-                        "{\n"
-                        "  \"action\": \"get_schedule\",\n"
-                        "  \"parameters\": {\n"
-                        "    \"date\": \"2025-07-12\"\n"
-                        "  },\n"
-                        "  \"reply\": \"我找到7月12日的排程，請告訴我要取消哪一筆活動，請提供名稱或ID。\"\n"
-                        "}\n"
-                        "\n"
-                        "5) User says: \"取消ID 3\"\n"
-                        "Return:\n"
-                        "{\n"
-                        "  \"action\": \"delete_schedule\",\n"
-                        "  \"parameters\": {\n"
-                        "    \"id\": 3\n"
-                        "  },\n"
-                        "  \"reply\": \"已為您取消ID 3的排程。\"\n"
-                        "}\n"
-                        "\n"
-                        "6) User says: \"目前有哪些消耗品？\"\n"
-                        "Return:\n"
-                        "{\n"
-                        "  \"action\": \"get_consumable\",\n"
-                        "  \"parameters\": {},\n"
-                        "  \"reply\": \"正在查詢目前的消耗品...\"\n"
-                        "}\n"
-                        "\n"
-                        "7) User says: \"你好！\"\n"
-                        "Return:\n"
-                        "{\n"
-                        "  \"action\": \"text_reply\",\n"
-                        "  \"reply\": \"你好！有什麼我可以幫忙的？\"\n"
-                        "}\n"
-                    )
-                }
-            ]
-            
-            # 添加對話歷史
-            messages.extend(conversation_context)
-            
-            # 添加當前用戶訊息
-            messages.append({
-                'role': 'user',
-                'content': enhanced_prompt
-            })
-            
-            data = {
-                'model': 'gpt-4.1-nano',
-                'messages': messages,
-                'max_tokens': 300
+                        "- Use conversation history to understand context and references (like 'it', 'that', 'the previous one').\n"
+                        "- When the conversation context already includes schedule list information, and the user specifies which schedule to modify or delete (e.g., by ID or name), directly generate the corresponding update_schedule or delete_schedule action.\n"
+                        "- When the user refers to a schedule or consumable by name instead of ID, put the key words in parameters.query (e.g., \"query\": \"看牙醫\") instead of an id; the system looks it up. get_schedule and get_consumable also accept query to search.\n"
+                    "\n"
+                    "Output format:\n"
+                    "{\n"
+                    "  \"action\": \"one of [create_schedule, get_schedule, update_schedule, delete_schedule, create_consumable, get_consumable, update_consumable, delete_consumable, text_reply]\",\n"
+                    "  \"parameters\": { ... },\n"
+                    "  \"reply\": \"text to show to user\"\n"
+                    "}\n"
+                    "\n"
+                    "Examples:\n"
+                    "\n"
+                    "1) User says: \"這週六中午和朋友吃飯\"\n"
+                    "Return:\n"
+                    "{\n"
+                    "  \"action\": \"create_schedule\",\n"
+                    "  \"parameters\": {\n"
+                    "    \"title\": \"和朋友吃飯\",\n"
+                    "    \"description\": \"這週六中午聚餐\",\n"
+                    "    \"start_time\": \"2025-07-12T12:00:00Z\"\n"
+                    "  },\n"
+                    "  \"reply\": \"已為您建立7月12日中午的聚餐排程。\"\n"
+                    "}\n"
+                    "\n"
+                    "2) User says: \"把今天晨跑改成一小時\"\n"
+                    "Return:\n"
+                    "{\n"
+                    "  \"action\": \"get_schedule\",\n"
+                    "  \"parameters\": {\n"
+                    "    \"date\": \"2025-07-08\"\n"
+                    "  },\n"
+                    "  \"reply\": \"請告訴我要修改哪一筆排程，請提供名稱或ID。\"\n"
+                    "}\n"
+                    "\n"
+                    "3) User says: \"更新ID 2，改成一小時\"\n"
+                    "Return:\n"
+                    "{\n"
+                    "  \"action\": \"update_schedule\",\n"
+                    "  \"parameters\": {\n"
+                    "    \"id\": 2,\n"
+                    "    \"end_time\": \"2025-07-08T07:00:00Z\"\n"
+                    "  },\n"
+                    "  \"reply\": \"已更新ID 2的排程，時間已延長至一小時。\"\n"
+                    "}\n"
+                    "\n"
+                    "4) User says: \"取消這週六的活動\"\n"
+                    "Return:\n"
+                    "{\n"
+                    "  \"action\": \"get_schedule\",\n"
+                    "  \"parameters\": {\n"
+                    "    \"date\": \"2025-07-12\"\n"
+                    "  },\n"
+                    "  \"reply\": \"我找到7月12日的排程，請告訴我要取消哪一筆活動，請提供名稱或ID。\"\n"
+                    "}\n"
+                    "\n"
+                    "5) User says: \"取消ID 3\"\n"
+                    "Return:\n"
+                    "{\n"
+                    "  \"action\": \"delete_schedule\",\n"
+                    "  \"parameters\": {\n"
+                    "    \"id\": 3\n"
+                    "  },\n"
+                    "  \"reply\": \"已為您取消ID 3的排程。\"\n"
+                    "}\n"
+                    "\n"
+                    "6) User says: \"目前有哪些消耗品？\"\n"
+                    "Return:\n"
+                    "{\n"
+                    "  \"action\": \"get_consumable\",\n"
+                    "  \"parameters\": {},\n"
+                    "  \"reply\": \"正在查詢目前的消耗品...\"\n"
+                    "}\n"
+                    "\n"
+                    "7) User says: \"取消看牙醫的預約\"\n"
+                    "Return:\n"
+                    "{\n"
+                    "  \"action\": \"delete_schedule\",\n"
+                    "  \"parameters\": {\n"
+                    "    \"query\": \"看牙醫\"\n"
+                    "  },\n"
+                    "  \"reply\": \"已為您取消看牙醫的預約。\"\n"
+                    "}\n"
+                    "\n"
+                    "8) User says: \"你好！\"\n"
+                    "Return:\n"
+                    "{\n"
+                    "  \"action\": \"text_reply\",\n"
+                    "  \"reply\": \"你好！有什麼我可以幫忙的？\"\n"
+                    "}\n"
+                )
             }
-            
-            response = requests.post('https://api.openai.com/v1/chat/completions', headers=headers, json=data)
-            response.raise_for_status()
-            
-            result = response.json()
-            if 'choices' in result and len(result['choices']) > 0:
-                content = result['choices'][0]['message']['content']
+        ]
+        
+        # 添加對話歷史
+        messages.extend(conversation_context)
+        
+        # 添加當前用戶訊息
+        messages.append({
+            'role': 'user',
+            'content': enhanced_prompt
+        })
+        
+        data = {
+            'model': 'gpt-4.1-nano',
+            'messages': messages,
+            'max_tokens': 300
+        }
+        
+        return headers, data
+
+    def _handle_completion(self, result, user_message, user_id):
+        """Turn a chat completion response into an action dict and record it in the history"""
+        if 'choices' in result and len(result['choices']) > 0:
+            content = result['choices'][0]['message']['content']
+            # Try to parse JSON response
+            try:
+                json_response = json.loads(content)
                 
-                # Try to parse JSON response
-                try:
-                    json_response = json.loads(content)
-                    
-                    # 將對話添加到歷史記錄
-                    self._add_to_conversation_history(user_id, user_message, json_response)
-                    
-                    return json_response
-                except json.JSONDecodeError:
-                    # If not valid JSON, return as text reply
-                    fallback_response = {
-                        "action": "text_reply",
-                        "reply": content
-                    }
-                    
-                    # 將對話添加到歷史記錄
-                    self._add_to_conversation_history(user_id, user_message, fallback_response)
-                    
-                    return fallback_response
-            else:
-                error_response = {
+                # 將對話添加到歷史記錄
+                self._add_to_conversation_history(user_id, user_message, json_response)
+                
+                return json_response
+            except json.JSONDecodeError:
+                # If not valid JSON, return as text reply
+                fallback_response = {
                     "action": "text_reply",
-                    "reply": "Sorry, I couldn't generate a response."
+                    "reply": content
                 }
                 
                 # 將對話添加到歷史記錄
-                self._add_to_conversation_history(user_id, user_message, error_response)
-                
-                return error_response
+                self._add_to_conversation_history(user_id, user_message, fallback_response)
                 
-        except Exception as e:
-            self.logger.error(f"ChatGPT API error: {e}")
+                return fallback_response
+        else:
             error_response = {
                 "action": "text_reply",
-                "reply": "Error processing message. Please try again."
+                "reply": "Sorry, I couldn't generate a response."
             }
-            
             # 將對話添加到歷史記錄
             self._add_to_conversation_history(user_id, user_message, error_response)
-            
             return error_response
 
     def _get_backend_context(self, user_message):
         """Get relevant context from backend API"""
         context = {}
+        if self.backend_breaker.is_open:
+            # Degraded: answer without context rather than queue behind a failing backend
+            return context
         
         try:
             # Try to get schedules if message relates to scheduling (Chinese and English keywords)
-            schedule_keywords = ['schedule', 'appointment', 'reminder', 'time', '排程', '行程', '提醒', '時間', '預約', '會議']
-            if any(keyword in user_message.lower() for keyword in schedule_keywords):
+            if self._mentions(user_message, SCHEDULE_KEYWORDS):
                 schedules = self.ha_client.schedules.get_schedules()
-                if schedules and not schedules.get('error'):
+                if self._is_usable(schedules):
                     context['schedules'] = schedules
             
             # Try to get consumables if message relates to supplies (Chinese and English keywords)
-            consumable_keywords = ['supply', 'consumable', 'inventory', 'stock', '消耗品', '庫存', '用品', '補給', '耗材']
-            if any(keyword in user_message.lower() for keyword in consumable_keywords):
+            if self._mentions(user_message, CONSUMABLE_KEYWORDS):
                 consumables = self.ha_client.consumables.get_consumables()
-                if consumables and not consumables.get('error'):
+                if self._is_usable(consumables):
                     context['consumables'] = consumables
                     
         except Exception as e:
@@ -296,6 +366,15 @@ class ChatGPTService:
             
         return context
 
+    @staticmethod
+    def _mentions(user_message, keywords):
+        return any(keyword in user_message.lower() for keyword in keywords)
+
+    @staticmethod
+    def _is_usable(result):
+        """Non-empty backend result that is not an {"error": ...} dict (lists have no .get)"""
+        return bool(result) and not (isinstance(result, dict) and result.get('error'))
+
     def _enhance_prompt(self, user_message, context):
         """Enhance user prompt with backend context"""
         enhanced_prompt = user_message
@@ -322,7 +401,7 @@ class ChatGPTService:
     def get_conversation_summary(self):
         """獲取所有用戶的對話歷史摘要"""
         summary = {}
-        for user_id, history in self.conversation_histories.items():
+        for user_id, history in list(self.conversation_histories.items()):
             summary[user_id] = {
                 "conversation_count": len(history),
                 "last_conversation": history[-1]["timestamp"] if history else None
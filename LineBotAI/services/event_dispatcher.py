@@ -0,0 +1,332 @@
+"""
+Event Dispatcher
+
+Runs webhook events on a bounded pool of worker threads, keyed by the LINE
+user that sent them. Events with the same key run one at a time in the order
+they were submitted, because the conversation history of a user depends on
+it; events of different users run concurrently, up to the number of workers.
+
+The number of pending events is bounded. When no slot frees up within
+put_timeout seconds, submit() runs the event on the caller's thread if its
+user has nothing pending (so ordering still holds), and otherwise keeps
+waiting; either way the webhook slows down instead of dropping messages.
+
+AsyncEventDispatcher provides the same ordering for the asyncio runtime
+(asgi_app.py), with tasks instead of threads.
+"""
+import asyncio
+import functools
+import itertools
+import logging
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set
+
+# Queued item that tells a worker to exit
+_STOP = object()
+# Keys for events that need no ordering
+_unkeyed = itertools.count()
+
+
+class _Event:
+    __slots__ = ("key", "task", "args", "queued_at", "future", "holds_slot")
+
+    def __init__(self, key, task, args, holds_slot):
+        self.key = key
+        self.task = task
+        self.args = args
+        self.queued_at = time.monotonic()
+        self.future = Future()
+        self.holds_slot = holds_slot
+
+
+class EventDispatcher:
+    """Keyed executor: per-key FIFO ordering, cross-key concurrency on daemon worker threads."""
+
+    def __init__(self, workers: int = 4, max_queue: int = 100, put_timeout: float = 2.0,
+                 logger: logging.Logger = None):
+        self.workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.put_timeout = put_timeout
+        self.logger = logger or logging.getLogger(__name__)
+        # Holds only the head event of each key; the number of pending events is
+        # bounded by _slots instead, which also covers events waiting behind a head
+        self._queue = queue.Queue()
+        self._slots = threading.BoundedSemaphore(self.max_queue)
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)
+        # key -> pending events of that key in submission order; the first one is
+        # queued or running, the rest wait for it. Ordering is fixed here, in submit()
+        self._keys: Dict[Hashable, deque] = {}
+        self._threads = []
+        self._accepting = False
+        self._pending = 0
+        self._stats = {
+            "submitted": 0,
+            "processed": 0,
+            "failed": 0,
+            # Ran on the webhook thread because the queue stayed full
+            "ran_inline": 0,
+            "in_flight": 0,
+            "queue_high_watermark": 0,
+            "max_wait_seconds": 0.0,
+        }
+
+    def start(self) -> None:
+        """Start the worker threads; safe to call more than once."""
+        with self._lock:
+            if self._accepting:
+                return
+            self._accepting = True
+            for index in range(self.workers):
+                # Daemon threads so a stuck ChatGPT call cannot block interpreter exit;
+                # shutdown() drains the queue before that happens
+                thread = threading.Thread(target=self._work, name=f"linebot-worker-{index}", daemon=True)
+                thread.start()
+                self._threads.append(thread)
+        self.logger.info(f"Event dispatcher started with {self.workers} workers, queue size {self.max_queue}")
+
+    def submit(self, key: Optional[Hashable], task: Callable, *args) -> Future:
+        """Schedule task(*args) after every earlier task with the same key.
+
+        A key of None means the event needs no ordering. The returned future
+        resolves when the task has finished.
+        """
+        if key is None:
+            key = ("unkeyed", next(_unkeyed))
+        if self._accepting:
+            if not self._slots.acquire(timeout=self.put_timeout):
+                event = _Event(key, task, args, holds_slot=False)
+                if self._register(event, inline_only=True):
+                    self.logger.warning(f"Event queue full ({self.max_queue}), processing event on the webhook thread")
+                    with self._lock:
+                        self._stats["ran_inline"] += 1
+                    self._run_chain(event)
+                    return event.future
+                # Earlier events of this user are still pending; running this one now would overtake them
+                self._slots.acquire()
+            event = _Event(key, task, args, holds_slot=True)
+            if self._register(event):
+                self._queue.put(event)
+            return event.future
+
+        event = _Event(key, task, args, holds_slot=False)
+        if self._register(event):
+            self._run_chain(event)
+        return event.future
+
+    def _register(self, event: _Event, inline_only: bool = False) -> bool:
+        """Append event to its key's pending events; True when it is the head and must be started.
+
+        With inline_only the event is only registered when its key has nothing
+        pending at all, so running it right away cannot overtake anything.
+        """
+        with self._lock:
+            pending = self._keys.get(event.key)
+            if inline_only and pending is not None:
+                return False
+            if event.holds_slot:
+                self._pending += 1
+                self._stats["queue_high_watermark"] = max(self._stats["queue_high_watermark"], self._pending)
+            self._stats["submitted"] += 1
+            if pending is not None:
+                pending.append(event)
+                return False
+            self._keys[event.key] = deque([event])
+            return True
+
+    def _work(self) -> None:
+        while True:
+            event = self._queue.get()
+            if event is _STOP:
+                return
+            self._run_chain(event)
+
+    def _run_chain(self, event: _Event) -> None:
+        """Run event, then hand its key's next event to the workers.
+
+        Without running workers (before start() or after shutdown()) the
+        caller's thread runs the following events itself.
+        """
+        while event is not None:
+            self._run(event)
+            with self._lock:
+                pending = self._keys[event.key]
+                pending.popleft()
+                if pending:
+                    event = pending[0]
+                else:
+                    del self._keys[event.key]
+                    event = None
+                    if not self._keys:
+                        self._idle.notify_all()
+                workers_running = bool(self._threads)
+            if event is not None and workers_running:
+                self._queue.put(event)
+                return
+
+    def _run(self, event: _Event) -> None:
+        waited = time.monotonic() - event.queued_at
+        with self._lock:
+            if event.holds_slot:
+                self._pending -= 1
+            self._stats["in_flight"] += 1
+            self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], waited)
+        try:
+            event.future.set_result(event.task(*event.args))
+        except Exception as e:
+            self.logger.error(f"Error processing queued event: {e}")
+            event.future.set_exception(e)
+        finally:
+            with self._lock:
+                self._stats["in_flight"] -= 1
+                self._stats["failed" if event.future.exception() else "processed"] += 1
+            if event.holds_slot:
+                self._slots.release()
+
+    def shutdown(self, timeout: float = 30.0) -> bool:
+        """Stop accepting events and wait up to timeout seconds for pending ones to finish.
+
+        Returns True when everything was drained.
+        """
+        with self._lock:
+            if not self._accepting:
+                return True
+            self._accepting = False
+            self.logger.info(f"Draining event queue ({self._pending} pending)")
+            drained = self._idle.wait_for(lambda: not self._keys, timeout)
+            threads, self._threads = self._threads, []
+        for _ in threads:
+            self._queue.put(_STOP)
+        if drained:
+            for thread in threads:
+                thread.join(1.0)
+        else:
+            self.logger.warning(f"Event queue not drained within {timeout}s, {self._pending} events dropped")
+        return drained
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(
+                queue_depth=self._pending,
+                # Users with an event running or waiting
+                active_users=len(self._keys),
+            )
+        stats.update(
+            workers=self.workers,
+            queue_capacity=self.max_queue,
+            accepting=self._accepting,
+        )
+        stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 3)
+        return stats
+
+
+class AsyncEventDispatcher:
+    """asyncio counterpart of EventDispatcher with the same per-key ordering.
+
+    Each event is a task that first waits for the previous task of its key, so
+    ordering costs nothing while waiting; at most `concurrency` events run at
+    once. When more than max_queue events are waiting, submit() awaits the new
+    event before returning, which holds the webhook response back.
+    """
+
+    def __init__(self, concurrency: int = 256, max_queue: int = 100, logger: logging.Logger = None):
+        self.concurrency = max(1, concurrency)
+        self.max_queue = max(1, max_queue)
+        self.logger = logger or logging.getLogger(__name__)
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        # key -> most recently submitted task of that key
+        self._tails: Dict[Hashable, asyncio.Task] = {}
+        self._tasks: Set[asyncio.Task] = set()
+        self._waiting = 0
+        self._stats = {
+            "submitted": 0,
+            "processed": 0,
+            "failed": 0,
+            # Webhook responses held back because too many events were waiting
+            "backpressured": 0,
+            "in_flight": 0,
+            "queue_high_watermark": 0,
+            "max_wait_seconds": 0.0,
+        }
+
+    async def submit(self, key: Optional[Hashable], task: Callable[..., Awaitable], *args) -> asyncio.Task:
+        """Schedule task(*args) after every earlier task with the same key; None means unordered."""
+        if key is None:
+            key = ("unkeyed", next(_unkeyed))
+        if self._semaphore is None:
+            # Created here so it belongs to the serving event loop
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+
+        runner = asyncio.create_task(self._run(self._tails.get(key), task, args, time.monotonic()))
+        self._tails[key] = runner
+        self._tasks.add(runner)
+        runner.add_done_callback(functools.partial(self._finished, key))
+        self._waiting += 1
+        self._stats["submitted"] += 1
+        self._stats["queue_high_watermark"] = max(self._stats["queue_high_watermark"], self._waiting)
+
+        if self._waiting > self.max_queue:
+            self.logger.warning(f"{self._waiting} events waiting, holding the webhook until this one is processed")
+            self._stats["backpressured"] += 1
+            await asyncio.wait({runner})
+        return runner
+
+    async def _run(self, previous: Optional[asyncio.Task], task: Callable[..., Awaitable], args, queued_at: float) -> None:
+        started = False
+        try:
+            if previous is not None:
+                # Only ordering matters here; the previous event reports its own failure
+                await asyncio.wait({previous})
+            async with self._semaphore:
+                started = True
+                self._waiting -= 1
+                self._stats["in_flight"] += 1
+                self._stats["max_wait_seconds"] = max(self._stats["max_wait_seconds"], time.monotonic() - queued_at)
+                try:
+                    await task(*args)
+                    self._stats["processed"] += 1
+                except Exception as e:
+                    self.logger.error(f"Error processing queued event: {e}")
+                    self._stats["failed"] += 1
+                finally:
+                    self._stats["in_flight"] -= 1
+        finally:
+            if not started:
+                # Cancelled while waiting
+                self._waiting -= 1
+
+    def _finished(self, key: Hashable, runner: asyncio.Task) -> None:
+        self._tasks.discard(runner)
+        if self._tails.get(key) is runner:
+            del self._tails[key]
+
+    async def shutdown(self, timeout: float = 30.0) -> bool:
+        """Wait up to timeout seconds for pending events, then cancel the rest.
+
+        Returns True when everything was drained.
+        """
+        if not self._tasks:
+            return True
+        self.logger.info(f"Draining {len(self._tasks)} pending events")
+        _, pending = await asyncio.wait(set(self._tasks), timeout=timeout)
+        for runner in pending:
+            runner.cancel()
+        if pending:
+            self.logger.warning(f"Event queue not drained within {timeout}s, {len(pending)} events dropped")
+        return not pending
+
+    def stats(self) -> Dict[str, Any]:
+        stats = dict(self._stats)
+        stats.update(
+            queue_depth=self._waiting,
+            active_users=len(self._tails),
+            concurrency=self.concurrency,
+            queue_capacity=self.max_queue,
+        )
+        stats["max_wait_seconds"] = round(stats["max_wait_seconds"], 3)
+        return stats
@@ -1,17 +1,22 @@
-import requests
 import logging
 import json
 from Home_assistant.client import HomeAssistantClient
+from Home_assistant.http_session import get_session
+
+# A search hit stands for the user's reference only if its score beats the runner-up by this factor
+SEARCH_AMBIGUITY_RATIO = 1.5
+LINE_REPLY_URL = 'https://api.line.me/v2/bot/message/reply'
 
 class LineService:
-    def __init__(self, access_token, backend_url=None):
+    def __init__(self, access_token, backend_url=None, session=None):
         self.access_token = access_token
         self.logger = logging.getLogger(__name__)
+        self.session = session or get_session()
         
         # Initialize Home Assistant client for backend API calls
         self.backend_url = backend_url
         if backend_url:
-            self.ha_client = HomeAssistantClient(backend_url)
+            self.ha_client = HomeAssistantClient(backend_url, session=self.session)
         else:
             self.ha_client = None
             
@@ -55,6 +60,8 @@ class LineService:
             if action == 'create_schedule':
                 return self.ha_client.schedules.create_schedule(parameters)
             elif action == 'get_schedule':
+                if parameters.get('query'):
+                    return self.ha_client.schedules.search_schedules(parameters['query'])
                 # Check if we have date parameter for filtering
                 date_param = parameters.get('date')
                 if date_param:
@@ -62,33 +69,35 @@ class LineService:
                 else:
                     return self.ha_client.schedules.get_schedules()
             elif action == 'update_schedule':
-                schedule_id = parameters.get('id')
+                schedule_id, error = self._resolve_id(self.ha_client.schedules.search_schedules, parameters, '排程', 'title')
                 if schedule_id:
-                    return self.ha_client.schedules.update_schedule(schedule_id, parameters)
+                    return self.ha_client.schedules.update_schedule(schedule_id, self._without_query(parameters))
                 else:
-                    return {"error": "Schedule ID required for update"}
+                    return error or {"error": "Schedule ID required for update"}
             elif action == 'delete_schedule':
-                schedule_id = parameters.get('id')
+                schedule_id, error = self._resolve_id(self.ha_client.schedules.search_schedules, parameters, '排程', 'title')
                 if schedule_id:
                     return self.ha_client.schedules.delete_schedule(schedule_id)
                 else:
-                    return {"error": "Schedule ID required for deletion"}
+                    return error or {"error": "Schedule ID required for deletion"}
             elif action == 'create_consumable':
                 return self.ha_client.consumables.create_consumable(parameters)
             elif action == 'get_consumable':
+                if parameters.get('query'):
+                    return self.ha_client.consumables.search_consumables(parameters['query'])
                 return self.ha_client.consumables.get_consumables()
             elif action == 'update_consumable':
-                consumable_id = parameters.get('id')
+                consumable_id, error = self._resolve_id(self.ha_client.consumables.search_consumables, parameters, '消耗品', 'name')
                 if consumable_id:
-                    return self.ha_client.consumables.update_consumable(consumable_id, parameters)
+                    return self.ha_client.consumables.update_consumable(consumable_id, self._without_query(parameters))
                 else:
-                    return {"error": "Consumable ID required for update"}
+                    return error or {"error": "Consumable ID required for update"}
             elif action == 'delete_consumable':
-                consumable_id = parameters.get('id')
+                consumable_id, error = self._resolve_id(self.ha_client.consumables.search_consumables, parameters, '消耗品', 'name')
                 if consumable_id:
                     return self.ha_client.consumables.delete_consumable(consumable_id)
                 else:
-                    return {"error": "Consumable ID required for deletion"}
+                    return error or {"error": "Consumable ID required for deletion"}
             else:
                 return {"error": f"Unknown action: {action}"}
                 
@@ -96,6 +105,37 @@ class LineService:
             self.logger.error(f"Backend operation error: {e}")
             return {"error": str(e)}
 
+    def _resolve_id(self, search, parameters, label, name_field):
+        """Return (id, error) for parameters["id"], or for parameters["query"] via the backend search.
+
+        A name like "看牙醫" resolves with one indexed search request instead of
+        fetching the whole list; ambiguous matches come back as an error listing
+        the candidates so the user can pick an ID.
+        """
+        if parameters.get('id'):
+            return parameters['id'], None
+        query = parameters.get('query')
+        if not query:
+            return None, None
+
+        return self._pick_search_hit(search(query, limit=5), query, label, name_field)
+
+    @staticmethod
+    def _pick_search_hit(hits, query, label, name_field):
+        """(id, error) for the search results of query"""
+        if isinstance(hits, dict):
+            return None, hits if hits.get('error') else {"error": "Invalid search response"}
+        if not hits:
+            return None, {"error": f"找不到符合「{query}」的{label}"}
+        if len(hits) > 1 and hits[0].get('score', 0) < hits[1].get('score', 0) * SEARCH_AMBIGUITY_RATIO:
+            candidates = "\n".join(f"• ID {hit.get('id')}: {hit.get(name_field, 'Unknown')}" for hit in hits)
+            return None, {"error": f"找到多筆符合「{query}」的{label}，請提供 ID:\n{candidates}"}
+        return hits[0].get('id'), None
+
+    @staticmethod
+    def _without_query(parameters):
+        return {key: value for key, value in parameters.items() if key != 'query'}
+
     def _format_backend_response(self, original_reply, backend_result, action, parameters=None):
         """Format the final response based on backend result"""
         # Handle if backend_result is a list
@@ -105,7 +145,11 @@ class LineService:
                 schedules = backend_result
                 if schedules:
                     date_param = parameters.get('date') if parameters else None
-                    if date_param:
+                    query_param = parameters.get('query') if parameters else None
+                    if query_param:
+                        schedule_list = "\n".join([f"• ID {s.get('id', 'N/A')}: {s.get('title', 'Unknown')} ({s.get('start_time', 'N/A')})" for s in schedules])
+                        return f"{original_reply}\n\n🔍 符合「{query_param}」的排程:\n{schedule_list}"
+                    elif date_param:
                         schedule_list = "\n".join([f"• ID {s.get('id', 'N/A')}: {s.get('title', 'Unknown')} ({s.get('start_time', 'N/A')})" for s in schedules])
                         return f"{original_reply}\n\n📅 {date_param} 的排程:\n{schedule_list}"
                     else:
@@ -115,7 +159,11 @@ class LineService:
                     return f"{original_reply}\n\n📅 目前沒有排程。"
             elif action == 'get_consumable':
                 consumables = backend_result
-                if consumables:
+                query_param = parameters.get('query') if parameters else None
+                if consumables and query_param:
+                    consumable_list = "\n".join([f"• ID {c.get('id', 'N/A')}: {c.get('name', 'Unknown')} (剩 {c.get('days_remaining', 'N/A')} 天)" for c in consumables])
+                    return f"{original_reply}\n\n🔍 符合「{query_param}」的消耗品:\n{consumable_list}"
+                elif consumables:
                     consumable_list = "\n".join([f"• {c.get('name', 'Unknown')}: {c.get('quantity', 'N/A')}" for c in consumables])
                     return f"{original_reply}\n\n📦 目前消耗品:\n{consumable_list}"
                 else:
@@ -156,8 +204,8 @@ class LineService:
         else:
             return original_reply
 
-    def reply_to_line(self, reply_token, message):
-        """Send response back to LINE"""
+    def _reply_request(self, reply_token, message):
+        """Headers and body of a LINE reply message"""
         headers = {
             'Content-Type': 'application/json',
             'Authorization': f'Bearer {self.access_token}'
@@ -166,8 +214,13 @@ class LineService:
             'replyToken': reply_token,
             'messages': [{'type': 'text', 'text': message}]
         }
+        return headers, data
+
+    def reply_to_line(self, reply_token, message):
+        """Send response back to LINE"""
+        headers, data = self._reply_request(reply_token, message)
         try:
-            response = requests.post('https://api.line.me/v2/bot/message/reply', headers=headers, json=data)
+            response = self.session.post(LINE_REPLY_URL, headers=headers, json=data)
             response.raise_for_status()
             self.logger.info(f"Successfully sent reply to LINE")
         except Exception as e:
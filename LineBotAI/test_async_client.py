@@ -0,0 +1,111 @@
+"""
+測試 AsyncHomeAssistantClient 呼叫的路徑與後端路由一致，不會觸發 307 轉址
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+import asyncio
+import json
+import re
+import httpx
+from Home_assistant.async_client import AsyncHomeAssistantClient
+
+# 與 FastAPI 後端相同的路由形狀（router prefix + route path）
+BACKEND_ROUTES = [
+    ("GET", r"/api/schedules/"),
+    ("POST", r"/api/schedules/"),
+    ("GET", r"/api/schedules/page"),
+    ("GET", r"/api/schedules/search"),
+    ("GET", r"/api/schedules/by-date/[^/]+"),
+    ("GET", r"/api/schedules/\d+"),
+    ("PUT", r"/api/schedules/\d+"),
+    ("DELETE", r"/api/schedules/\d+"),
+    ("POST", r"/api/schedules/bulk"),
+    ("PATCH", r"/api/schedules/bulk"),
+    ("DELETE", r"/api/schedules/bulk"),
+    ("GET", r"/api/consumables/"),
+    ("POST", r"/api/consumables/"),
+    ("GET", r"/api/consumables/page"),
+    ("GET", r"/api/consumables/search"),
+    ("GET", r"/api/consumables/expiring"),
+    ("GET", r"/api/consumables/\d+"),
+    ("PUT", r"/api/consumables/\d+"),
+    ("DELETE", r"/api/consumables/\d+"),
+    ("POST", r"/api/consumables/bulk"),
+    ("PATCH", r"/api/consumables/bulk"),
+    ("DELETE", r"/api/consumables/bulk"),
+    ("POST", r"/api/consumables/bulk/renew"),
+]
+
+
+def _matches(method, path):
+    return any(method == route_method and re.fullmatch(pattern, path) for route_method, pattern in BACKEND_ROUTES)
+
+
+def backend(request: httpx.Request) -> httpx.Response:
+    """模擬後端：找不到路由但加上或去掉結尾斜線後可對應時，像 FastAPI 一樣回應 307"""
+    path = request.url.path
+    if _matches(request.method, path):
+        if path.endswith("/page"):
+            return httpx.Response(200, json={"items": [{"id": 1}], "next_cursor": None})
+        return httpx.Response(200, json=[{"id": 1}] if request.method == "GET" else {"id": 1})
+    alternative = path[:-1] if path.endswith("/") else path + "/"
+    if _matches(request.method, alternative):
+        return httpx.Response(307, headers={"Location": str(request.url.copy_with(path=alternative))})
+    return httpx.Response(404, json={"detail": "Not Found"})
+
+
+async def run_calls():
+    requested = []
+
+    def record(request):
+        requested.append((request.method, request.url.path))
+        return backend(request)
+
+    # 不跟隨轉址，確保每個方法直接呼叫正確路徑
+    http_client = httpx.AsyncClient(transport=httpx.MockTransport(record), follow_redirects=False)
+    async with http_client:
+        client = AsyncHomeAssistantClient("http://backend", client=http_client)
+        calls = {
+            "get_schedules": client.schedules.get_schedules(),
+            "get_schedules(date)": client.schedules.get_schedules(date="2025-08-12"),
+            "get_all_schedules": client.schedules.get_all_schedules(),
+            "get_schedules_by_date": client.schedules.get_schedules_by_date("2025-08-12"),
+            "search_schedules": client.schedules.search_schedules("看牙醫"),
+            "create_schedule": client.schedules.create_schedule({"title": "x"}),
+            "update_schedule": client.schedules.update_schedule("1", {"title": "y"}),
+            "delete_schedule": client.schedules.delete_schedule("1"),
+            "create_schedules_bulk": client.schedules.create_schedules_bulk([{"title": "x"}]),
+            "delete_schedules_bulk": client.schedules.delete_schedules_bulk([1]),
+            "get_consumables": client.consumables.get_consumables(),
+            "get_all_consumables": client.consumables.get_all_consumables(),
+            "get_expiring_consumables": client.consumables.get_expiring_consumables(),
+            "search_consumables": client.consumables.search_consumables("濾網"),
+            "get_consumable_by_id": client.consumables.get_consumable_by_id("1"),
+            "create_consumable": client.consumables.create_consumable({"name": "x"}),
+            "update_consumable": client.consumables.update_consumable("1", {"name": "y"}),
+            "delete_consumable": client.consumables.delete_consumable("1"),
+            "renew_consumables": client.consumables.renew_consumables([1]),
+        }
+        results = {}
+        for name, call in calls.items():
+            results[name] = await call
+    return results, requested
+
+
+def test_async_client_paths():
+    """每個方法都應直接對應後端路由，而不是收到 307 或 404"""
+
+    print("=== 測試非同步客戶端路徑 ===")
+    results, requested = asyncio.run(run_calls())
+    for name, result in results.items():
+        assert not (isinstance(result, dict) and result.get("error")), f"{name}: {json.dumps(result, ensure_ascii=False)}"
+    for method, path in requested:
+        assert _matches(method, path), f"{method} {path} does not match a backend route"
+    print(f"✓ {len(results)} 個方法、{len(requested)} 個請求皆直接對應後端路由")
+
+
+if __name__ == "__main__":
+    test_async_client_paths()
+    print("\n=== 所有測試通過！ ===")
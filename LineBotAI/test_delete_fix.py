@@ -36,14 +36,14 @@ def test_delete_operations():
     mock_response.raise_for_status = Mock()
     
     print("=== 測試 Schedule Delete 操作 ===")
-    with patch('requests.delete', return_value=mock_response):
+    with patch.object(base_service.session, 'delete', return_value=mock_response):
         result = schedule_service.delete_schedule("1")
         print(f"Schedule Delete 結果: {result}")
         assert result == {"success": True, "message": "操作成功完成"}
         print("✓ Schedule Delete 測試通過")
     
     print("\n=== 測試 Consumable Delete 操作 ===")
-    with patch('requests.delete', return_value=mock_response):
+    with patch.object(base_service.session, 'delete', return_value=mock_response):
         result = consumable_service.delete_consumable("1")
         print(f"Consumable Delete 結果: {result}")
         assert result == {"success": True, "message": "操作成功完成"}
@@ -53,7 +53,7 @@ def test_delete_operations():
     print("\n=== 測試其他成功狀態碼 ===")
     mock_response.status_code = 200
     mock_response.content = b""
-    with patch('requests.delete', return_value=mock_response):
+    with patch.object(base_service.session, 'delete', return_value=mock_response):
         result = schedule_service.delete_schedule("1")
         print(f"200 狀態碼結果: {result}")
         assert result == {"success": True, "message": "操作成功完成"}
@@ -0,0 +1,79 @@
+"""
+測試 EventDispatcher 同一使用者的事件依序處理
+"""
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import random
+import threading
+import time
+from LineBotAI.services.event_dispatcher import EventDispatcher
+
+
+def test_per_user_order():
+    """同一使用者的事件依提交順序執行，不同使用者可平行處理"""
+
+    previous_interval = sys.getswitchinterval()
+    # 頻繁切換執行緒，讓 worker 間的競爭更容易發生
+    sys.setswitchinterval(1e-6)
+    try:
+        print("=== 測試同一使用者事件順序 ===")
+        for run in range(100):
+            dispatcher = EventDispatcher(workers=8, max_queue=100)
+            dispatcher.start()
+            seen = {}
+            lock = threading.Lock()
+
+            def handle(user, index):
+                time.sleep(random.random() / 10000)
+                with lock:
+                    seen.setdefault(user, []).append(index)
+
+            futures = [dispatcher.submit(f"user-{index % 3}", handle, f"user-{index % 3}", index)
+                       for index in range(30)]
+            for future in futures:
+                future.result(timeout=10)
+            assert dispatcher.shutdown(5)
+            for user, indexes in seen.items():
+                assert indexes == sorted(indexes), f"run {run}: {user} processed out of order: {indexes}"
+        print("✓ 順序測試通過")
+    finally:
+        sys.setswitchinterval(previous_interval)
+
+
+def test_inline_fallback_keeps_order():
+    """佇列已滿時，在 webhook 執行緒直接處理的事件不得超越同一使用者較早的事件"""
+
+    print("\n=== 測試佇列已滿時的順序 ===")
+    dispatcher = EventDispatcher(workers=1, max_queue=2, put_timeout=0.05)
+    dispatcher.start()
+    order = []
+    release = threading.Event()
+
+    def blocking(name):
+        release.wait(5)
+        order.append(name)
+
+    # 兩個空位被 user-a 的事件佔滿，第二個仍在佇列中尚未開始
+    first = dispatcher.submit("user-a", blocking, "a1")
+    second = dispatcher.submit("user-a", order.append, "a2")
+    # 其他使用者沒有待處理事件，可以直接在 webhook 執行緒處理
+    dispatcher.submit("user-b", order.append, "b1").result(timeout=5)
+    assert dispatcher.stats()["ran_inline"] == 1
+
+    # user-a 還有待處理事件，必須等待空位而不是直接執行
+    threading.Timer(0.2, release.set).start()
+    third = dispatcher.submit("user-a", order.append, "a3")
+    for future in (first, second, third):
+        future.result(timeout=5)
+    assert dispatcher.shutdown(5)
+    assert [name for name in order if name.startswith("a")] == ["a1", "a2", "a3"], order
+    assert dispatcher.stats()["ran_inline"] == 1
+    print("✓ 佇列已滿順序測試通過")
+
+
+if __name__ == "__main__":
+    test_per_user_order()
+    test_inline_fallback_keeps_order()
+    print("\n=== 所有測試通過！ ===")
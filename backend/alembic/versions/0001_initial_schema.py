@@ -0,0 +1,59 @@
+"""Initial schema: schedules and consumables
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-07-20 10:00:00
+
+Databases bootstrapped by the old startup DDL already have these tables;
+they are left untouched so the migration history can be adopted in place.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0001'
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def existing_tables():
+    # Offline (--sql) runs cannot inspect the database and emit the full schema
+    if op.get_context().as_sql:
+        return set()
+    return set(sa.inspect(op.get_bind()).get_table_names())
+
+
+def upgrade():
+    tables = existing_tables()
+
+    if 'schedules' not in tables:
+        op.create_table(
+            'schedules',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('title', sa.String(length=255), nullable=False),
+            sa.Column('description', sa.Text(), nullable=True),
+            sa.Column('start_time', sa.DateTime(timezone=True), nullable=False),
+            sa.Column('end_time', sa.DateTime(timezone=True), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+    if 'consumables' not in tables:
+        op.create_table(
+            'consumables',
+            sa.Column('id', sa.Integer(), primary_key=True),
+            sa.Column('name', sa.String(length=255), nullable=False),
+            sa.Column('category', sa.String(length=100), nullable=False),
+            sa.Column('installation_date', sa.Date(), nullable=False),
+            sa.Column('lifetime_days', sa.Integer(), nullable=False),
+            sa.Column('notes', sa.Text(), nullable=True),
+            sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+            sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        )
+
+
+def downgrade():
+    op.drop_table('consumables')
+    op.drop_table('schedules')
@@ -0,0 +1,66 @@
+"""Performance indexes for schedule windows, categories and expiry
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-07-20 10:05:00
+
+All indexes are built with CREATE INDEX CONCURRENTLY so writes to a live
+table are not blocked. CONCURRENTLY cannot run inside a transaction, hence
+the autocommit blocks.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0002'
+down_revision = '0001'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    # (name, table, columns or expressions)
+    ('ix_schedules_start_time_id', 'schedules', ['start_time', 'id']),
+    ('ix_schedules_end_time', 'schedules', ['end_time']),
+    ('ix_consumables_category', 'consumables', ['category']),
+    ('ix_consumables_expiry', 'consumables', [sa.text('(installation_date + lifetime_days)')]),
+]
+
+
+def drop_invalid_index(name):
+    """Drop an index left INVALID by an interrupted concurrent build, so it gets rebuilt"""
+    op.execute(sa.text(f"""
+        DO $$
+        BEGIN
+            IF EXISTS (
+                SELECT 1 FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+                WHERE c.relname = '{name}' AND NOT i.indisvalid
+            ) THEN
+                EXECUTE 'DROP INDEX {name}';
+            END IF;
+        END $$;
+    """))
+
+
+def upgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns in INDEXES:
+            drop_invalid_index(name)
+            op.create_index(
+                name, table, columns,
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+        # Superseded by ix_schedules_start_time_id
+        op.drop_index(
+            'ix_schedules_start_time', table_name='schedules',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, _ in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True, postgresql_concurrently=True)
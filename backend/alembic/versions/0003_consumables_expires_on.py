@@ -0,0 +1,57 @@
+"""Stored expires_on column for consumables
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-07-21 09:00:00
+
+expires_on is a STORED generated column (installation_date + lifetime_days),
+so "expiring soon" filters and ordering run in Postgres against a plain
+b-tree index. It replaces the ix_consumables_expiry expression index.
+
+Adding a stored generated column rewrites the table under an exclusive lock;
+consumables is a small household inventory table, so this is brief.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0003'
+down_revision = '0002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column(
+        'consumables',
+        sa.Column('expires_on', sa.Date(), sa.Computed('installation_date + lifetime_days', persisted=True)),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_consumables_expires_on', 'consumables', ['expires_on'],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        # Superseded by ix_consumables_expires_on
+        op.drop_index(
+            'ix_consumables_expiry', table_name='consumables',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_consumables_expiry', 'consumables', [sa.text('(installation_date + lifetime_days)')],
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            'ix_consumables_expires_on', table_name='consumables',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+    op.drop_column('consumables', 'expires_on')
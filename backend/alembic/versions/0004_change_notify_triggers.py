@@ -0,0 +1,80 @@
+"""NOTIFY triggers for row changes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-07-28 09:00:00
+
+Statement-level AFTER triggers on schedules and consumables send one
+pg_notify('row_changes', ...) per statement with a JSON payload of
+{"table", "op", "ids"}. Each backend worker LISTENs on the channel and evicts
+its in-process caches (app/cache/notify.py).
+
+Statement-level triggers with transition tables keep bulk writes to a single
+notification. NOTIFY payloads are limited to 8000 bytes, so statements that
+touch more than MAX_NOTIFY_IDS rows send "ids": null, meaning "anything in
+this table may have changed". Notifications are delivered on commit only.
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '0004'
+down_revision = '0003'
+branch_labels = None
+depends_on = None
+
+CHANNEL = 'row_changes'
+MAX_NOTIFY_IDS = 500
+TABLES = ('schedules', 'consumables')
+
+
+def upgrade():
+    op.execute(f"""
+        CREATE OR REPLACE FUNCTION notify_row_changes() RETURNS trigger AS $$
+        DECLARE
+            changed_ids integer[];
+        BEGIN
+            IF TG_OP = 'DELETE' THEN
+                SELECT array_agg(id) INTO changed_ids FROM old_rows;
+            ELSE
+                SELECT array_agg(id) INTO changed_ids FROM new_rows;
+            END IF;
+
+            -- The statement matched no rows
+            IF changed_ids IS NULL THEN
+                RETURN NULL;
+            END IF;
+
+            PERFORM pg_notify('{CHANNEL}', json_build_object(
+                'table', TG_TABLE_NAME,
+                'op', lower(TG_OP),
+                'ids', CASE WHEN cardinality(changed_ids) <= {MAX_NOTIFY_IDS} THEN to_json(changed_ids) END
+            )::text);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+
+    for table in TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify_insert AFTER INSERT ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_row_changes()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify_update AFTER UPDATE ON {table}
+            REFERENCING NEW TABLE AS new_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_row_changes()
+        """)
+        op.execute(f"""
+            CREATE TRIGGER {table}_notify_delete AFTER DELETE ON {table}
+            REFERENCING OLD TABLE AS old_rows
+            FOR EACH STATEMENT EXECUTE FUNCTION notify_row_changes()
+        """)
+
+
+def downgrade():
+    for table in TABLES:
+        for event in ('insert', 'update', 'delete'):
+            op.execute(f"DROP TRIGGER IF EXISTS {table}_notify_{event} ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS notify_row_changes()")
@@ -0,0 +1,53 @@
+"""Row version column for optimistic concurrency
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2025-08-04 09:00:00
+
+Adds version (starting at 1) to schedules and consumables. A BEFORE UPDATE
+trigger increments it and stamps updated_at on every update, whoever issues
+it: ORM updates, bulk UPDATE ... FROM (VALUES ...), renew, or psql. Writes
+compare it through If-Match inside the UPDATE/DELETE WHERE clause, so no row
+locks are held.
+
+ADD COLUMN with a constant default is a metadata-only change on PostgreSQL 11+.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0005'
+down_revision = '0004'
+branch_labels = None
+depends_on = None
+
+TABLES = ('schedules', 'consumables')
+
+
+def upgrade():
+    for table in TABLES:
+        op.add_column(table, sa.Column('version', sa.Integer(), nullable=False, server_default='1'))
+
+    op.execute("""
+        CREATE OR REPLACE FUNCTION bump_row_version() RETURNS trigger AS $$
+        BEGIN
+            NEW.version := OLD.version + 1;
+            NEW.updated_at := now();
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    for table in TABLES:
+        op.execute(f"""
+            CREATE TRIGGER {table}_bump_version BEFORE UPDATE ON {table}
+            FOR EACH ROW EXECUTE FUNCTION bump_row_version()
+        """)
+
+
+def downgrade():
+    for table in TABLES:
+        op.execute(f"DROP TRIGGER IF EXISTS {table}_bump_version ON {table}")
+    op.execute("DROP FUNCTION IF EXISTS bump_row_version()")
+    for table in TABLES:
+        op.drop_column(table, 'version')
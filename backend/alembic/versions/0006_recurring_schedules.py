@@ -0,0 +1,65 @@
+"""Recurring schedules and per-occurrence exceptions
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2025-08-11 09:00:00
+
+A schedule with a recurrence_rule (RRULE subset, app/api/recurrence.py) is a
+series: start_time/end_time describe its first occurrence, and further
+occurrences are expanded on read, only inside the requested window.
+timezone anchors the wall-clock time of the occurrences (NULL = server
+default). schedule_exceptions holds cancelled or modified occurrences,
+keyed by the occurrence's original start.
+
+The partial index keeps the "series starting before the window" lookup
+small no matter how many one-off schedules exist. It is built concurrently,
+outside the migration transaction, so writes to schedules are not blocked.
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '0006'
+down_revision = '0005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.add_column('schedules', sa.Column('recurrence_rule', sa.Text(), nullable=True))
+    op.add_column('schedules', sa.Column('timezone', sa.String(64), nullable=True))
+    op.create_table(
+        'schedule_exceptions',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('schedule_id', sa.Integer(), sa.ForeignKey('schedules.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('original_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('cancelled', sa.Boolean(), nullable=False, server_default=sa.false()),
+        sa.Column('title', sa.String(255), nullable=True),
+        sa.Column('description', sa.Text(), nullable=True),
+        sa.Column('start_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('end_time', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.UniqueConstraint('schedule_id', 'original_start', name='uq_schedule_exceptions_occurrence'),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            'ix_schedules_recurring_start_time', 'schedules', ['start_time'],
+            postgresql_where=sa.text('recurrence_rule IS NOT NULL'),
+            if_not_exists=True,
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            'ix_schedules_recurring_start_time', table_name='schedules',
+            if_exists=True,
+            postgresql_concurrently=True,
+        )
+    op.drop_table('schedule_exceptions')
+    op.drop_column('schedules', 'timezone')
+    op.drop_column('schedules', 'recurrence_rule')
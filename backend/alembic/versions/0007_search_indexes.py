@@ -0,0 +1,80 @@
+"""Trigram and full-text search columns for schedules and consumables
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2025-08-18 09:00:00
+
+Each table gets two STORED generated columns:
+- search_text: the searchable fields joined into one string, indexed with a
+  pg_trgm GIN index so ILIKE '%...%' substring matches (including CJK, which
+  has no word boundaries for the text search parser) and fuzzy word
+  similarity run as index scans
+- search_vector: a weighted 'simple' tsvector (title/name A, description/notes
+  B) with a GIN index, used for matching whole words and ranking
+
+Keeping the expressions in generated columns means queries reference plain
+columns, so the planner always matches the indexes. Adding a stored
+generated column rewrites the table; both are small household tables.
+pg_trgm ships with the contrib modules of the official postgres image.
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects.postgresql import TSVECTOR
+
+
+# revision identifiers, used by Alembic.
+revision = '0007'
+down_revision = '0006'
+branch_labels = None
+depends_on = None
+
+# table -> (primary field, secondary field)
+SEARCH_FIELDS = {
+    'schedules': ('title', 'description'),
+    'consumables': ('name', 'notes'),
+}
+
+
+def upgrade():
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+
+    for table, (primary, secondary) in SEARCH_FIELDS.items():
+        op.add_column(table, sa.Column(
+            'search_text', sa.Text(),
+            sa.Computed(f"coalesce({primary}, '') || ' ' || coalesce({secondary}, '')", persisted=True),
+        ))
+        op.add_column(table, sa.Column(
+            'search_vector', TSVECTOR(),
+            sa.Computed(
+                f"setweight(to_tsvector('simple', coalesce({primary}, '')), 'A') || "
+                f"setweight(to_tsvector('simple', coalesce({secondary}, '')), 'B')",
+                persisted=True,
+            ),
+        ))
+
+    with op.get_context().autocommit_block():
+        for table in SEARCH_FIELDS:
+            op.create_index(
+                f'ix_{table}_search_text_trgm', table, ['search_text'],
+                postgresql_using='gin',
+                postgresql_ops={'search_text': 'gin_trgm_ops'},
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+            op.create_index(
+                f'ix_{table}_search_vector', table, ['search_vector'],
+                postgresql_using='gin',
+                if_not_exists=True,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for table in SEARCH_FIELDS:
+            op.drop_index(f'ix_{table}_search_vector', table_name=table, if_exists=True, postgresql_concurrently=True)
+            op.drop_index(f'ix_{table}_search_text_trgm', table_name=table, if_exists=True, postgresql_concurrently=True)
+
+    for table in SEARCH_FIELDS:
+        op.drop_column(table, 'search_vector')
+        op.drop_column(table, 'search_text')
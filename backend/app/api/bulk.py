@@ -0,0 +1,76 @@
+from collections import defaultdict
+from typing import Any, Dict, Generic, List, Optional, TypeVar
+from fastapi import HTTPException
+from pydantic import BaseModel
+from sqlalchemy import Integer, column, update, values
+from sqlalchemy.ext.asyncio import AsyncSession
+
+T = TypeVar("T")
+
+# Upper bound on items per bulk request, keeps a single transaction short
+MAX_BULK_ITEMS = 1000
+
+
+class BulkItemResult(BaseModel, Generic[T]):
+    """Outcome for one item of a bulk request, in request order"""
+    index: int
+    id: Optional[int] = None
+    status: str  # created | updated | deleted | not_found | error
+    data: Optional[T] = None
+    error: Optional[str] = None
+
+
+class BulkResult(BaseModel, Generic[T]):
+    succeeded: int
+    failed: int
+    results: List[BulkItemResult[T]]
+
+
+class BulkDeleteRequest(BaseModel):
+    ids: List[int]
+
+
+def check_batch_size(count: int) -> None:
+    if count == 0:
+        raise HTTPException(status_code=400, detail="Bulk request must contain at least one item")
+    if count > MAX_BULK_ITEMS:
+        raise HTTPException(status_code=400, detail=f"Bulk request cannot exceed {MAX_BULK_ITEMS} items")
+
+
+def summarize(results: List[dict]) -> dict:
+    """Wrap per-item results with success/failure counts"""
+    results.sort(key=lambda r: r["index"])
+    failed = sum(1 for r in results if r["status"] in ("not_found", "error"))
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+async def update_rows_by_id(db: AsyncSession, model, changes: Dict[int, Dict[str, Any]]) -> Dict[int, Any]:
+    """Apply per-row partial updates and return the updated ORM objects by id.
+
+    Rows touching the same set of columns share one
+    UPDATE ... FROM (VALUES ...) ... RETURNING statement, so a uniform batch is
+    a single round trip. Ids that do not exist are simply absent from the result.
+    """
+    groups = defaultdict(dict)
+    for row_id, fields in changes.items():
+        groups[tuple(sorted(fields))][row_id] = fields
+
+    table = model.__table__
+    updated = {}
+    for names, rows in groups.items():
+        data = values(
+            column("id", Integer),
+            *(column(name, table.c[name].type) for name in names),
+            name="changes",
+        ).data([(row_id, *(fields[name] for name in names)) for row_id, fields in rows.items()])
+
+        result = await db.execute(
+            update(model)
+            .where(table.c.id == data.c.id)
+            .values({name: data.c[name] for name in names})
+            .returning(model)
+            .execution_options(synchronize_session=False)
+        )
+        for obj in result.scalars():
+            updated[obj.id] = obj
+    return updated
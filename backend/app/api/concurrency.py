@@ -0,0 +1,25 @@
+from fastapi import HTTPException, Request
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.future import select
+
+from app.cache.etag import if_match_versions
+
+
+def if_match_filter(request: Request, model) -> tuple:
+    """WHERE conditions enforcing If-Match on model.version (none without the header)"""
+    versions = if_match_versions(request)
+    if versions is None:
+        return ()
+    return (model.version.in_(versions),)
+
+
+async def write_failure(db: AsyncSession, model, row_id: int, not_found_detail: str) -> HTTPException:
+    """Explain why a conditional UPDATE/DELETE matched no row: 404 if it is gone, else 412.
+
+    Only runs on the failure path, so successful writes stay a single statement.
+    """
+    result = await db.execute(select(model.version).filter(model.id == row_id))
+    version = result.scalar()
+    if version is None:
+        return HTTPException(status_code=404, detail=not_found_detail)
+    return HTTPException(status_code=412, detail=f"Version mismatch, current version is {version}")
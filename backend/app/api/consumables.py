@@ -1,11 +1,19 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
+from sqlalchemy import insert, update, delete
 from typing import List, Optional
-from datetime import date, datetime
-from pydantic import BaseModel
-from app.database.database import get_db
-from app.models.consumable import Consumable
+from datetime import date, datetime, timedelta
+from pydantic import BaseModel, ConfigDict
+from app.database.database import get_db, get_db_transaction
+from app.models.consumable import Consumable, current_day, pin_today
+from app.api.pagination import CursorPage, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor
+from app.cache import changes
+from app.cache.response_cache import cached_response
+from app.cache.etag import row_etag
+from app.api.concurrency import if_match_filter, write_failure
+from app.api.search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_query
+from app.api.bulk import BulkResult, BulkDeleteRequest, check_batch_size, summarize, update_rows_by_id
 
 router = APIRouter()
 
@@ -30,42 +38,125 @@ class ConsumableUpdate(BaseModel):
     notes: str = None
 
 
+class ConsumableBulkUpdate(ConsumableUpdate):
+    id: int
+
+
+class ConsumableRenew(BaseModel):
+    """Select items by ids or by category; installation_date defaults to today."""
+    ids: Optional[List[int]] = None
+    category: Optional[str] = None
+    installation_date: Optional[date] = None
+
+
 class ConsumableResponse(ConsumableBase):
     id: int
     created_at: datetime
     updated_at: datetime
-    days_remaining: int = None
+    version: int
+    expires_on: Optional[date] = None
+    # Consumable.days_remaining, computed from expires_on
+    days_remaining: int
+
+    model_config = ConfigDict(from_attributes=True)
+
 
-    class Config:
-        orm_mode = True
+class ConsumableSearchResult(ConsumableResponse):
+    score: float = 0.0
 
 
-def calculate_days_remaining(installation_date: date, lifetime_days: int) -> int:
-    """Calculate the remaining days for a consumable."""
-    days_passed = (date.today() - installation_date).days
-    return max(0, lifetime_days - days_passed)
+def expiring_query(within_days: int, category: Optional[str] = None, include_expired: bool = True,
+                   today: Optional[date] = None):
+    """SELECT consumables expiring within within_days; the expiry filter runs in Postgres.
+
+    today defaults to current_day(), the same day days_remaining counts from.
+    """
+    today = today or current_day()
+
+    query = select(Consumable).filter(Consumable.expires_on <= today + timedelta(days=within_days))
+    if not include_expired:
+        query = query.filter(Consumable.expires_on >= today)
+    if category:
+        query = query.filter(Consumable.category == category)
+    return query
 
 
 @router.get("/", response_model=List[ConsumableResponse])
-async def get_consumables(skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
+@cached_response(Consumable, List[ConsumableResponse], extra=pin_today)
+async def get_consumables(request: Request, skip: int = 0, limit: int = 100, db: AsyncSession = Depends(get_db)):
     """Get all consumables with pagination."""
     result = await db.execute(select(Consumable).offset(skip).limit(limit))
     consumables = result.scalars().all()
 
-    return [
-        {
-            "id": item.id,
-            "name": item.name,
-            "category": item.category,
-            "installation_date": item.installation_date,
-            "lifetime_days": item.lifetime_days,
-            "notes": item.notes,
-            "created_at": item.created_at,
-            "updated_at": item.updated_at,
-            "days_remaining": calculate_days_remaining(item.installation_date, item.lifetime_days),
-        }
-        for item in consumables
-    ]
+    return consumables
+
+
+@router.get("/page", response_model=CursorPage[ConsumableResponse])
+@cached_response(Consumable, CursorPage[ConsumableResponse], extra=pin_today)
+async def get_consumables_page(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get consumables ordered by id using keyset pagination."""
+    query = select(Consumable).order_by(Consumable.id)
+    if cursor:
+        (last_id,) = decode_cursor(cursor, 1)
+        if not isinstance(last_id, int):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(Consumable.id > last_id)
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    consumables = result.scalars().all()
+
+    next_cursor = None
+    if len(consumables) > limit:
+        consumables = consumables[:limit]
+        next_cursor = encode_cursor(consumables[-1].id)
+    return {"items": consumables, "next_cursor": next_cursor}
+
+
+@router.get("/expiring", response_model=List[ConsumableResponse])
+@cached_response(Consumable, List[ConsumableResponse], extra=pin_today)
+async def get_expiring_consumables(
+    request: Request,
+    within_days: int = Query(14, ge=0, le=3650, description="Include items expiring within this many days"),
+    category: Optional[str] = Query(None, description="Only items of this category"),
+    include_expired: bool = Query(True, description="Include items that have already expired"),
+    sort: str = Query("days_remaining", pattern="^(days_remaining|name|category)$"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get consumables expiring soon; filtering and ordering on expires_on run in Postgres."""
+    order_by = {
+        "days_remaining": (Consumable.expires_on, Consumable.id),
+        "name": (Consumable.name, Consumable.id),
+        "category": (Consumable.category, Consumable.expires_on, Consumable.id),
+    }[sort]
+
+    query = expiring_query(within_days, category, include_expired)
+    result = await db.execute(query.order_by(*order_by).limit(limit))
+    return result.scalars().all()
+
+
+@router.get("/search", response_model=List[ConsumableSearchResult])
+@cached_response(Consumable, List[ConsumableSearchResult], extra=pin_today)
+async def search_consumables(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words or a substring of the name / notes"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    db: AsyncSession = Depends(get_db)
+):
+    """Find consumables by name / notes with one indexed query, best match first."""
+    result = await db.execute(search_query(Consumable, q.strip(), limit))
+    hits = []
+    for item, score in result.all():
+        hit = ConsumableSearchResult.model_validate(item)
+        hit.score = round(score, 4)
+        hits.append(hit)
+    return hits
 
 
 @router.post("/", response_model=ConsumableResponse, status_code=status.HTTP_201_CREATED)
@@ -75,22 +166,120 @@ async def create_consumable(consumable: ConsumableCreate, db: AsyncSession = Dep
     db.add(db_consumable)
     await db.commit()
     await db.refresh(db_consumable)
+    changes.publish(Consumable.__tablename__, "insert", [db_consumable.id])
+
+    return db_consumable
+
+
+@router.post("/bulk", response_model=BulkResult[ConsumableResponse])
+async def create_consumables_bulk(consumables: List[ConsumableCreate], db: AsyncSession = Depends(get_db_transaction)):
+    """Create many consumables in one transaction with a multi-row INSERT ... RETURNING."""
+    check_batch_size(len(consumables))
+
+    result = await db.execute(
+        insert(Consumable).returning(Consumable, sort_by_parameter_order=True),
+        [consumable.dict() for consumable in consumables]
+    )
+    created = result.scalars().all()
+    await db.commit()
+    changes.publish(Consumable.__tablename__, "insert", [item.id for item in created])
+
+    return summarize([
+        {"index": index, "id": item.id, "status": "created", "data": item}
+        for index, item in enumerate(created)
+    ])
+
+
+@router.patch("/bulk", response_model=BulkResult[ConsumableResponse])
+async def update_consumables_bulk(consumables: List[ConsumableBulkUpdate], db: AsyncSession = Depends(get_db_transaction)):
+    """Partially update many consumables in one transaction; each item carries its id."""
+    check_batch_size(len(consumables))
 
-    return {
-        "id": db_consumable.id,
-        "name": db_consumable.name,
-        "category": db_consumable.category,
-        "installation_date": db_consumable.installation_date,
-        "lifetime_days": db_consumable.lifetime_days,
-        "notes": db_consumable.notes,
-        "created_at": db_consumable.created_at,
-        "updated_at": db_consumable.updated_at,
-        "days_remaining": calculate_days_remaining(db_consumable.installation_date, db_consumable.lifetime_days),
-    }
+    results = []
+    row_changes = {}
+    indexes = {}
+    for index, consumable in enumerate(consumables):
+        update_data = consumable.dict(exclude_unset=True, exclude={"id"})
+        if consumable.id in indexes:
+            results.append({"index": index, "id": consumable.id, "status": "error", "error": "Duplicate id in batch"})
+        elif not update_data:
+            results.append({"index": index, "id": consumable.id, "status": "error", "error": "No fields to update"})
+        else:
+            row_changes[consumable.id] = update_data
+            indexes[consumable.id] = index
+
+    updated = await update_rows_by_id(db, Consumable, row_changes)
+    await db.commit()
+    changes.publish(Consumable.__tablename__, "update", updated.keys())
+
+    for consumable_id, index in indexes.items():
+        if consumable_id in updated:
+            results.append({"index": index, "id": consumable_id, "status": "updated", "data": updated[consumable_id]})
+        else:
+            results.append({"index": index, "id": consumable_id, "status": "not_found", "error": "Consumable not found"})
+    return summarize(results)
+
+
+@router.delete("/bulk", response_model=BulkResult[ConsumableResponse])
+async def delete_consumables_bulk(request: BulkDeleteRequest, db: AsyncSession = Depends(get_db_transaction)):
+    """Delete many consumables with a single DELETE ... RETURNING."""
+    check_batch_size(len(request.ids))
+
+    result = await db.execute(
+        delete(Consumable).where(Consumable.id.in_(request.ids)).returning(Consumable.id)
+    )
+    deleted = set(result.scalars().all())
+    await db.commit()
+    changes.publish(Consumable.__tablename__, "delete", deleted)
+
+    return summarize([
+        {"index": index, "id": consumable_id, "status": "deleted"}
+        if consumable_id in deleted else
+        {"index": index, "id": consumable_id, "status": "not_found", "error": "Consumable not found"}
+        for index, consumable_id in enumerate(request.ids)
+    ])
+
+
+@router.post("/bulk/renew", response_model=BulkResult[ConsumableResponse])
+async def renew_consumables(renew: ConsumableRenew, db: AsyncSession = Depends(get_db)):
+    """Mark items as replaced: reset installation_date for a list of ids or a whole category.
+
+    Runs as a single UPDATE ... RETURNING, so it is atomic on its own.
+    """
+    if (renew.ids is None) == (renew.category is None):
+        raise HTTPException(status_code=400, detail="Provide either ids or category")
+    if renew.ids is not None:
+        check_batch_size(len(renew.ids))
+        condition = Consumable.id.in_(renew.ids)
+    else:
+        condition = Consumable.category == renew.category
+
+    result = await db.execute(
+        update(Consumable)
+        .where(condition)
+        .values(installation_date=renew.installation_date or current_day())
+        .returning(Consumable)
+        .execution_options(synchronize_session=False)
+    )
+    renewed = {item.id: item for item in result.scalars().all()}
+    changes.publish(Consumable.__tablename__, "update", renewed.keys())
+
+    if renew.ids is None:
+        return summarize([
+            {"index": index, "id": item.id, "status": "updated", "data": item}
+            for index, item in enumerate(sorted(renewed.values(), key=lambda item: item.id))
+        ])
+    return summarize([
+        {"index": index, "id": consumable_id, "status": "updated", "data": renewed[consumable_id]}
+        if consumable_id in renewed else
+        {"index": index, "id": consumable_id, "status": "not_found", "error": "Consumable not found"}
+        for index, consumable_id in enumerate(renew.ids)
+    ])
 
 
 @router.get("/{consumable_id}", response_model=ConsumableResponse)
-async def get_consumable(consumable_id: int, db: AsyncSession = Depends(get_db)):
+@cached_response(Consumable, ConsumableResponse, id_param="consumable_id", extra=pin_today)
+async def get_consumable(consumable_id: int, request: Request, db: AsyncSession = Depends(get_db)):
     """Get a specific consumable by ID."""
     result = await db.execute(select(Consumable).filter(Consumable.id == consumable_id))
     consumable = result.scalars().first()
@@ -98,56 +287,50 @@ async def get_consumable(consumable_id: int, db: AsyncSession = Depends(get_db))
     if not consumable:
         raise HTTPException(status_code=404, detail="Consumable not found")
 
-    return {
-        "id": consumable.id,
-        "name": consumable.name,
-        "category": consumable.category,
-        "installation_date": consumable.installation_date,
-        "lifetime_days": consumable.lifetime_days,
-        "notes": consumable.notes,
-        "created_at": consumable.created_at,
-        "updated_at": consumable.updated_at,
-        "days_remaining": calculate_days_remaining(consumable.installation_date, consumable.lifetime_days),
-    }
+    return consumable
 
 
 @router.put("/{consumable_id}", response_model=ConsumableResponse)
-async def update_consumable(consumable_id: int, consumable: ConsumableUpdate, db: AsyncSession = Depends(get_db)):
-    """Update a consumable."""
-    result = await db.execute(select(Consumable).filter(Consumable.id == consumable_id))
+async def update_consumable(
+    consumable_id: int,
+    consumable: ConsumableUpdate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_db)
+):
+    """Update a consumable with a single UPDATE ... RETURNING; honours If-Match."""
+    conditions = (Consumable.id == consumable_id, *if_match_filter(request, Consumable))
+    update_data = consumable.dict(exclude_unset=True)
+    if update_data:
+        result = await db.execute(
+            update(Consumable)
+            .where(*conditions)
+            .values(**update_data)
+            .returning(Consumable)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        result = await db.execute(select(Consumable).where(*conditions))
     db_consumable = result.scalars().first()
 
     if not db_consumable:
-        raise HTTPException(status_code=404, detail="Consumable not found")
-
-    update_data = consumable.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_consumable, key, value)
-
-    await db.commit()
-    await db.refresh(db_consumable)
+        raise await write_failure(db, Consumable, consumable_id, "Consumable not found")
 
-    return {
-        "id": db_consumable.id,
-        "name": db_consumable.name,
-        "category": db_consumable.category,
-        "installation_date": db_consumable.installation_date,
-        "lifetime_days": db_consumable.lifetime_days,
-        "notes": db_consumable.notes,
-        "created_at": db_consumable.created_at,
-        "updated_at": db_consumable.updated_at,
-        "days_remaining": calculate_days_remaining(db_consumable.installation_date, db_consumable.lifetime_days),
-    }
+    if update_data:
+        changes.publish(Consumable.__tablename__, "update", [consumable_id])
+    response.headers["ETag"] = row_etag(db_consumable.version, pin_today())
+    return db_consumable
 
 
 @router.delete("/{consumable_id}", status_code=status.HTTP_204_NO_CONTENT)
-async def delete_consumable(consumable_id: int, db: AsyncSession = Depends(get_db)):
-    """Delete a consumable by ID."""
-    result = await db.execute(select(Consumable).filter(Consumable.id == consumable_id))
-    db_consumable = result.scalars().first()
-
-    if not db_consumable:
-        raise HTTPException(status_code=404, detail="Consumable not found")
+async def delete_consumable(consumable_id: int, request: Request, db: AsyncSession = Depends(get_db)):
+    """Delete a consumable with a single DELETE ... RETURNING; honours If-Match."""
+    result = await db.execute(
+        delete(Consumable)
+        .where(Consumable.id == consumable_id, *if_match_filter(request, Consumable))
+        .returning(Consumable.id)
+    )
+    if result.scalar() is None:
+        raise await write_failure(db, Consumable, consumable_id, "Consumable not found")
 
-    await db.delete(db_consumable)
-    await db.commit()
+    changes.publish(Consumable.__tablename__, "delete", [consumable_id])
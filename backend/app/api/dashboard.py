@@ -0,0 +1,127 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+from typing import List, Optional
+from fastapi import APIRouter, Query
+from pydantic import BaseModel
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from app.database.database import AsyncSessionLocal
+from app.models.schedule import Schedule
+from app.models.consumable import Consumable, pin_today
+from app.api.schedules import (
+    MAX_RANGE_DAYS, ScheduleResponse, _get_zone, _local_day_window, _localize, _occurrences_in_window, _overlaps_window,
+)
+from app.api.consumables import ConsumableResponse, expiring_query
+
+router = APIRouter()
+
+# Pooled sessions all summary requests together may hold at once. Kept below the
+# engine's pool_size (5), so concurrent dashboard loads queue here instead of
+# draining the pool every other endpoint needs.
+MAX_CONCURRENT_QUERIES = 3
+_query_slots = asyncio.Semaphore(MAX_CONCURRENT_QUERIES)
+
+
+class CategoryCount(BaseModel):
+    category: str
+    total: int
+    expiring: int
+
+
+class DashboardSummary(BaseModel):
+    date: date
+    timezone: str
+    today: List[ScheduleResponse]
+    upcoming: List[ScheduleResponse]
+    expiring: List[ConsumableResponse]
+    categories: List[CategoryCount]
+
+
+async def _in_session(query):
+    """Run one statement on its own pooled session; an AsyncSession cannot run statements concurrently"""
+    async with _query_slots, AsyncSessionLocal() as db:
+        result = await db.execute(query)
+        return result.all()
+
+
+async def _occurrences(window_start: datetime, window_end: datetime, overlap: bool,
+                       limit: Optional[int] = None) -> List[ScheduleResponse]:
+    """Recurring schedules expanded on their own pooled session, as /range and /by-date do"""
+    async with _query_slots, AsyncSessionLocal() as db:
+        return await _occurrences_in_window(db, window_start, window_end, overlap, limit)
+
+
+@router.get("/summary", response_model=DashboardSummary)
+async def get_dashboard_summary(
+    day: Optional[str] = Query(None, alias="date", description="Local date (YYYY-MM-DD), defaults to today"),
+    tz: Optional[str] = Query(None, description="IANA timezone for the day boundaries"),
+    upcoming: int = Query(5, ge=0, le=50, description="Number of upcoming events"),
+    within_days: int = Query(14, ge=0, le=3650, description="Expiry horizon for consumables"),
+    expiring_limit: int = Query(10, ge=0, le=100, description="Maximum number of expiring consumables"),
+):
+    """Everything the dashboard needs for first paint, from concurrent queries (at most MAX_CONCURRENT_QUERIES
+    sessions across all requests); recurring schedules are expanded"""
+    zone = _get_zone(tz)
+    now = datetime.now(timezone.utc)
+    # One day for the expiry filters below and days_remaining of the returned rows
+    today = pin_today()
+    day_start, day_end = _local_day_window(day or now.astimezone(zone).date().isoformat(), zone)
+    upcoming_from = max(now, day_start)
+    # Horizon on a local day boundary; the first `upcoming` occurrences of each series
+    # are expanded from upcoming_from without going through the window memo
+    upcoming_until = (
+        _local_day_window(upcoming_from.astimezone(zone).date().isoformat(), zone)[0]
+        + timedelta(days=MAX_RANGE_DAYS)
+    )
+
+    today_rows, today_occurrences, upcoming_rows, upcoming_occurrences, expiring_rows, category_rows = await asyncio.gather(
+        _in_session(
+            select(Schedule)
+            .filter(Schedule.recurrence_rule.is_(None), *_overlaps_window(day_start, day_end))
+            .order_by(Schedule.start_time, Schedule.id)
+        ),
+        _occurrences(day_start, day_end, overlap=True),
+        _in_session(
+            select(Schedule)
+            .filter(Schedule.recurrence_rule.is_(None), Schedule.start_time >= upcoming_from)
+            .order_by(Schedule.start_time, Schedule.id)
+            .limit(upcoming)
+        ),
+        _occurrences(upcoming_from, upcoming_until, overlap=False, limit=upcoming),
+        _in_session(
+            expiring_query(within_days, today=today)
+            .order_by(Consumable.expires_on, Consumable.id)
+            .limit(expiring_limit)
+        ),
+        _in_session(
+            select(
+                Consumable.category,
+                func.count(),
+                func.count().filter(Consumable.expires_on <= today + timedelta(days=within_days)),
+            )
+            .group_by(Consumable.category)
+            .order_by(Consumable.category)
+        ),
+    )
+
+    today_schedules = sorted(
+        [ScheduleResponse.model_validate(row[0]) for row in today_rows] + today_occurrences,
+        key=lambda item: (item.start_time, item.id)
+    )
+    upcoming_schedules = sorted(
+        [ScheduleResponse.model_validate(row[0]) for row in upcoming_rows] + upcoming_occurrences,
+        key=lambda item: (item.start_time, item.id)
+    )[:upcoming]
+
+    return {
+        "date": day_start.date(),
+        "timezone": zone.key,
+        "today": _localize(today_schedules, zone),
+        "upcoming": _localize(upcoming_schedules, zone),
+        "expiring": [row[0] for row in expiring_rows],
+        "categories": [
+            {"category": category, "total": total, "expiring": expiring}
+            for category, total, expiring in category_rows
+        ],
+    }
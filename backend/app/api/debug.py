@@ -0,0 +1,47 @@
+from datetime import datetime
+from typing import List, Optional
+from fastapi import APIRouter, Query, status
+from pydantic import BaseModel
+
+from app.database.slow_queries import slow_query_tracker
+
+router = APIRouter()
+
+
+class SlowQuery(BaseModel):
+    fingerprint: str
+    statement: str
+    count: int
+    slow_count: int
+    mean_ms: float
+    p95_ms: float
+    max_ms: float
+    last_slow_at: Optional[datetime] = None
+    explain: Optional[str] = None
+    explained_at: Optional[datetime] = None
+
+
+class SlowQueryReport(BaseModel):
+    threshold_ms: float
+    explain_enabled: bool
+    queries: List[SlowQuery]
+
+
+@router.get("/slow-queries", response_model=SlowQueryReport)
+async def get_slow_queries(
+    include_fast: bool = Query(False, description="Also list fingerprints that never crossed the threshold"),
+    sort: str = Query("p95", pattern="^(p95|count|max|slow_count)$"),
+    limit: int = Query(50, ge=1, le=500)
+):
+    """Statements aggregated by fingerprint with count, p95 and captured EXPLAIN plans"""
+    return {
+        "threshold_ms": slow_query_tracker.threshold * 1000,
+        "explain_enabled": slow_query_tracker.explain,
+        "queries": slow_query_tracker.report(slow_only=not include_fast, sort=sort, limit=limit),
+    }
+
+
+@router.delete("/slow-queries", status_code=status.HTTP_204_NO_CONTENT)
+async def reset_slow_queries():
+    """Forget collected statistics, e.g. before measuring a change"""
+    slow_query_tracker.reset()
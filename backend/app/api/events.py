@@ -0,0 +1,196 @@
+import asyncio
+import json
+import logging
+import uuid
+from collections import deque
+from typing import List, Optional, Set
+from fastapi import APIRouter, Header, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.future import select
+
+from app.api.consumables import ConsumableResponse
+from app.api.schedules import ScheduleResponse
+from app.api.serialization import dump_jsonable
+from app.cache import changes
+from app.cache.notify import change_listener
+from app.database.database import AsyncSessionLocal
+from app.models.consumable import Consumable
+from app.models.schedule import Schedule
+
+router = APIRouter()
+logger = logging.getLogger(__name__)
+
+HEARTBEAT_INTERVAL = 15
+RETRY_MS = 3000
+# Events kept for clients that reconnect with Last-Event-ID
+REPLAY_BUFFER_SIZE = 256
+CLIENT_QUEUE_SIZE = 2 * REPLAY_BUFFER_SIZE
+# Larger changes are sent as "resync" rather than as row deltas
+MAX_DELTA_ROWS = 500
+
+def _format(event_id: str, event: str, data: dict) -> str:
+    return f"id: {event_id}\nevent: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _load_items(table: str, ids) -> list:
+    """Current representation of the changed rows, as the REST endpoints return them"""
+    async with AsyncSessionLocal() as db:
+        if table == Schedule.__tablename__:
+            result = await db.execute(select(Schedule).filter(Schedule.id.in_(ids)).order_by(Schedule.id))
+            return dump_jsonable(List[ScheduleResponse], result.scalars().all())
+        result = await db.execute(select(Consumable).filter(Consumable.id.in_(ids)).order_by(Consumable.id))
+        return dump_jsonable(List[ConsumableResponse], result.scalars().all())
+
+
+class ChangeHub:
+    """Fans row changes out to every open event stream.
+
+    Each change is turned into one SSE message (rows are loaded once, not once
+    per client) and copied to the per-client queues. Event ids are
+    "<boot id>-<sequence>", so a client reconnecting to the same worker gets
+    missed events replayed and any other client is told to resync.
+    """
+
+    def __init__(self):
+        self.boot_id = uuid.uuid4().hex[:8]
+        self._seq = 0
+        self._recent = deque(maxlen=REPLAY_BUFFER_SIZE)
+        self._clients: Set[asyncio.Queue] = set()
+        self._changes: asyncio.Queue = asyncio.Queue()
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        # Ends open streams so shutdown does not wait on them
+        for queue in self._clients:
+            self._drain(queue)
+            queue.put_nowait(None)
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def on_change(self, table: str, op: str, ids, remote: bool) -> None:
+        # With the NOTIFY listener up, this worker's writes arrive again as remote changes
+        if not remote and change_listener.connected:
+            return
+        if not self._clients:
+            # Nobody to send to; skip loading rows but leave a gap so replay resyncs
+            self._seq += 1
+            self._recent.clear()
+            return
+        self._changes.put_nowait((table, op, ids))
+
+    def subscribe(self, last_event_id: Optional[str] = None) -> asyncio.Queue:
+        queue = asyncio.Queue(maxsize=CLIENT_QUEUE_SIZE)
+        if last_event_id:
+            missed = self._replay(last_event_id)
+            if missed is None:
+                queue.put_nowait(self._message("resync", {"table": None}, record=False))
+            else:
+                for message in missed:
+                    queue.put_nowait(message)
+        self._clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue: asyncio.Queue) -> None:
+        self._clients.discard(queue)
+
+    @property
+    def client_count(self) -> int:
+        return len(self._clients)
+
+    def _replay(self, last_event_id: str) -> Optional[List[str]]:
+        boot_id, _, seq = last_event_id.partition("-")
+        if boot_id != self.boot_id or not seq.isdigit() or int(seq) > self._seq:
+            return None
+        seq = int(seq)
+        if seq == self._seq:
+            return []
+        if not self._recent or self._recent[0][0] > seq + 1:
+            return None
+        return [message for message_seq, message in self._recent if message_seq > seq]
+
+    def _message(self, event: str, data: dict, record: bool = True) -> str:
+        if not record:
+            return _format(f"{self.boot_id}-{self._seq}", event, data)
+        self._seq += 1
+        message = _format(f"{self.boot_id}-{self._seq}", event, data)
+        self._recent.append((self._seq, message))
+        return message
+
+    @staticmethod
+    def _drain(queue: asyncio.Queue) -> None:
+        while not queue.empty():
+            queue.get_nowait()
+
+    def _broadcast(self, message: str) -> None:
+        for queue in self._clients:
+            try:
+                queue.put_nowait(message)
+            except asyncio.QueueFull:
+                # Slow client: drop its backlog and have it refetch instead
+                self._drain(queue)
+                queue.put_nowait(self._message("resync", {"table": None}, record=False))
+
+    async def _build(self, table: str, op: str, ids) -> str:
+        if op == "reset" or ids is None or len(ids) > MAX_DELTA_ROWS:
+            return self._message("resync", {"table": table})
+        if op == "delete":
+            return self._message("change", {"table": table, "op": op, "ids": sorted(ids)})
+        try:
+            items = await _load_items(table, sorted(ids))
+        except Exception as e:
+            logger.warning(f"Could not load changed {table} rows, asking clients to resync: {e}")
+            return self._message("resync", {"table": table})
+        return self._message("change", {"table": table, "op": op, "ids": sorted(ids), "items": items})
+
+    async def _run(self) -> None:
+        # One consumer keeps events in commit order
+        while True:
+            table, op, ids = await self._changes.get()
+            self._broadcast(await self._build(table, op, ids))
+
+
+change_hub = ChangeHub()
+changes.subscribe(change_hub.on_change)
+
+
+@router.get("/stream")
+async def stream_events(request: Request, last_event_id: Optional[str] = Header(None)):
+    """Server-Sent Events feed of schedule and consumable changes.
+
+    "change" events carry {table, op, ids, items} (no items for deletes),
+    "resync" events ask the client to refetch a table (or everything when
+    table is null). Comment lines are sent as heartbeats.
+    """
+    queue = change_hub.subscribe(last_event_id)
+
+    async def event_stream():
+        try:
+            yield f"retry: {RETRY_MS}\n\n"
+            while True:
+                try:
+                    message = await asyncio.wait_for(queue.get(), HEARTBEAT_INTERVAL)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        break
+                    message = ": keepalive\n\n"
+                if message is None:
+                    break
+                yield message
+        finally:
+            change_hub.unsubscribe(queue)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        # X-Accel-Buffering lets nginx pass events through without buffering
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
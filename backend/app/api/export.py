@@ -0,0 +1,117 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import date, datetime
+from enum import Enum
+from fastapi import APIRouter, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import func
+from sqlalchemy.future import select
+
+from app.database.database import AsyncSessionLocal
+from app.models.schedule import Schedule
+from app.models.consumable import Consumable, current_day
+from app.api.search import SEARCH_COLUMNS
+
+router = APIRouter()
+
+# Rows fetched per round trip from the server-side cursor
+EXPORT_BATCH_SIZE = 1000
+
+
+class ExportTable(str, Enum):
+    schedules = "schedules"
+    consumables = "consumables"
+
+
+def _export_columns(model) -> list:
+    return [column for column in model.__table__.columns if column.name not in SEARCH_COLUMNS]
+
+
+def _export_query(table: ExportTable):
+    # Plain column rows rather than ORM objects, so nothing accumulates in the identity map
+    if table is ExportTable.schedules:
+        return select(*_export_columns(Schedule)).order_by(Schedule.id)
+    # Counted from the app's date, like Consumable.days_remaining
+    days_remaining = func.greatest(Consumable.expires_on - current_day(), 0).label("days_remaining")
+    return select(*_export_columns(Consumable), days_remaining).order_by(Consumable.id)
+
+
+def _json_default(value):
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _ndjson_chunk(columns, rows) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows) -> str:
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        [value.isoformat() if isinstance(value, (date, datetime)) else value for value in row]
+        for row in rows
+    )
+    return buffer.getvalue()
+
+
+async def _read_export(table: ExportTable, export_format: str, chunks: asyncio.Queue) -> None:
+    """Put the table on chunks in pieces of EXPORT_BATCH_SIZE rows read from a server-side cursor.
+
+    Server-side cursors need a transaction (the engine runs in AUTOCOMMIT), and
+    REPEATABLE READ gives the whole export one consistent snapshot. The bounded
+    queue makes the cursor advance only as fast as the client downloads.
+    """
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.connection(execution_options={"isolation_level": "REPEATABLE READ"})
+            result = await db.stream(_export_query(table).execution_options(yield_per=EXPORT_BATCH_SIZE))
+            columns = list(result.keys())
+            if export_format == "csv":
+                # BOM so spreadsheet apps detect UTF-8 (titles and notes are often Chinese)
+                await chunks.put("\ufeff" + _csv_chunk([columns]))
+            async for rows in result.partitions():
+                await chunks.put(_ndjson_chunk(columns, rows) if export_format == "ndjson" else _csv_chunk(rows))
+            await db.rollback()
+        await chunks.put(None)
+    except Exception as e:
+        await chunks.put(e)
+
+
+async def _stream_export(table: ExportTable, export_format: str):
+    # The database work runs in its own task: a client disconnect cancels this
+    # generator repeatedly (anyio cancel scope), which would also cancel the
+    # connection cleanup and leave a closed connection in the pool. A plain
+    # task.cancel() is delivered once, so the session shuts down cleanly.
+    chunks = asyncio.Queue(maxsize=2)
+    reader = asyncio.create_task(_read_export(table, export_format, chunks))
+    try:
+        while True:
+            chunk = await chunks.get()
+            if chunk is None:
+                break
+            if isinstance(chunk, Exception):
+                raise chunk
+            yield chunk
+    finally:
+        reader.cancel()
+
+
+@router.get("/{table}")
+async def export_table(
+    table: ExportTable,
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="ndjson or csv"),
+):
+    """Stream every row of a table as NDJSON or CSV; memory use does not grow with table size"""
+    media_type = "application/x-ndjson" if format == "ndjson" else "text/csv; charset=utf-8"
+    filename = f"{table.value}-{date.today():%Y%m%d}.{format}"
+    return StreamingResponse(
+        _stream_export(table, format),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{filename}"'},
+    )
@@ -0,0 +1,183 @@
+"""iCalendar (RFC 5545) rendering for the schedules subscription feed"""
+import hashlib
+from collections import OrderedDict
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Iterable, Optional
+from email.utils import format_datetime, parsedate_to_datetime
+from zoneinfo import ZoneInfo
+
+PRODID = "-//Smart Home Assistant//Schedules//ZH"
+CALENDAR_NAME = "Smart Home 行程"
+# Windows of the feed kept rendered at once
+MAX_CACHED_FEEDS = 32
+
+
+def escape_text(value: str) -> str:
+    return (
+        value.replace("\\", "\\\\")
+        .replace(";", "\\;")
+        .replace(",", "\\,")
+        .replace("\r\n", "\\n")
+        .replace("\n", "\\n")
+    )
+
+
+def fold_line(line: str) -> str:
+    """Fold a content line to 75 octets per physical line without splitting UTF-8 characters"""
+    encoded = line.encode("utf-8")
+    if len(encoded) <= 75:
+        return line
+    parts = []
+    current = ""
+    size = 0
+    limit = 75
+    for char in line:
+        char_size = len(char.encode("utf-8"))
+        if size + char_size > limit:
+            parts.append(current)
+            current = ""
+            size = 0
+            # Continuation lines start with a space, which counts toward the limit
+            limit = 74
+        current += char
+        size += char_size
+    parts.append(current)
+    return "\r\n ".join(parts)
+
+
+def format_utc(value: datetime) -> str:
+    return value.astimezone(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+
+
+def format_local(value: datetime, tz_name: str) -> str:
+    """;TZID=...:local-time form, so clients expand recurrences on the zone's wall clock"""
+    return f";TZID={tz_name}:{value.astimezone(ZoneInfo(tz_name)).strftime('%Y%m%dT%H%M%S')}"
+
+
+def _event_lines(uid, schedule, start, end, title, description, tz_name=None, extra=()) -> list:
+    def when(value):
+        return format_local(value, tz_name) if tz_name else f":{format_utc(value)}"
+
+    lines = [
+        "BEGIN:VEVENT",
+        f"UID:{uid}",
+        f"DTSTAMP:{format_utc(schedule.updated_at or schedule.created_at)}",
+        *extra,
+        f"DTSTART{when(start)}",
+    ]
+    if end is not None:
+        lines.append(f"DTEND{when(end)}")
+    lines.append(f"SUMMARY:{escape_text(title)}")
+    if description:
+        lines.append(f"DESCRIPTION:{escape_text(description)}")
+    if schedule.created_at is not None:
+        lines.append(f"CREATED:{format_utc(schedule.created_at)}")
+    if schedule.updated_at is not None:
+        lines.append(f"LAST-MODIFIED:{format_utc(schedule.updated_at)}")
+    lines.append("END:VEVENT")
+    return lines
+
+
+def render_calendar(schedules: Iterable, default_timezone: str = "UTC") -> str:
+    """Render schedules as a VCALENDAR.
+
+    Recurring schedules become one VEVENT with RRULE and EXDATE for cancelled
+    occurrences, plus a RECURRENCE-ID VEVENT per modified occurrence; their
+    exceptions must already be loaded.
+    """
+    lines = [
+        "BEGIN:VCALENDAR",
+        "VERSION:2.0",
+        f"PRODID:{PRODID}",
+        "CALSCALE:GREGORIAN",
+        "METHOD:PUBLISH",
+        f"X-WR-CALNAME:{escape_text(CALENDAR_NAME)}",
+    ]
+    for schedule in schedules:
+        uid = f"schedule-{schedule.id}@smarthome-assistant"
+        if not schedule.recurrence_rule:
+            lines += _event_lines(uid, schedule, schedule.start_time, schedule.end_time, schedule.title, schedule.description)
+            continue
+
+        tz_name = schedule.timezone or default_timezone
+        cancelled = [exception for exception in schedule.exceptions if exception.cancelled]
+        modified = [exception for exception in schedule.exceptions if not exception.cancelled]
+        extra = [f"RRULE:{schedule.recurrence_rule}"]
+        extra += [f"EXDATE{format_local(exception.original_start, tz_name)}" for exception in cancelled]
+        lines += _event_lines(
+            uid, schedule, schedule.start_time, schedule.end_time, schedule.title, schedule.description, tz_name, extra
+        )
+
+        duration = schedule.end_time - schedule.start_time if schedule.end_time is not None else None
+        for exception in modified:
+            start = exception.start_time or exception.original_start
+            end = exception.end_time or (start + duration if duration is not None else None)
+            lines += _event_lines(
+                uid, schedule, start, end,
+                exception.title or schedule.title,
+                exception.description if exception.description is not None else schedule.description,
+                tz_name,
+                [f"RECURRENCE-ID{format_local(exception.original_start, tz_name)}"],
+            )
+    lines.append("END:VCALENDAR")
+    return "".join(fold_line(line) + "\r\n" for line in lines)
+
+
+@dataclass
+class RenderedFeed:
+    version: str
+    body: bytes
+    etag: str
+    last_modified: datetime
+
+
+class FeedCache:
+    """Rendered feeds per window, kept until the schedules table version moves"""
+
+    def __init__(self, maxsize: int = MAX_CACHED_FEEDS):
+        self.maxsize = maxsize
+        self._feeds = OrderedDict()
+
+    def get(self, key, version: str) -> Optional[RenderedFeed]:
+        feed = self._feeds.get(key)
+        if feed is None or feed.version != version:
+            return None
+        self._feeds.move_to_end(key)
+        return feed
+
+    def put(self, key, version: str, body: str) -> RenderedFeed:
+        encoded = body.encode("utf-8")
+        feed = RenderedFeed(
+            version=version,
+            body=encoded,
+            etag=f'"{hashlib.sha1(encoded).hexdigest()}"',
+            # HTTP dates have one-second resolution
+            last_modified=datetime.now(timezone.utc).replace(microsecond=0),
+        )
+        previous = self._feeds.get(key)
+        if previous is not None and previous.etag == feed.etag:
+            # The version moved but this window's content did not
+            feed.last_modified = previous.last_modified
+        self._feeds[key] = feed
+        self._feeds.move_to_end(key)
+        while len(self._feeds) > self.maxsize:
+            self._feeds.popitem(last=False)
+        return feed
+
+
+def not_modified_since(header: Optional[str], last_modified: datetime) -> bool:
+    """If-Modified-Since check; only used when the client sent no If-None-Match"""
+    if not header:
+        return False
+    try:
+        since = parsedate_to_datetime(header)
+    except (TypeError, ValueError):
+        return False
+    if since.tzinfo is None:
+        since = since.replace(tzinfo=timezone.utc)
+    return last_modified <= since
+
+
+def http_date(value: datetime) -> str:
+    return format_datetime(value, usegmt=True)
@@ -0,0 +1,207 @@
+import csv
+import io
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+from fastapi import APIRouter, HTTPException, Query, Request
+from pydantic import BaseModel, ValidationError
+from sqlalchemy import String
+
+from app.database.database import async_engine
+from app.models.schedule import Schedule
+from app.models.consumable import Consumable
+from app.api.schedules import ScheduleCreate, _get_zone
+from app.api.consumables import ConsumableCreate
+from app.api.export import ExportTable
+from app.cache import changes
+
+router = APIRouter()
+
+# Rows validated and sent per COPY call
+IMPORT_BATCH_SIZE = 1000
+IMPORT_MAX_BYTES = int(os.getenv("IMPORT_MAX_BYTES", str(50 * 1024 * 1024)))
+# Errors listed in the summary; the count covers all of them
+MAX_REPORTED_ERRORS = 100
+
+_IMPORT_TARGETS = {
+    ExportTable.schedules: (Schedule, ScheduleCreate),
+    ExportTable.consumables: (Consumable, ConsumableCreate),
+}
+
+
+class ImportRowError(BaseModel):
+    row: int
+    error: str
+
+
+class ImportSummary(BaseModel):
+    table: str
+    received: int
+    inserted: int
+    failed: int
+    committed: bool
+    seconds: float
+    rows_per_second: float
+    errors: List[ImportRowError]
+
+
+def parse_rows(text: str, import_format: str) -> Iterator[Tuple[int, Optional[dict], Optional[str]]]:
+    """Yield (row number, fields, parse error) from CSV (with header) or NDJSON text"""
+    if import_format == "csv":
+        reader = csv.DictReader(io.StringIO(text.lstrip("\ufeff")))
+        for number, row in enumerate(reader, start=1):
+            if None in row:
+                yield number, None, "Too many values"
+                continue
+            # Empty CSV cells mean "not set"
+            yield number, {key: value for key, value in row.items() if value not in ("", None)}, None
+        return
+
+    number = 0
+    for line in text.splitlines():
+        if not line.strip():
+            continue
+        number += 1
+        try:
+            row = json.loads(line)
+        except ValueError as e:
+            yield number, None, f"Invalid JSON: {e}"
+            continue
+        if not isinstance(row, dict):
+            yield number, None, "Each line must be a JSON object"
+            continue
+        yield number, row, None
+
+
+def _format_validation_error(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in item['loc'])}: {item['msg']}" for item in error.errors()
+    )
+
+
+def _record(model, item: BaseModel, columns: List[str], zone: ZoneInfo) -> tuple:
+    """Validated item as a COPY record, checking what Pydantic does not (string lengths, naive datetimes)"""
+    record = []
+    for name in columns:
+        value = getattr(item, name)
+        column_type = model.__table__.columns[name].type
+        if isinstance(column_type, String) and column_type.length and value is not None and len(value) > column_type.length:
+            raise ValueError(f"{name}: at most {column_type.length} characters")
+        if isinstance(value, datetime) and value.tzinfo is None:
+            value = value.replace(tzinfo=zone)
+        record.append(value)
+    return tuple(record)
+
+
+async def import_rows(
+    table: ExportTable,
+    rows: Iterable[Tuple[int, Optional[dict], Optional[str]]],
+    zone: ZoneInfo,
+    skip_invalid: bool = False,
+) -> ImportSummary:
+    """Validate rows in batches and load them with COPY inside one transaction.
+
+    With skip_invalid=False any invalid row rolls the whole import back (every
+    row is still validated so all errors are reported at once); otherwise
+    valid rows are loaded and invalid ones only reported.
+    """
+    model, schema = _IMPORT_TARGETS[table]
+    columns = list(schema.model_fields)
+    started = time.perf_counter()
+    received = inserted = failed = 0
+    errors: List[Dict] = []
+
+    def report(number: int, message: str) -> None:
+        nonlocal failed
+        failed += 1
+        if len(errors) < MAX_REPORTED_ERRORS:
+            errors.append({"row": number, "error": message})
+
+    async with async_engine.connect() as connection:
+        raw = await connection.get_raw_connection()
+        driver = raw.driver_connection
+        # The engine is in AUTOCOMMIT mode, so the transaction is driven on the asyncpg connection
+        transaction = driver.transaction()
+        await transaction.start()
+        try:
+            batch = []
+            for number, fields, parse_error in rows:
+                received += 1
+                if parse_error:
+                    report(number, parse_error)
+                    continue
+                try:
+                    batch.append(_record(model, schema.model_validate(fields), columns, zone))
+                except ValidationError as e:
+                    report(number, _format_validation_error(e))
+                except ValueError as e:
+                    report(number, str(e))
+
+                if len(batch) >= IMPORT_BATCH_SIZE:
+                    if not failed or skip_invalid:
+                        await driver.copy_records_to_table(table.value, records=batch, columns=columns)
+                        inserted += len(batch)
+                    batch = []
+            if batch and (not failed or skip_invalid):
+                await driver.copy_records_to_table(table.value, records=batch, columns=columns)
+                inserted += len(batch)
+
+            committed = bool(inserted) and (not failed or skip_invalid)
+            if committed:
+                await transaction.commit()
+            else:
+                await transaction.rollback()
+                inserted = 0
+        except Exception:
+            await transaction.rollback()
+            raise
+
+    if committed:
+        changes.publish(table.value, "insert")
+
+    seconds = time.perf_counter() - started
+    return ImportSummary(
+        table=table.value,
+        received=received,
+        inserted=inserted,
+        failed=failed,
+        committed=committed,
+        seconds=round(seconds, 3),
+        rows_per_second=round(inserted / seconds, 1) if seconds and inserted else 0.0,
+        errors=errors,
+    )
+
+
+@router.post("/{table}", response_model=ImportSummary)
+async def import_table(
+    table: ExportTable,
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(ndjson|csv)$", description="Defaults from Content-Type"),
+    tz: Optional[str] = Query(None, description="IANA timezone for datetimes without an offset"),
+    skip_invalid: bool = Query(False, description="Load valid rows even if some rows are invalid"),
+):
+    """Bulk-load a CSV (with header) or NDJSON request body using COPY.
+
+    Columns match the create payloads (e.g. title, description, start_time, end_time).
+    """
+    zone = _get_zone(tz)
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "ndjson"
+
+    body = bytearray()
+    async for chunk in request.stream():
+        body.extend(chunk)
+        if len(body) > IMPORT_MAX_BYTES:
+            raise HTTPException(status_code=413, detail=f"Upload exceeds {IMPORT_MAX_BYTES} bytes")
+    try:
+        text = body.decode("utf-8")
+    except UnicodeDecodeError:
+        raise HTTPException(status_code=400, detail="Upload must be UTF-8 encoded")
+
+    summary = await import_rows(table, parse_rows(text, format), zone, skip_invalid)
+    if not summary.committed and summary.failed:
+        raise HTTPException(status_code=422, detail=summary.model_dump())
+    return summary
@@ -0,0 +1,35 @@
+import base64
+import json
+from typing import Any, Generic, List, Optional, TypeVar
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+T = TypeVar("T")
+
+# Page size limits shared by the keyset-paginated listings
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+
+class CursorPage(BaseModel, Generic[T]):
+    """One page of a keyset-paginated listing"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def encode_cursor(*values: Any) -> str:
+    """Pack the sort key of the last row into an opaque URL-safe token"""
+    raw = json.dumps(list(values), default=str, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """Unpack a token produced by encode_cursor, rejecting anything malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return values
@@ -0,0 +1,266 @@
+"""Recurrence rules (an RFC 5545 RRULE subset) and lazy occurrence expansion.
+
+Supported: FREQ=DAILY|WEEKLY|MONTHLY|YEARLY with INTERVAL, COUNT or UNTIL,
+BYDAY (plain weekdays, DAILY/WEEKLY only) and BYMONTHDAY (MONTHLY only,
+negative values count from the end of the month). Occurrences keep the wall
+clock time of DTSTART in the series' timezone, so a 07:00 reminder stays at
+07:00 across DST changes.
+
+Occurrences are never stored. expand() computes only those overlapping the
+requested window, skipping straight to it when the rule has no COUNT, and
+memoizes the result so repeated views of the same month cost nothing. Lookups
+that start at arbitrary instants (next_occurrences, is_occurrence) bypass
+the memo so they cannot evict those windows.
+"""
+import calendar
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+FREQUENCIES = ("DAILY", "WEEKLY", "MONTHLY", "YEARLY")
+WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+# Expanded windows kept memoized
+EXPANSION_CACHE_SIZE = 2048
+# Safety net for a single expansion; a 400-day window of a DAILY rule stays well below it
+MAX_OCCURRENCES = 5000
+
+
+@dataclass(frozen=True)
+class RecurrenceRule:
+    freq: str
+    interval: int = 1
+    count: Optional[int] = None
+    # Aware UTC datetime, or a date meaning "through that local day"
+    until: Optional[object] = None
+    by_day: Tuple[int, ...] = ()
+    by_month_day: Tuple[int, ...] = ()
+
+    def to_rrule(self) -> str:
+        """Canonical RRULE text; this is what gets stored and published in the ICS feed"""
+        parts = [f"FREQ={self.freq}"]
+        if self.interval != 1:
+            parts.append(f"INTERVAL={self.interval}")
+        if self.count is not None:
+            parts.append(f"COUNT={self.count}")
+        if isinstance(self.until, datetime):
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%dT%H%M%SZ')}")
+        elif self.until is not None:
+            parts.append(f"UNTIL={self.until.strftime('%Y%m%d')}")
+        if self.by_day:
+            parts.append("BYDAY=" + ",".join(WEEKDAYS[day] for day in self.by_day))
+        if self.by_month_day:
+            parts.append("BYMONTHDAY=" + ",".join(str(day) for day in self.by_month_day))
+        return ";".join(parts)
+
+
+def _parse_until(value: str):
+    try:
+        if "T" not in value:
+            return datetime.strptime(value, "%Y%m%d").date()
+        if value.endswith("Z"):
+            return datetime.strptime(value, "%Y%m%dT%H%M%SZ").replace(tzinfo=timezone.utc)
+    except ValueError:
+        pass
+    raise ValueError("UNTIL must be YYYYMMDD or YYYYMMDDTHHMMSSZ")
+
+
+@lru_cache(maxsize=256)
+def parse_rule(text: str) -> RecurrenceRule:
+    """Parse RRULE text (with or without the "RRULE:" prefix); raises ValueError outside the subset"""
+    text = text.strip()
+    if text.upper().startswith("RRULE:"):
+        text = text[6:]
+    fields = {}
+    for part in filter(None, text.split(";")):
+        key, separator, value = part.partition("=")
+        if not separator or not value:
+            raise ValueError(f"Malformed RRULE part: {part}")
+        fields[key.strip().upper()] = value.strip().upper()
+
+    unsupported = set(fields) - {"FREQ", "INTERVAL", "COUNT", "UNTIL", "BYDAY", "BYMONTHDAY", "WKST"}
+    if unsupported:
+        raise ValueError(f"Unsupported RRULE parts: {', '.join(sorted(unsupported))}")
+    freq = fields.get("FREQ")
+    if freq not in FREQUENCIES:
+        raise ValueError(f"FREQ must be one of {', '.join(FREQUENCIES)}")
+    if fields.get("WKST", "MO") != "MO":
+        raise ValueError("Only WKST=MO is supported")
+    if "COUNT" in fields and "UNTIL" in fields:
+        raise ValueError("COUNT and UNTIL cannot be combined")
+
+    try:
+        interval = int(fields.get("INTERVAL", "1"))
+        count = int(fields["COUNT"]) if "COUNT" in fields else None
+        by_month_day = tuple(sorted({int(day) for day in fields["BYMONTHDAY"].split(",")})) if "BYMONTHDAY" in fields else ()
+    except ValueError:
+        raise ValueError("INTERVAL, COUNT and BYMONTHDAY must be integers")
+    if interval < 1 or (count is not None and count < 1):
+        raise ValueError("INTERVAL and COUNT must be positive")
+
+    by_day = ()
+    if "BYDAY" in fields:
+        if freq not in ("DAILY", "WEEKLY"):
+            raise ValueError("BYDAY is only supported with FREQ=DAILY or WEEKLY")
+        days = fields["BYDAY"].split(",")
+        if any(day not in WEEKDAYS for day in days):
+            raise ValueError("BYDAY takes plain weekdays (MO..SU); ordinals are not supported")
+        by_day = tuple(sorted({WEEKDAYS.index(day) for day in days}))
+    if by_month_day:
+        if freq != "MONTHLY":
+            raise ValueError("BYMONTHDAY is only supported with FREQ=MONTHLY")
+        if any(day == 0 or not -31 <= day <= 31 for day in by_month_day):
+            raise ValueError("BYMONTHDAY values must be within 1..31 or -31..-1")
+
+    until = _parse_until(fields["UNTIL"]) if "UNTIL" in fields else None
+    return RecurrenceRule(freq, interval, count, until, by_day, by_month_day)
+
+
+def _add_months(year: int, month: int, months: int) -> Tuple[int, int]:
+    index = year * 12 + month - 1 + months
+    return index // 12, index % 12 + 1
+
+
+def _period_index(rule: RecurrenceRule, first: date, target: date) -> int:
+    """Index of the period containing target, counted in rule.interval steps from first"""
+    if rule.freq == "DAILY":
+        units = (target - first).days
+    elif rule.freq == "WEEKLY":
+        units = ((target - timedelta(days=target.weekday())) - (first - timedelta(days=first.weekday()))).days // 7
+    elif rule.freq == "MONTHLY":
+        units = (target.year - first.year) * 12 + target.month - first.month
+    else:
+        units = target.year - first.year
+    return max(0, units // rule.interval)
+
+
+def _period_days(rule: RecurrenceRule, first: date, index: int) -> Tuple[date, List[date]]:
+    """First day of period index and the candidate days inside it"""
+    step = index * rule.interval
+    if rule.freq == "DAILY":
+        day = first + timedelta(days=step)
+        matches = not rule.by_day or day.weekday() in rule.by_day
+        return day, [day] if matches else []
+    if rule.freq == "WEEKLY":
+        monday = first - timedelta(days=first.weekday()) + timedelta(weeks=step)
+        return monday, [monday + timedelta(days=weekday) for weekday in rule.by_day or (first.weekday(),)]
+    if rule.freq == "MONTHLY":
+        year, month = _add_months(first.year, first.month, step)
+        length = calendar.monthrange(year, month)[1]
+        days = set()
+        for day in rule.by_month_day or (first.day,):
+            # Months without that day are skipped, as RFC 5545 prescribes
+            resolved = day if day > 0 else length + day + 1
+            if 1 <= resolved <= length:
+                days.add(date(year, month, resolved))
+        return date(year, month, 1), sorted(days)
+    year = first.year + step
+    try:
+        return date(year, 1, 1), [first.replace(year=year)]
+    except ValueError:
+        # February 29th outside leap years
+        return date(year, 1, 1), []
+
+
+def _occurrences(rule: RecurrenceRule, dtstart: datetime, zone: ZoneInfo, from_local: date, to_local: date) -> Iterator[datetime]:
+    """Occurrence starts (aware, in zone) in order, from the period containing from_local
+    until the first period starting after to_local"""
+    local_start = dtstart.astimezone(zone)
+    first = local_start.date()
+    wall_time = local_start.timetz().replace(tzinfo=None)
+    # COUNT is counted from DTSTART, so only COUNT-less rules may skip ahead
+    index = _period_index(rule, first, from_local) if rule.count is None else 0
+    until_instant = rule.until if isinstance(rule.until, datetime) else None
+    until_day = rule.until if until_instant is None else None
+    produced = 0
+    while True:
+        period_start, days = _period_days(rule, first, index)
+        if period_start > to_local:
+            return
+        for day in days:
+            occurrence = datetime.combine(day, wall_time, tzinfo=zone)
+            if occurrence < local_start:
+                continue
+            if (until_instant and occurrence > until_instant) or (until_day and day > until_day):
+                return
+            yield occurrence
+            produced += 1
+            if rule.count is not None and produced >= rule.count:
+                return
+        index += 1
+
+
+@lru_cache(maxsize=EXPANSION_CACHE_SIZE)
+def expand(
+    rule_text: str,
+    dtstart: datetime,
+    duration: timedelta,
+    tz_name: str,
+    window_start: datetime,
+    window_end: datetime,
+) -> Tuple[datetime, ...]:
+    """UTC starts of the occurrences overlapping [window_start, window_end).
+
+    An occurrence [start, start + duration) overlaps when it starts before
+    window_end and ends after window_start; with a zero duration it must start
+    inside the window.
+    """
+    return _expand_window(rule_text, dtstart, duration, tz_name, window_start, window_end)
+
+
+def _expand_window(
+    rule_text: str,
+    dtstart: datetime,
+    duration: timedelta,
+    tz_name: str,
+    window_start: datetime,
+    window_end: datetime,
+) -> Tuple[datetime, ...]:
+    rule = parse_rule(rule_text)
+    zone = ZoneInfo(tz_name)
+    lookback = (window_start - duration).astimezone(zone).date()
+    starts = []
+    for occurrence in _occurrences(rule, dtstart, zone, lookback, window_end.astimezone(zone).date()):
+        if occurrence >= window_end:
+            break
+        overlaps = occurrence + duration > window_start if duration else occurrence >= window_start
+        if overlaps:
+            starts.append(occurrence.astimezone(timezone.utc))
+            if len(starts) >= MAX_OCCURRENCES:
+                break
+    return tuple(starts)
+
+
+def is_occurrence(rule_text: str, dtstart: datetime, tz_name: str, instant: datetime) -> bool:
+    """Whether instant is the start of one of the series' occurrences"""
+    # Not memoized: one-second windows at arbitrary instants would only evict real windows
+    return bool(_expand_window(rule_text, dtstart, timedelta(0), tz_name, instant, instant + timedelta(seconds=1)))
+
+
+def next_occurrences(
+    rule_text: str,
+    dtstart: datetime,
+    tz_name: str,
+    after: datetime,
+    before: datetime,
+    limit: int,
+) -> Tuple[datetime, ...]:
+    """UTC starts of the first limit occurrences starting in [after, before).
+
+    Stops expanding after limit occurrences instead of covering the whole
+    window, and is not memoized since after is usually "now".
+    """
+    if limit <= 0:
+        return ()
+    rule = parse_rule(rule_text)
+    zone = ZoneInfo(tz_name)
+    starts = []
+    for occurrence in _occurrences(rule, dtstart, zone, after.astimezone(zone).date(), before.astimezone(zone).date()):
+        if occurrence >= before:
+            break
+        if occurrence >= after:
+            starts.append(occurrence.astimezone(timezone.utc))
+            if len(starts) >= limit:
+                break
+    return tuple(starts)
@@ -1,20 +1,61 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.future import select
-from typing import List, Optional
-from datetime import datetime, date
-from pydantic import BaseModel, Field
-from app.database.database import get_db
+from sqlalchemy import and_, or_, tuple_, insert, update, delete, func
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload
+from typing import List, Optional, Tuple
+from datetime import datetime, date, time, timedelta
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+import os
+from app.database.database import get_db, get_db_transaction
 from app.models.schedule import Schedule
+from app.models.schedule_exception import ScheduleException
+from app.api.pagination import CursorPage, DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, encode_cursor, decode_cursor
+from app.cache import changes
+from app.cache.response_cache import cached_response
+from app.cache.etag import etag_matches, table_version, row_etag
+from app.api.concurrency import if_match_filter, write_failure
+from app.api.ical import FeedCache, render_calendar, not_modified_since, http_date
+from app.api.bulk import BulkResult, BulkDeleteRequest, check_batch_size, summarize, update_rows_by_id
+from app.api.recurrence import parse_rule, expand, is_occurrence, next_occurrences
+from app.api.search import DEFAULT_SEARCH_LIMIT, MAX_SEARCH_LIMIT, search_query
 
 router = APIRouter()
 
+# Naive dates/datetimes from clients are interpreted in this zone unless ?tz= is given
+DEFAULT_TIMEZONE = os.getenv("TZ", "Asia/Taipei")
+# Upper bound for a single range query, a year view plus the leading/trailing weeks
+MAX_RANGE_DAYS = 400
+
+_calendar_feeds = FeedCache()
+
 # Pydantic models for request/response
 class ScheduleBase(BaseModel):
     title: str
     description: Optional[str] = None  # Allow None for optional fields
     start_time: datetime
     end_time: Optional[datetime] = None
+    # RRULE subset, e.g. "FREQ=WEEKLY;BYDAY=MO,TH"; start_time/end_time are the first occurrence
+    recurrence_rule: Optional[str] = None
+    # IANA zone whose wall-clock time occurrences keep; defaults to the server zone
+    timezone: Optional[str] = None
+
+    @field_validator("recurrence_rule")
+    @classmethod
+    def _canonical_rule(cls, value):
+        return parse_rule(value).to_rrule() if value else None
+
+    @field_validator("timezone")
+    @classmethod
+    def _known_timezone(cls, value):
+        if value:
+            try:
+                ZoneInfo(value)
+            except (ZoneInfoNotFoundError, ValueError):
+                raise ValueError(f"Unknown timezone: {value}")
+        return value or None
 
 class ScheduleCreate(ScheduleBase):
     pass
@@ -23,19 +64,170 @@ class ScheduleUpdate(ScheduleBase):
     title: str = None
     start_time: datetime = None
 
+class ScheduleBulkUpdate(ScheduleUpdate):
+    id: int
+
 class ScheduleResponse(ScheduleBase):
     id: int
     created_at: datetime
     updated_at: datetime
-    
-    class Config:
-        orm_mode = True
+    version: int
+    # Set on occurrences expanded from a recurring schedule: the start the rule
+    # generated, which identifies the occurrence in /{id}/exceptions
+    occurrence_start: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+class ScheduleSearchResult(ScheduleResponse):
+    score: float = 0.0
+
+class ScheduleExceptionUpsert(BaseModel):
+    """Cancel one occurrence of a series, or override some of its fields"""
+    cancelled: bool = False
+    title: Optional[str] = None
+    description: Optional[str] = None
+    start_time: Optional[datetime] = None
+    end_time: Optional[datetime] = None
+
+class ScheduleExceptionResponse(ScheduleExceptionUpsert):
+    id: int
+    schedule_id: int
+    original_start: datetime
+    created_at: datetime
+    updated_at: datetime
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+def _get_zone(tz: Optional[str]) -> ZoneInfo:
+    """Resolve an IANA timezone name, falling back to the server default"""
+    try:
+        return ZoneInfo(tz or DEFAULT_TIMEZONE)
+    except (ZoneInfoNotFoundError, ValueError):
+        raise HTTPException(status_code=400, detail=f"Unknown timezone: {tz}")
+
+
+def _parse_local_datetime(value: str, zone: ZoneInfo) -> datetime:
+    """Parse YYYY-MM-DD or an ISO 8601 datetime; naive values are taken as local time in zone"""
+    try:
+        parsed = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    except ValueError:
+        raise HTTPException(
+            status_code=400,
+            detail="Invalid date format. Use YYYY-MM-DD or ISO 8601 datetime"
+        )
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=zone)
+    return parsed
+
+
+def _local_day_window(date_str: str, zone: ZoneInfo) -> Tuple[datetime, datetime]:
+    """Return the aware [start, end) bounds of a calendar day in zone"""
+    try:
+        filter_date = datetime.strptime(date_str, "%Y-%m-%d").date()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    start = datetime.combine(filter_date, time.min, tzinfo=zone)
+    end = datetime.combine(filter_date + timedelta(days=1), time.min, tzinfo=zone)
+    return start, end
+
+
+def _overlaps_window(start: datetime, end: datetime):
+    """Filter for schedules overlapping [start, end).
+
+    Written as two sargable branches so Postgres can combine ix_schedules_start_time_id
+    and ix_schedules_end_time with a BitmapOr instead of scanning the table.
+    """
+    return (
+        Schedule.start_time < end,
+        or_(Schedule.start_time >= start, Schedule.end_time > start),
+    )
+
+
+def _expand_series(series: Schedule, window_start: datetime, window_end: datetime, overlap: bool,
+                   limit: Optional[int] = None) -> List[ScheduleResponse]:
+    """Occurrences of a recurring schedule inside [window_start, window_end), exceptions applied.
+
+    With overlap, occurrences that started earlier but are still running count;
+    otherwise an occurrence must start inside the window (by-date semantics).
+    With limit, only the first limit occurrences starting in the window are
+    expanded (no overlap); the caller sorts and trims the merged result.
+    """
+    tz_name = series.timezone or DEFAULT_TIMEZONE
+    duration = series.end_time - series.start_time if series.end_time is not None else None
+    span = duration if overlap and duration else timedelta(0)
+    base = ScheduleResponse.model_validate(series)
+    exceptions = {exception.original_start: exception for exception in series.exceptions}
+
+    if limit is None:
+        starts = expand(series.recurrence_rule, series.start_time, span, tz_name, window_start, window_end)
+    else:
+        # Every exception hides at most one of the expanded occurrences
+        starts = next_occurrences(series.recurrence_rule, series.start_time, tz_name, window_start, window_end,
+                                  limit + len(exceptions))
+
+    occurrences = []
+    for start in starts:
+        if start in exceptions:
+            continue
+        occurrences.append(base.model_copy(update={
+            "start_time": start,
+            "end_time": start + duration if duration is not None else None,
+            "occurrence_start": start,
+        }))
+
+    # Modified occurrences may have been moved into or out of the window
+    for original_start, exception in exceptions.items():
+        if exception.cancelled or not is_occurrence(series.recurrence_rule, series.start_time, tz_name, original_start):
+            continue
+        start = exception.start_time or original_start
+        end = exception.end_time or (start + duration if duration is not None else None)
+        starts_inside = window_start <= start < window_end
+        runs_into = overlap and start < window_start and end is not None and end > window_start
+        if starts_inside or runs_into:
+            occurrences.append(base.model_copy(update={
+                "title": exception.title or base.title,
+                "description": exception.description if exception.description is not None else base.description,
+                "start_time": start,
+                "end_time": end,
+                "occurrence_start": original_start,
+            }))
+    return occurrences
+
+
+async def _occurrences_in_window(db: AsyncSession, window_start: datetime, window_end: datetime, overlap: bool = True,
+                                 limit: Optional[int] = None) -> List[ScheduleResponse]:
+    """Expand every recurring schedule that may have occurrences in the window (see _expand_series for limit)"""
+    result = await db.execute(
+        select(Schedule)
+        .options(selectinload(Schedule.exceptions))
+        .filter(Schedule.recurrence_rule.isnot(None), Schedule.start_time < window_end)
+    )
+    occurrences = []
+    for series in result.scalars().all():
+        occurrences += _expand_series(series, window_start, window_end, overlap and limit is None, limit)
+    return occurrences
+
+
+def _localize(schedules: List[ScheduleResponse], zone: ZoneInfo) -> List[ScheduleResponse]:
+    """Express start/end times in zone so clients can bucket rows by local day"""
+    localized = []
+    for item in schedules:
+        response = ScheduleResponse.model_validate(item, from_attributes=True)
+        response.start_time = response.start_time.astimezone(zone)
+        if response.end_time is not None:
+            response.end_time = response.end_time.astimezone(zone)
+        localized.append(response)
+    return localized
 
 @router.get("/", response_model=List[ScheduleResponse])
+@cached_response(Schedule, List[ScheduleResponse])
 async def get_schedules(
+    request: Request,
     skip: int = 0, 
     limit: int = 100,
     date_filter: Optional[str] = Query(None, description="Filter by date (YYYY-MM-DD format)"),
+    tz: Optional[str] = Query(None, description="IANA timezone used for date_filter"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get all schedules with pagination and optional date filtering"""
@@ -43,20 +235,149 @@ async def get_schedules(
     
     # Add date filtering if provided
     if date_filter:
-        try:
-            filter_date = datetime.strptime(date_filter, "%Y-%m-%d").date()
-            # Filter schedules that start on the specified date
-            query = query.filter(
-                Schedule.start_time >= datetime.combine(filter_date, datetime.min.time()),
-                Schedule.start_time < datetime.combine(filter_date, datetime.max.time())
-            )
-        except ValueError:
-            raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+        # Filter schedules that start on the specified local date
+        day_start, day_end = _local_day_window(date_filter, _get_zone(tz))
+        query = query.filter(Schedule.start_time >= day_start, Schedule.start_time < day_end)
     
     result = await db.execute(query.offset(skip).limit(limit))
     schedules = result.scalars().all()
     return schedules
 
+@router.get("/page", response_model=CursorPage[ScheduleResponse])
+@cached_response(Schedule, CursorPage[ScheduleResponse])
+async def get_schedules_page(
+    request: Request,
+    cursor: Optional[str] = Query(None, description="next_cursor from the previous page"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get schedules ordered by (start_time, id) using keyset pagination.
+
+    Each page seeks directly into ix_schedules_start_time_id, so deep pages cost
+    the same as the first one, unlike skip/limit.
+    """
+    query = select(Schedule).order_by(Schedule.start_time, Schedule.id)
+    if cursor:
+        last_start, last_id = decode_cursor(cursor, 2)
+        try:
+            last_start = datetime.fromisoformat(last_start)
+            last_id = int(last_id)
+        except (TypeError, ValueError):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+        query = query.filter(tuple_(Schedule.start_time, Schedule.id) > tuple_(last_start, last_id))
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(query.limit(limit + 1))
+    schedules = result.scalars().all()
+
+    next_cursor = None
+    if len(schedules) > limit:
+        schedules = schedules[:limit]
+        last = schedules[-1]
+        next_cursor = encode_cursor(last.start_time.isoformat(), last.id)
+    return {"items": schedules, "next_cursor": next_cursor}
+
+@router.get("/range", response_model=List[ScheduleResponse])
+@cached_response(Schedule, List[ScheduleResponse])
+async def get_schedules_in_range(
+    request: Request,
+    start: str = Query(..., description="Window start, inclusive (YYYY-MM-DD or ISO 8601)"),
+    end: str = Query(..., description="Window end, exclusive (YYYY-MM-DD or ISO 8601)"),
+    tz: Optional[str] = Query(None, description="IANA timezone for naive bounds and returned times"),
+    db: AsyncSession = Depends(get_db)
+):
+    """Get every schedule overlapping the [start, end) window, ordered by start time"""
+    zone = _get_zone(tz)
+    window_start = _parse_local_datetime(start, zone)
+    window_end = _parse_local_datetime(end, zone)
+
+    if window_end <= window_start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+    if window_end - window_start > timedelta(days=MAX_RANGE_DAYS):
+        raise HTTPException(status_code=400, detail=f"Range cannot exceed {MAX_RANGE_DAYS} days")
+
+    result = await db.execute(
+        select(Schedule)
+        .filter(Schedule.recurrence_rule.is_(None), *_overlaps_window(window_start, window_end))
+        .order_by(Schedule.start_time, Schedule.id)
+    )
+    schedules = [ScheduleResponse.model_validate(item) for item in result.scalars().all()]
+    occurrences = await _occurrences_in_window(db, window_start, window_end)
+    if occurrences:
+        schedules = sorted(schedules + occurrences, key=lambda item: (item.start_time, item.id))
+    return _localize(schedules, zone)
+
+@router.get("/search", response_model=List[ScheduleSearchResult])
+@cached_response(Schedule, List[ScheduleSearchResult])
+async def search_schedules(
+    request: Request,
+    q: str = Query(..., min_length=1, max_length=200, description="Words or a substring of the title / description"),
+    limit: int = Query(DEFAULT_SEARCH_LIMIT, ge=1, le=MAX_SEARCH_LIMIT),
+    db: AsyncSession = Depends(get_db)
+):
+    """Find schedules by title / description with one indexed query, best match first.
+
+    Matches substrings (so CJK text like 晨跑 works), similar words (typos) and
+    full-text words; see app/api/search.py.
+    """
+    result = await db.execute(search_query(Schedule, q.strip(), limit))
+    hits = []
+    for item, score in result.all():
+        hit = ScheduleSearchResult.model_validate(item)
+        hit.score = round(score, 4)
+        hits.append(hit)
+    return hits
+
+@router.get("/calendar.ics", response_class=Response)
+async def get_calendar_feed(
+    request: Request,
+    start: Optional[str] = Query(None, description="Only events ending after this (YYYY-MM-DD or ISO 8601)"),
+    end: Optional[str] = Query(None, description="Only events starting before this (YYYY-MM-DD or ISO 8601)"),
+    tz: Optional[str] = Query(None, description="IANA timezone for naive bounds"),
+    db: AsyncSession = Depends(get_db)
+):
+    """iCalendar subscription feed of schedules.
+
+    The rendered feed is cached per window and only re-rendered when the schedules
+    table version moves. While the change listener is connected that version is
+    memoized, so polls that find nothing new do not touch the database at all.
+    """
+    zone = _get_zone(tz)
+    window_start = _parse_local_datetime(start, zone) if start else None
+    window_end = _parse_local_datetime(end, zone) if end else None
+    if window_start and window_end and window_end <= window_start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+    key = (window_start, window_end)
+    version = await table_version(db, Schedule)
+    feed = _calendar_feeds.get(key, version)
+    if feed is None:
+        # Recurring schedules are published as RRULE series, so they match the window as a whole
+        query = select(Schedule).options(selectinload(Schedule.exceptions))
+        if window_start:
+            query = query.filter(or_(
+                Schedule.start_time >= window_start,
+                Schedule.end_time > window_start,
+                Schedule.recurrence_rule.isnot(None),
+            ))
+        if window_end:
+            query = query.filter(Schedule.start_time < window_end)
+        result = await db.execute(query.order_by(Schedule.start_time, Schedule.id))
+        feed = _calendar_feeds.put(key, version, render_calendar(result.scalars().all(), DEFAULT_TIMEZONE))
+
+    headers = {
+        "ETag": feed.etag,
+        "Last-Modified": http_date(feed.last_modified),
+        "Cache-Control": "no-cache",
+    }
+    if etag_matches(request, feed.etag) or (
+        "if-none-match" not in request.headers
+        and not_modified_since(request.headers.get("if-modified-since"), feed.last_modified)
+    ):
+        return Response(status_code=304, headers=headers)
+    headers["Content-Disposition"] = 'inline; filename="schedules.ics"'
+    return Response(content=feed.body, media_type="text/calendar; charset=utf-8", headers=headers)
+
 @router.post("/", response_model=ScheduleResponse, status_code=status.HTTP_201_CREATED)
 async def create_schedule(
     schedule: ScheduleCreate,
@@ -67,16 +388,96 @@ async def create_schedule(
         title=schedule.title,
         description=schedule.description,
         start_time=schedule.start_time,
-        end_time=schedule.end_time
+        end_time=schedule.end_time,
+        recurrence_rule=schedule.recurrence_rule,
+        timezone=schedule.timezone
     )
     db.add(db_schedule)
     await db.commit()
     await db.refresh(db_schedule)
+    changes.publish(Schedule.__tablename__, "insert", [db_schedule.id])
     return db_schedule
 
+@router.post("/bulk", response_model=BulkResult[ScheduleResponse])
+async def create_schedules_bulk(
+    schedules: List[ScheduleCreate],
+    db: AsyncSession = Depends(get_db_transaction)
+):
+    """Create many schedules in one transaction with a multi-row INSERT ... RETURNING"""
+    check_batch_size(len(schedules))
+
+    result = await db.execute(
+        insert(Schedule).returning(Schedule, sort_by_parameter_order=True),
+        [schedule.dict() for schedule in schedules]
+    )
+    created = result.scalars().all()
+    await db.commit()
+    changes.publish(Schedule.__tablename__, "insert", [item.id for item in created])
+
+    return summarize([
+        {"index": index, "id": item.id, "status": "created", "data": item}
+        for index, item in enumerate(created)
+    ])
+
+@router.patch("/bulk", response_model=BulkResult[ScheduleResponse])
+async def update_schedules_bulk(
+    schedules: List[ScheduleBulkUpdate],
+    db: AsyncSession = Depends(get_db_transaction)
+):
+    """Partially update many schedules in one transaction; each item carries its id"""
+    check_batch_size(len(schedules))
+
+    results = []
+    row_changes = {}
+    indexes = {}
+    for index, schedule in enumerate(schedules):
+        update_data = schedule.dict(exclude_unset=True, exclude={"id"})
+        if schedule.id in indexes:
+            results.append({"index": index, "id": schedule.id, "status": "error", "error": "Duplicate id in batch"})
+        elif not update_data:
+            results.append({"index": index, "id": schedule.id, "status": "error", "error": "No fields to update"})
+        else:
+            row_changes[schedule.id] = update_data
+            indexes[schedule.id] = index
+
+    updated = await update_rows_by_id(db, Schedule, row_changes)
+    await db.commit()
+    changes.publish(Schedule.__tablename__, "update", updated.keys())
+
+    for schedule_id, index in indexes.items():
+        if schedule_id in updated:
+            results.append({"index": index, "id": schedule_id, "status": "updated", "data": updated[schedule_id]})
+        else:
+            results.append({"index": index, "id": schedule_id, "status": "not_found", "error": "Schedule not found"})
+    return summarize(results)
+
+@router.delete("/bulk", response_model=BulkResult[ScheduleResponse])
+async def delete_schedules_bulk(
+    request: BulkDeleteRequest,
+    db: AsyncSession = Depends(get_db_transaction)
+):
+    """Delete many schedules with a single DELETE ... RETURNING"""
+    check_batch_size(len(request.ids))
+
+    result = await db.execute(
+        delete(Schedule).where(Schedule.id.in_(request.ids)).returning(Schedule.id)
+    )
+    deleted = set(result.scalars().all())
+    await db.commit()
+    changes.publish(Schedule.__tablename__, "delete", deleted)
+
+    return summarize([
+        {"index": index, "id": schedule_id, "status": "deleted"}
+        if schedule_id in deleted else
+        {"index": index, "id": schedule_id, "status": "not_found", "error": "Schedule not found"}
+        for index, schedule_id in enumerate(request.ids)
+    ])
+
 @router.get("/{schedule_id}", response_model=ScheduleResponse)
+@cached_response(Schedule, ScheduleResponse, id_param="schedule_id")
 async def get_schedule(
     schedule_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
     """Get a specific schedule by ID"""
@@ -92,55 +493,153 @@ async def get_schedule(
 async def update_schedule(
     schedule_id: int,
     schedule: ScheduleUpdate,
+    request: Request,
+    response: Response,
     db: AsyncSession = Depends(get_db)
 ):
-    """Update a schedule"""
-    result = await db.execute(select(Schedule).filter(Schedule.id == schedule_id))
+    """Update a schedule with a single UPDATE ... RETURNING; honours If-Match"""
+    conditions = (Schedule.id == schedule_id, *if_match_filter(request, Schedule))
+    update_data = schedule.dict(exclude_unset=True)
+    if update_data:
+        result = await db.execute(
+            update(Schedule)
+            .where(*conditions)
+            .values(**update_data)
+            .returning(Schedule)
+            .execution_options(synchronize_session=False)
+        )
+    else:
+        result = await db.execute(select(Schedule).where(*conditions))
     db_schedule = result.scalars().first()
     
     if not db_schedule:
-        raise HTTPException(status_code=404, detail="Schedule not found")
+        raise await write_failure(db, Schedule, schedule_id, "Schedule not found")
     
-    update_data = schedule.dict(exclude_unset=True)
-    for key, value in update_data.items():
-        setattr(db_schedule, key, value)
-    
-    await db.commit()
-    await db.refresh(db_schedule)
+    if update_data:
+        changes.publish(Schedule.__tablename__, "update", [schedule_id])
+    response.headers["ETag"] = row_etag(db_schedule.version)
     return db_schedule
 
 @router.delete("/{schedule_id}", status_code=status.HTTP_204_NO_CONTENT)
 async def delete_schedule(
     schedule_id: int,
+    request: Request,
     db: AsyncSession = Depends(get_db)
 ):
-    """Delete a schedule"""
-    result = await db.execute(select(Schedule).filter(Schedule.id == schedule_id))
-    db_schedule = result.scalars().first()
-    
-    if not db_schedule:
-        raise HTTPException(status_code=404, detail="Schedule not found")
+    """Delete a schedule with a single DELETE ... RETURNING; honours If-Match"""
+    result = await db.execute(
+        delete(Schedule)
+        .where(Schedule.id == schedule_id, *if_match_filter(request, Schedule))
+        .returning(Schedule.id)
+    )
+    if result.scalar() is None:
+        raise await write_failure(db, Schedule, schedule_id, "Schedule not found")
     
-    await db.delete(db_schedule)
-    await db.commit()
+    changes.publish(Schedule.__tablename__, "delete", [schedule_id])
     return None
 
 @router.get("/by-date/{date_str}", response_model=List[ScheduleResponse])
+@cached_response(Schedule, List[ScheduleResponse])
 async def get_schedules_by_date(
     date_str: str,
+    request: Request,
+    tz: Optional[str] = Query(None, description="IANA timezone the date is expressed in"),
     db: AsyncSession = Depends(get_db)
 ):
     """Get schedules for a specific date (YYYY-MM-DD format)"""
-    try:
-        filter_date = datetime.strptime(date_str, "%Y-%m-%d").date()
-    except ValueError:
-        raise HTTPException(status_code=400, detail="Invalid date format. Use YYYY-MM-DD")
+    day_start, day_end = _local_day_window(date_str, _get_zone(tz))
     
     result = await db.execute(
-        select(Schedule).filter(
-            Schedule.start_time >= datetime.combine(filter_date, datetime.min.time()),
-            Schedule.start_time < datetime.combine(filter_date, datetime.max.time())
-        )
+        select(Schedule)
+        .filter(Schedule.recurrence_rule.is_(None), Schedule.start_time >= day_start, Schedule.start_time < day_end)
+        .order_by(Schedule.start_time, Schedule.id)
     )
     schedules = result.scalars().all()
+    occurrences = await _occurrences_in_window(db, day_start, day_end, overlap=False)
+    if occurrences:
+        schedules = sorted(
+            [ScheduleResponse.model_validate(item) for item in schedules] + occurrences,
+            key=lambda item: (item.start_time, item.id)
+        )
     return schedules
+
+async def _get_series(db: AsyncSession, schedule_id: int) -> Schedule:
+    result = await db.execute(select(Schedule).filter(Schedule.id == schedule_id))
+    series = result.scalars().first()
+    if not series:
+        raise HTTPException(status_code=404, detail="Schedule not found")
+    if not series.recurrence_rule:
+        raise HTTPException(status_code=400, detail="Schedule is not recurring")
+    return series
+
+async def _touch_series(db: AsyncSession, schedule_id: int) -> None:
+    """Bump the series' updated_at and version so ETags, caches and the change feed see the exception"""
+    await db.execute(update(Schedule).where(Schedule.id == schedule_id).values(updated_at=func.now()))
+
+@router.get("/{schedule_id}/exceptions", response_model=List[ScheduleExceptionResponse])
+async def get_schedule_exceptions(
+    schedule_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """List the cancelled and modified occurrences of a recurring schedule"""
+    await _get_series(db, schedule_id)
+    result = await db.execute(
+        select(ScheduleException)
+        .filter(ScheduleException.schedule_id == schedule_id)
+        .order_by(ScheduleException.original_start)
+    )
+    return result.scalars().all()
+
+@router.put("/{schedule_id}/exceptions/{original_start}", response_model=ScheduleExceptionResponse)
+async def upsert_schedule_exception(
+    schedule_id: int,
+    original_start: datetime,
+    exception: ScheduleExceptionUpsert,
+    db: AsyncSession = Depends(get_db_transaction)
+):
+    """Cancel or modify the occurrence the rule generates at original_start (its occurrence_start)"""
+    series = await _get_series(db, schedule_id)
+    tz_name = series.timezone or DEFAULT_TIMEZONE
+    if original_start.tzinfo is None:
+        original_start = original_start.replace(tzinfo=ZoneInfo(tz_name))
+    if not is_occurrence(series.recurrence_rule, series.start_time, tz_name, original_start):
+        raise HTTPException(status_code=404, detail="No occurrence starts at original_start")
+
+    values = exception.dict()
+    result = await db.execute(
+        pg_insert(ScheduleException)
+        .values(schedule_id=schedule_id, original_start=original_start, **values)
+        .on_conflict_do_update(
+            constraint="uq_schedule_exceptions_occurrence",
+            set_={**values, "updated_at": func.now()}
+        )
+        .returning(ScheduleException)
+        .execution_options(populate_existing=True)
+    )
+    db_exception = result.scalars().first()
+    await _touch_series(db, schedule_id)
+    await db.commit()
+    changes.publish(Schedule.__tablename__, "update", [schedule_id])
+    return db_exception
+
+@router.delete("/{schedule_id}/exceptions/{original_start}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_schedule_exception(
+    schedule_id: int,
+    original_start: datetime,
+    db: AsyncSession = Depends(get_db_transaction)
+):
+    """Restore an occurrence to what the rule generates"""
+    series = await _get_series(db, schedule_id)
+    if original_start.tzinfo is None:
+        original_start = original_start.replace(tzinfo=ZoneInfo(series.timezone or DEFAULT_TIMEZONE))
+    result = await db.execute(
+        delete(ScheduleException)
+        .where(ScheduleException.schedule_id == schedule_id, ScheduleException.original_start == original_start)
+        .returning(ScheduleException.id)
+    )
+    if result.scalar() is None:
+        raise HTTPException(status_code=404, detail="Exception not found")
+    await _touch_series(db, schedule_id)
+    await db.commit()
+    changes.publish(Schedule.__tablename__, "update", [schedule_id])
+    return None
@@ -0,0 +1,40 @@
+"""Ranked substring / fuzzy / full-text search over the generated search columns (migration 0007)"""
+from sqlalchemy import case, func, or_
+from sqlalchemy.future import select
+
+# Generated columns that exist for searching only; not part of any API representation
+SEARCH_COLUMNS = ("search_text", "search_vector")
+DEFAULT_SEARCH_LIMIT = 10
+MAX_SEARCH_LIMIT = 50
+
+
+def escape_like(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def search_query(model, q: str, limit: int):
+    """SELECT (row, score) for rows of model matching q, best first.
+
+    A row matches when q is a substring of search_text (ILIKE, any script),
+    when a word in it is similar to q (pg_trgm %>, tolerates typos) or when
+    all of q's words occur in search_vector. Every branch is served by one of
+    the two GIN indexes, so Postgres combines them with a BitmapOr. The score
+    adds a bonus for exact substrings to word similarity and ts_rank.
+    """
+    tsquery = func.plainto_tsquery("simple", q)
+    substring = model.search_text.ilike(f"%{escape_like(q)}%", escape="\\")
+    score = (
+        case((substring, 1.0), else_=0.0)
+        + func.word_similarity(q, model.search_text)
+        + func.ts_rank(model.search_vector, tsquery)
+    ).label("score")
+    return (
+        select(model, score)
+        .filter(or_(
+            substring,
+            model.search_text.op("%>")(q),
+            model.search_vector.op("@@")(tsquery),
+        ))
+        .order_by(score.desc(), model.id)
+        .limit(limit)
+    )
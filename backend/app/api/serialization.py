@@ -0,0 +1,25 @@
+from functools import lru_cache
+from typing import Any
+from pydantic import TypeAdapter
+
+
+@lru_cache(maxsize=None)
+def type_adapter(response_type: Any) -> TypeAdapter:
+    """Shared TypeAdapter per response type; building one compiles its validator and serializer"""
+    return TypeAdapter(response_type)
+
+
+def dump_json(response_type: Any, payload: Any) -> bytes:
+    """Validate ORM objects or dicts against response_type and serialize straight to JSON bytes.
+
+    Validation and serialization both run in pydantic-core, so rows never pass
+    through intermediate Python dicts or the stdlib json module.
+    """
+    adapter = type_adapter(response_type)
+    return adapter.dump_json(adapter.validate_python(payload, from_attributes=True))
+
+
+def dump_jsonable(response_type: Any, payload: Any) -> Any:
+    """Like dump_json, but returns JSON-compatible Python data for embedding in a larger document"""
+    adapter = type_adapter(response_type)
+    return adapter.dump_python(adapter.validate_python(payload, from_attributes=True), mode="json")
@@ -0,0 +1,30 @@
+import logging
+from typing import Callable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# callback(table, op, ids, remote); op is "insert", "update", "delete" or "reset",
+# ids is None when unknown, remote is True for changes relayed by LISTEN/NOTIFY
+ChangeCallback = Callable[[str, str, Optional[frozenset], bool], None]
+
+_listeners: List[ChangeCallback] = []
+
+
+def subscribe(listener: ChangeCallback) -> None:
+    """Register a callback run for every row change published in this process"""
+    _listeners.append(listener)
+
+
+def publish(table: str, op: str, ids: Optional[Iterable[int]] = None, remote: bool = False) -> None:
+    """Announce committed changes to rows of table.
+
+    Write handlers call this after their commit so caches never see a change
+    before the data is visible to other sessions. The change listener publishes
+    with remote=True; those include this worker's own writes.
+    """
+    ids = frozenset(ids) if ids is not None else None
+    for listener in list(_listeners):
+        try:
+            listener(table, op, ids, remote)
+        except Exception:
+            logger.exception(f"Change listener failed for {op} on {table}")
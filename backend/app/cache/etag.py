@@ -0,0 +1,108 @@
+import hashlib
+from collections import defaultdict
+from typing import Any, Dict, List, Optional
+from fastapi import Request, Response
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.cache import changes
+
+# Table versions remembered between requests. Only trusted while the change
+# listener is connected, because then writes from every worker evict them.
+_versions: Dict[str, str] = {}
+_version_generations: Dict[str, int] = defaultdict(int)
+_memoize_versions = False
+
+
+def memoize_versions(enabled: bool) -> None:
+    """Turn the table version memo on or off; either way it starts empty"""
+    global _memoize_versions
+    _memoize_versions = enabled
+    _versions.clear()
+
+
+def forget_table_version(table: str) -> None:
+    _version_generations[table] += 1
+    _versions.pop(table, None)
+
+
+changes.subscribe(lambda table, op, ids, remote: forget_table_version(table))
+
+
+async def table_version(db: AsyncSession, model) -> str:
+    """Cheap change fingerprint for a table: row count plus the latest updated_at.
+
+    Inserts and updates move max(updated_at) (updated_at has onupdate=now()),
+    deletes change the count. One aggregate query, no rows are loaded, and
+    none at all while the memo is enabled and the table has not changed.
+    """
+    table = model.__tablename__
+    if _memoize_versions and table in _versions:
+        return _versions[table]
+
+    generation = _version_generations[table]
+    result = await db.execute(select(func.count(), func.max(model.updated_at)))
+    count, last_updated = result.one()
+    version = f"{count}:{last_updated.isoformat() if last_updated else ''}"
+    if _memoize_versions and generation == _version_generations[table]:
+        _versions[table] = version
+    return version
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag derived from the given parts"""
+    digest = hashlib.sha1("|".join(str(part) for part in parts).encode()).hexdigest()
+    return f'"{digest}"'
+
+
+async def compute_etag(request: Request, db: AsyncSession, model, *extra: Any) -> str:
+    """ETag for a GET on a table-backed route: table version + path + query + extra parts.
+
+    extra carries anything else the representation depends on, e.g. today's date
+    for consumables whose days_remaining changes at midnight.
+    """
+    version = await table_version(db, model)
+    query = sorted(request.query_params.multi_items())
+    return make_etag(model.__tablename__, version, request.url.path, query, *extra)
+
+
+def row_etag(version: int, *extra: Any) -> str:
+    """ETag of a single row: its version column plus anything else the representation depends on.
+
+    The version comes first so an If-Match echoing this tag can be checked
+    against the version column (see if_match_versions).
+    """
+    return '"' + ".".join(str(part) for part in (version, *extra)) + '"'
+
+
+def if_match_versions(request: Request) -> Optional[List[int]]:
+    """Row versions accepted by If-Match; None when the header is absent or "*"."""
+    header = request.headers.get("if-match")
+    if header is None or header.strip() == "*":
+        return None
+    versions = []
+    for tag in header.split(","):
+        tag = tag.strip()
+        # If-Match uses strong comparison, weak tags never match
+        if tag.startswith("W/"):
+            continue
+        version = tag.strip('"').split(".", 1)[0]
+        if version.isdigit():
+            versions.append(int(version))
+    return versions
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """If-None-Match check (weak comparison, as RFC 9110 requires for GET)"""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    if header.strip() == "*":
+        return True
+    candidates = [tag.strip() for tag in header.split(",")]
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def not_modified(etag: str) -> Response:
+    return Response(status_code=304, headers={"ETag": etag, "Cache-Control": "no-cache"})
+
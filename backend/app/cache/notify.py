@@ -0,0 +1,105 @@
+import asyncio
+import json
+import logging
+import os
+from typing import Optional
+import asyncpg
+from sqlalchemy.engine import make_url
+
+from app.cache import changes
+from app.cache.etag import memoize_versions
+from app.database.database import DATABASE_URL
+
+logger = logging.getLogger(__name__)
+
+# Must match the channel used by the triggers in alembic revision 0004
+CHANGE_CHANNEL = "row_changes"
+WATCHED_TABLES = ("schedules", "consumables")
+
+CHANGE_NOTIFY_ENABLED = os.getenv("CHANGE_NOTIFY_ENABLED", "true").lower() == "true"
+KEEPALIVE_INTERVAL = 30
+RECONNECT_MAX_DELAY = 30
+
+
+def _asyncpg_dsn(url: str) -> str:
+    # DATABASE_URL is a SQLAlchemy URL (postgresql+asyncpg://...); asyncpg wants plain postgresql://
+    return make_url(url).set(drivername="postgresql").render_as_string(hide_password=False)
+
+
+class ChangeListener:
+    """Keeps a dedicated LISTEN connection and republishes row changes from any worker.
+
+    Notifications land on the in-process change bus (app.cache.changes), so the
+    response cache and ETag memo react to writes made by other workers and
+    replicas the same way they react to local ones. While disconnected, nothing
+    is memoized and every (re)connect resets all caches, since notifications
+    sent in the meantime are lost.
+    """
+
+    def __init__(self, dsn: str):
+        self.dsn = dsn
+        self.connected = False
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:
+        try:
+            message = json.loads(payload)
+            changes.publish(message["table"], message["op"], message.get("ids"), remote=True)
+        except (ValueError, KeyError, TypeError):
+            logger.warning(f"Ignoring malformed change notification: {payload!r}")
+
+    def _reset(self) -> None:
+        for table in WATCHED_TABLES:
+            changes.publish(table, "reset", remote=True)
+
+    async def _run(self) -> None:
+        delay = 1
+        while True:
+            connection = None
+            try:
+                connection = await asyncpg.connect(self.dsn)
+                lost = asyncio.Event()
+                connection.add_termination_listener(lambda _: lost.set())
+                await connection.add_listener(CHANGE_CHANNEL, self._on_notify)
+
+                self.connected = True
+                memoize_versions(True)
+                self._reset()
+                delay = 1
+                logger.info(f"Listening for row changes on channel {CHANGE_CHANNEL}")
+
+                while not lost.is_set():
+                    try:
+                        await asyncio.wait_for(lost.wait(), KEEPALIVE_INTERVAL)
+                    except asyncio.TimeoutError:
+                        # Detects half-open connections that never report termination
+                        await connection.fetchval("SELECT 1", timeout=10)
+                logger.warning("Change listener connection lost")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(f"Change listener unavailable, retrying in {delay}s: {e}")
+            finally:
+                self.connected = False
+                memoize_versions(False)
+                if connection is not None and not connection.is_closed():
+                    connection.terminate()
+
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+
+
+change_listener = ChangeListener(_asyncpg_dsn(DATABASE_URL))
@@ -0,0 +1,179 @@
+import functools
+import os
+import time
+from collections import OrderedDict, defaultdict
+from dataclasses import dataclass
+from typing import Any, Callable, Optional
+from fastapi import Response
+
+from app.api.serialization import dump_json
+from app.cache import changes
+from app.cache.etag import compute_etag, etag_matches, not_modified, row_etag
+
+# Seconds a cached response may be served; bounds staleness when another
+# process writes to the database. 0 disables the cache.
+RESPONSE_CACHE_TTL = float(os.getenv("RESPONSE_CACHE_TTL", "30"))
+RESPONSE_CACHE_MAXSIZE = int(os.getenv("RESPONSE_CACHE_MAXSIZE", "512"))
+
+
+@dataclass
+class CacheEntry:
+    body: bytes
+    etag: str
+    table: str
+    # Row ids a detail response depends on; None means the whole table (lists)
+    ids: Optional[frozenset]
+    expires_at: float = 0.0
+
+
+class ResponseCache:
+    """Bounded TTL + LRU cache of serialized GET responses"""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Bumped on every invalidation, so a response loaded before a write
+        # is not stored after it
+        self._generations = defaultdict(int)
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl > 0 and self.maxsize > 0
+
+    def generation(self, table: str) -> int:
+        return self._generations[table]
+
+    def get(self, key) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry.expires_at <= time.monotonic():
+            del self._entries[key]
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry
+
+    def set(self, key, entry: CacheEntry, generation: int) -> None:
+        if not self.enabled or generation != self._generations[entry.table]:
+            return
+        entry.expires_at = time.monotonic() + self.ttl
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def invalidate(self, table: str, ids: Optional[frozenset] = None) -> int:
+        """Drop entries affected by a change to table.
+
+        List entries always go; detail entries only when their row is among ids
+        (or when ids is unknown).
+        """
+        self._generations[table] += 1
+        stale = [
+            key for key, entry in self._entries.items()
+            if entry.table == table and (ids is None or entry.ids is None or entry.ids & ids)
+        ]
+        for key in stale:
+            del self._entries[key]
+        self.invalidations += len(stale)
+        return len(stale)
+
+    def clear(self) -> None:
+        for table in list(self._generations):
+            self._generations[table] += 1
+        self._entries.clear()
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+            "ttl_seconds": self.ttl,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "invalidations": self.invalidations,
+        }
+
+
+response_cache = ResponseCache(RESPONSE_CACHE_MAXSIZE, RESPONSE_CACHE_TTL)
+changes.subscribe(lambda table, op, ids, remote: response_cache.invalidate(table, ids))
+
+
+def _json_response(entry: CacheEntry) -> Response:
+    # no-cache: clients may store the body but must revalidate with If-None-Match
+    return Response(
+        content=entry.body,
+        media_type="application/json",
+        headers={"ETag": entry.etag, "Cache-Control": "no-cache"},
+    )
+
+
+def cached_response(model, response_model, id_param: Optional[str] = None, extra: Optional[Callable[[], Any]] = None):
+    """Serve a GET route from the response cache, with ETag / If-None-Match support.
+
+    The route must declare `request: Request` and `db: AsyncSession` parameters.
+    Hits are answered without touching the database. Misses compute the table
+    version first so a matching If-None-Match still returns 304 without loading
+    rows; otherwise the handler runs and its result is serialized once through
+    response_model and stored.
+
+    id_param names the path parameter holding the row id of a detail route, so
+    writes to other rows leave the entry alone. Detail routes use the row's
+    version column as ETag (see row_etag) instead of the table version. extra
+    returns anything else the representation depends on (e.g. today's date).
+    """
+    table = model.__tablename__
+
+    def decorator(handler):
+        @functools.wraps(handler)
+        async def wrapper(*args, **kwargs):
+            request = kwargs["request"]
+            db = kwargs["db"]
+            extra_parts = (extra(),) if extra else ()
+            key = (table, request.url.path, tuple(sorted(request.query_params.multi_items())), extra_parts)
+
+            entry = response_cache.get(key) if response_cache.enabled else None
+            if entry is None:
+                generation = response_cache.generation(table)
+                if id_param:
+                    # Detail routes tag the row version, so the ETag doubles as an If-Match value
+                    result = await handler(*args, **kwargs)
+                    if isinstance(result, Response):
+                        return result
+                    etag = row_etag(result.version, *extra_parts)
+                    if etag_matches(request, etag):
+                        return not_modified(etag)
+                else:
+                    etag = await compute_etag(request, db, model, *extra_parts)
+                    if etag_matches(request, etag):
+                        return not_modified(etag)
+                    result = await handler(*args, **kwargs)
+                    if isinstance(result, Response):
+                        return result
+                body = dump_json(response_model, result)
+                ids = frozenset([kwargs[id_param]]) if id_param else None
+                entry = CacheEntry(body=body, etag=etag, table=table, ids=ids)
+                response_cache.set(key, entry, generation)
+            elif etag_matches(request, entry.etag):
+                return not_modified(entry.etag)
+
+            return _json_response(entry)
+
+        return wrapper
+
+    return decorator
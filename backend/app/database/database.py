@@ -12,7 +12,8 @@ DATABASE_URL = os.getenv(
 # Configure async engine with correct asyncpg settings
 async_engine = create_async_engine(
     DATABASE_URL,
-    echo=True,
+    # Logs every statement; use the slow-query tracker (app.database.slow_queries) to find slow ones
+    echo=os.getenv("SQL_ECHO", "false").lower() == "true",
     future=True,
     isolation_level="AUTOCOMMIT",  # Add this for asyncpg
     pool_size=5,
@@ -38,3 +39,21 @@ async def get_db():
             raise
         finally:
             await session.close()
+
+async def get_db_transaction():
+    """Session whose statements all run in one database transaction.
+
+    The engine runs in AUTOCOMMIT mode, so statements on a get_db session commit
+    one by one. Bulk writes need all-or-nothing semantics, so this session pins
+    its connection to READ COMMITTED until it commits or rolls back.
+    """
+    async with AsyncSessionLocal() as session:
+        try:
+            await session.connection(execution_options={"isolation_level": "READ COMMITTED"})
+            yield session
+            await session.commit()
+        except Exception:
+            await session.rollback()
+            raise
+        finally:
+            await session.close()
@@ -0,0 +1,189 @@
+"""Slow-query tracker for the async engine.
+
+Every statement is timed through SQLAlchemy cursor events and aggregated under
+a fingerprint: the SQL with literals and bind parameters replaced by "?" and
+IN / VALUES lists collapsed, so the same query issued with different
+arguments or batch sizes lands in one bucket. Statements slower than
+SLOW_QUERY_MS are logged, and for SELECTs an EXPLAIN (ANALYZE, BUFFERS) plan
+can be captured on a separate connection (SLOW_QUERY_EXPLAIN=true). Writes are
+never explained, because ANALYZE executes the statement.
+"""
+import asyncio
+import hashlib
+import logging
+import math
+import os
+import re
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Deque, Dict, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+
+logger = logging.getLogger(__name__)
+
+SLOW_QUERY_MS = float(os.getenv("SLOW_QUERY_MS", "200"))
+SLOW_QUERY_EXPLAIN = os.getenv("SLOW_QUERY_EXPLAIN", "false").lower() == "true"
+# Minimum seconds between two EXPLAIN captures of the same fingerprint
+SLOW_QUERY_EXPLAIN_INTERVAL = float(os.getenv("SLOW_QUERY_EXPLAIN_INTERVAL", "600"))
+
+# Recent durations kept per fingerprint for the p95
+SAMPLE_SIZE = 256
+# New fingerprints are ignored once this many are tracked
+MAX_FINGERPRINTS = 500
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_BIND_PARAM = re.compile(r"\$\d+")
+# A placeholder optionally followed by a cast, e.g. ?::TIMESTAMP WITH TIME ZONE
+_PLACEHOLDER = r"\?(?:::[A-Z][A-Z ]*[A-Z])?"
+_PLACEHOLDER_LIST = re.compile(rf"\(\s*{_PLACEHOLDER}(?:\s*,\s*{_PLACEHOLDER})*\s*\)")
+_ROW_LIST = re.compile(r"\(\?\.\.\.\)(?:\s*,\s*\(\?\.\.\.\))+")
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def normalize(statement: str) -> str:
+    """SQL with literals and parameters replaced by ? and lists collapsed to (?...)"""
+    normalized = _STRING_LITERAL.sub("?", statement)
+    normalized = _BIND_PARAM.sub("?", normalized)
+    normalized = _NUMBER.sub("?", normalized)
+    normalized = _PLACEHOLDER_LIST.sub("(?...)", normalized)
+    normalized = _ROW_LIST.sub("(?...)", normalized)
+    return _WHITESPACE.sub(" ", normalized).strip()
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(statement: str) -> str:
+    return hashlib.sha1(normalize(statement).encode()).hexdigest()[:16]
+
+
+def percentile(samples, fraction: float) -> float:
+    ordered = sorted(samples)
+    if not ordered:
+        return 0.0
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+@dataclass
+class QueryStats:
+    fingerprint: str
+    statement: str
+    count: int = 0
+    slow_count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    samples: Deque[float] = field(default_factory=lambda: deque(maxlen=SAMPLE_SIZE))
+    last_slow_at: Optional[datetime] = None
+    explain: Optional[str] = None
+    explained_at: Optional[datetime] = None
+    # time.monotonic() of the last EXPLAIN attempt, for rate limiting
+    explain_attempted: float = field(default=-math.inf)
+
+    def as_dict(self) -> dict:
+        return {
+            "fingerprint": self.fingerprint,
+            "statement": self.statement,
+            "count": self.count,
+            "slow_count": self.slow_count,
+            "mean_ms": round(self.total_seconds / self.count * 1000, 3) if self.count else 0.0,
+            "p95_ms": round(percentile(self.samples, 0.95) * 1000, 3),
+            "max_ms": round(self.max_seconds * 1000, 3),
+            "last_slow_at": self.last_slow_at,
+            "explain": self.explain,
+            "explained_at": self.explained_at,
+        }
+
+
+class SlowQueryTracker:
+    """Aggregates statement timings per fingerprint and captures plans of slow SELECTs"""
+
+    def __init__(self, threshold_ms: float = SLOW_QUERY_MS, explain: bool = SLOW_QUERY_EXPLAIN):
+        self.threshold = threshold_ms / 1000
+        self.explain = explain
+        self._stats: Dict[str, QueryStats] = {}
+        self._engine: Optional[AsyncEngine] = None
+        self._explain_tasks = set()
+
+    def instrument(self, engine: AsyncEngine) -> None:
+        self._engine = engine
+        event.listen(engine.sync_engine, "before_cursor_execute", self._before_cursor_execute)
+        event.listen(engine.sync_engine, "after_cursor_execute", self._after_cursor_execute)
+
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("slow_query_start", []).append(time.perf_counter())
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["slow_query_start"].pop()
+        if statement.startswith("EXPLAIN"):
+            return
+        self.record(statement, elapsed, None if executemany else parameters)
+
+    def record(self, statement: str, elapsed: float, parameters=None) -> None:
+        key = fingerprint(statement)
+        stats = self._stats.get(key)
+        if stats is None:
+            if len(self._stats) >= MAX_FINGERPRINTS:
+                return
+            stats = self._stats[key] = QueryStats(key, normalize(statement))
+
+        stats.count += 1
+        stats.total_seconds += elapsed
+        stats.max_seconds = max(stats.max_seconds, elapsed)
+        stats.samples.append(elapsed)
+        if elapsed < self.threshold:
+            return
+
+        stats.slow_count += 1
+        stats.last_slow_at = datetime.now(timezone.utc)
+        logger.warning("Slow query %s took %.1f ms: %s", key, elapsed * 1000, stats.statement)
+        if self._should_explain(stats, statement, parameters):
+            stats.explain_attempted = time.monotonic()
+            try:
+                task = asyncio.get_running_loop().create_task(self._capture_plan(stats, statement, parameters))
+            except RuntimeError:
+                return
+            self._explain_tasks.add(task)
+            task.add_done_callback(self._explain_tasks.discard)
+
+    def _should_explain(self, stats: QueryStats, statement: str, parameters) -> bool:
+        return (
+            self.explain
+            and self._engine is not None
+            and parameters is not None
+            and self._is_plain_select(statement)
+            and time.monotonic() - stats.explain_attempted >= SLOW_QUERY_EXPLAIN_INTERVAL
+        )
+
+    @staticmethod
+    def _is_plain_select(statement: str) -> bool:
+        # WITH may wrap data-modifying statements and FOR UPDATE takes row locks
+        normalized = normalize(statement).upper()
+        return normalized.startswith("SELECT") and " FOR UPDATE" not in normalized and " FOR SHARE" not in normalized
+
+    async def _capture_plan(self, stats: QueryStats, statement: str, parameters) -> None:
+        try:
+            async with self._engine.connect() as conn:
+                result = await conn.exec_driver_sql(
+                    "EXPLAIN (ANALYZE, BUFFERS, FORMAT TEXT) " + statement, parameters
+                )
+                stats.explain = "\n".join(row[0] for row in result)
+                stats.explained_at = datetime.now(timezone.utc)
+        except Exception as e:
+            logger.warning(f"EXPLAIN of slow query {stats.fingerprint} failed: {e}")
+
+    def report(self, slow_only: bool = True, sort: str = "p95", limit: int = 50) -> List[dict]:
+        entries = [stats.as_dict() for stats in self._stats.values() if stats.slow_count or not slow_only]
+        sort_key = {"p95": "p95_ms", "count": "count", "max": "max_ms", "slow_count": "slow_count"}[sort]
+        entries.sort(key=lambda entry: entry[sort_key], reverse=True)
+        return entries[:limit]
+
+    def reset(self) -> None:
+        self._stats.clear()
+
+
+slow_query_tracker = SlowQueryTracker()
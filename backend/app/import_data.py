@@ -0,0 +1,41 @@
+"""Bulk-load a CSV or NDJSON file into schedules or consumables using COPY.
+
+Usage: python -m app.import_data {schedules|consumables} FILE [--tz Asia/Taipei] [--skip-invalid]
+
+Uses DATABASE_URL like the API; the file format follows its extension (.csv, otherwise NDJSON).
+"""
+import argparse
+import asyncio
+import sys
+from zoneinfo import ZoneInfo
+
+from app.api.export import ExportTable
+from app.api.imports import import_rows, parse_rows
+from app.api.schedules import DEFAULT_TIMEZONE
+from app.database.database import async_engine
+
+
+async def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.import_data", description=__doc__.splitlines()[0])
+    parser.add_argument("table", choices=[table.value for table in ExportTable])
+    parser.add_argument("file")
+    parser.add_argument("--format", choices=["csv", "ndjson"], help="defaults from the file extension")
+    parser.add_argument("--tz", default=DEFAULT_TIMEZONE, help="timezone for datetimes without an offset")
+    parser.add_argument("--skip-invalid", action="store_true", help="load valid rows even if some rows are invalid")
+    args = parser.parse_args(argv)
+
+    import_format = args.format or ("csv" if args.file.lower().endswith(".csv") else "ndjson")
+    with open(args.file, encoding="utf-8-sig", newline="") as f:
+        text = f.read()
+
+    try:
+        summary = await import_rows(ExportTable(args.table), parse_rows(text, import_format), ZoneInfo(args.tz), args.skip_invalid)
+    finally:
+        await async_engine.dispose()
+
+    print(summary.model_dump_json(indent=2))
+    return 0 if summary.committed or not summary.received else 1
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -1,7 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api import schedules, consumables
+from app.api import schedules, consumables, dashboard, debug, events, export, imports
 from app.database import init_db
+from app.database.database import async_engine
+from app.database.slow_queries import slow_query_tracker
+from app.metrics import MetricsMiddleware, instrument_engine, metrics_response
+from app.cache.response_cache import response_cache
+from app.api.recurrence import expand
+from app.cache.notify import change_listener, CHANGE_NOTIFY_ENABLED
 import logging
 from pydantic import BaseModel
 
@@ -24,7 +30,11 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag"],
 )
+app.add_middleware(MetricsMiddleware)
+instrument_engine(async_engine)
+slow_query_tracker.instrument(async_engine)
 
 # Initialize logger
 logger = logging.getLogger("uvicorn")
@@ -35,15 +45,28 @@ logger.setLevel(logging.INFO)
 async def startup_event():
     logger.info("Starting up database...")
     try:
-        await init_db.create_tables()
+        await init_db.run_migrations()
         logger.info("Database initialized successfully")
     except Exception as e:
         logger.error(f"Database initialization failed: {e}")
         raise
+    if CHANGE_NOTIFY_ENABLED:
+        await change_listener.start()
+    await events.change_hub.start()
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    await events.change_hub.stop()
+    await change_listener.stop()
 
 # Include routers
 app.include_router(schedules.router, prefix="/api/schedules", tags=["schedules"])
 app.include_router(consumables.router, prefix="/api/consumables", tags=["consumables"])
+app.include_router(dashboard.router, prefix="/api/dashboard", tags=["dashboard"])
+app.include_router(export.router, prefix="/api/export", tags=["export"])
+app.include_router(imports.router, prefix="/api/import", tags=["import"])
+app.include_router(events.router, prefix="/api/events", tags=["events"])
+app.include_router(debug.router, prefix="/debug", tags=["debug"])
 
 @app.get("/")
 def read_root():
@@ -52,3 +75,17 @@ def read_root():
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+@app.get("/cache/stats")
+async def cache_stats():
+    """Hit / miss / eviction counters of the in-process response cache and recurrence expansion memo"""
+    return {
+        **response_cache.stats(),
+        "change_listener_connected": change_listener.connected,
+        "recurrence_expansions": expand.cache_info()._asdict(),
+    }
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus metrics: request latency, in-flight requests, DB pool and per-request query stats"""
+    return metrics_response()
@@ -0,0 +1,180 @@
+"""Prometheus metrics for the API, served at GET /metrics.
+
+Request latency and in-flight gauges come from an ASGI middleware, which
+measures until the response body has been sent so streaming endpoints are
+timed correctly. SQLAlchemy cursor events count queries and DB time; they
+accumulate into a per-request ContextVar, so handlers that fan out with
+asyncio.gather are still attributed to the request that started them.
+Connection pool usage is read from the engine at scrape time.
+"""
+import time
+from contextvars import ContextVar
+from typing import Optional
+
+from prometheus_client import CONTENT_TYPE_LATEST, REGISTRY, Counter, Gauge, Histogram, generate_latest
+from prometheus_client.core import GaugeMetricFamily
+from sqlalchemy import event
+from sqlalchemy.ext.asyncio import AsyncEngine
+from starlette.responses import Response
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "Time from receiving a request until its response has been sent",
+    ["method", "route", "status"],
+    buckets=LATENCY_BUCKETS,
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "Requests currently being handled, including open streams",
+    ["method"],
+)
+REQUEST_QUERIES = Histogram(
+    "http_request_db_queries",
+    "SQL statements executed per request",
+    ["method", "route"],
+    buckets=QUERY_COUNT_BUCKETS,
+)
+REQUEST_DB_TIME = Histogram(
+    "http_request_db_seconds",
+    "Time spent executing SQL statements per request",
+    ["method", "route"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERY_DURATION = Histogram(
+    "db_query_duration_seconds",
+    "Execution time of single SQL statements by statement type",
+    ["statement"],
+    buckets=LATENCY_BUCKETS,
+)
+QUERY_ERRORS = Counter(
+    "db_query_errors_total",
+    "SQL statements that raised an error",
+    ["statement"],
+)
+
+# Requests that did not match any route share one label to keep cardinality bounded
+UNMATCHED_ROUTE = "unmatched"
+
+
+class RequestDbStats:
+    """Query count and DB time of one request"""
+
+    __slots__ = ("queries", "seconds")
+
+    def __init__(self):
+        self.queries = 0
+        self.seconds = 0.0
+
+
+_request_db_stats: ContextVar[Optional[RequestDbStats]] = ContextVar("request_db_stats", default=None)
+
+
+def _statement_type(statement: str) -> str:
+    words = statement.lstrip().split(None, 1)
+    return words[0].upper() if words else "UNKNOWN"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault("metrics_query_start", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    elapsed = time.perf_counter() - conn.info["metrics_query_start"].pop()
+    QUERY_DURATION.labels(_statement_type(statement)).observe(elapsed)
+
+    stats = _request_db_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.seconds += elapsed
+
+
+def _handle_error(exception_context):
+    starts = exception_context.connection.info.get("metrics_query_start") if exception_context.connection else None
+    if starts:
+        starts.pop()
+    QUERY_ERRORS.labels(_statement_type(exception_context.statement or "")).inc()
+
+
+class PoolCollector:
+    """Reports connection pool usage of an engine whenever /metrics is scraped"""
+
+    def __init__(self, engine: AsyncEngine):
+        self.pool = engine.sync_engine.pool
+
+    def collect(self):
+        gauges = (
+            ("db_pool_size", "Configured number of persistent pool connections", self.pool.size()),
+            ("db_pool_checked_out", "Connections currently checked out of the pool", self.pool.checkedout()),
+            ("db_pool_checked_in", "Idle connections held by the pool", self.pool.checkedin()),
+            # Negative while the pool has not yet opened pool_size connections
+            ("db_pool_overflow", "Connections open beyond pool_size", self.pool.overflow()),
+        )
+        for name, documentation, value in gauges:
+            yield GaugeMetricFamily(name, documentation, value=value)
+
+
+def instrument_engine(engine: AsyncEngine) -> None:
+    """Attach query timing hooks and the pool collector to engine"""
+    sync_engine = engine.sync_engine
+    event.listen(sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(sync_engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(sync_engine, "handle_error", _handle_error)
+    REGISTRY.register(PoolCollector(engine))
+
+
+def _route_template(scope) -> str:
+    """Path template of the matched route, e.g. /api/schedules/{schedule_id}"""
+    if "endpoint" not in scope:
+        return UNMATCHED_ROUTE
+    # Taken from the matched route, never rebuilt from the concrete path, so path
+    # parameter values cannot leak into the label. Older FastAPI copies included
+    # routes under their prefixed path; newer versions keep the router's own route
+    # and put the prefixed one in the "fastapi" scope entry.
+    effective = scope.get("fastapi", {}).get("effective_route_context")
+    path_format = getattr(effective, "path_format", None) or getattr(scope.get("route"), "path_format", None)
+    return path_format or UNMATCHED_ROUTE
+
+
+class MetricsMiddleware:
+    """Pure ASGI middleware recording per-route latency, in-flight requests and DB work"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        status_code = 500
+        stats = RequestDbStats()
+        token = _request_db_stats.set(stats)
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method)
+        in_progress.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            in_progress.dec()
+            _request_db_stats.reset(token)
+
+            route = _route_template(scope)
+            REQUEST_DURATION.labels(method, route, str(status_code)).observe(elapsed)
+            REQUEST_QUERIES.labels(method, route).observe(stats.queries)
+            REQUEST_DB_TIME.labels(method, route).observe(stats.seconds)
+
+
+def metrics_response() -> Response:
+    return Response(generate_latest(REGISTRY), media_type=CONTENT_TYPE_LATEST)
@@ -1,14 +1,57 @@
-from sqlalchemy import Column, Integer, String, Text, Date, DateTime, func
+from contextvars import ContextVar
+from datetime import date, timedelta
+from typing import Optional
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Computed, func
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred
 from app.database.database import Base
 
+# The day expiry is counted from, pinned once per request so the SQL filters
+# (expiring_query) and days_remaining use the same value. Both read the app's
+# clock, never Postgres' current_date, which can differ across midnight or
+# when the app and database run in different time zones.
+_pinned_today: ContextVar[Optional[date]] = ContextVar("consumables_today", default=None)
+
+
+def pin_today() -> date:
+    """Fix today for the rest of the current request (or task) and return it"""
+    today = date.today()
+    _pinned_today.set(today)
+    return today
+
+
+def current_day() -> date:
+    """The day pinned by pin_today(), else the app's current date"""
+    return _pinned_today.get() or date.today()
+
+
 class Consumable(Base):
     __tablename__ = "consumables"
     
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
-    category = Column(String(100), nullable=False)
+    category = Column(String(100), nullable=False, index=True)
     installation_date = Column(Date, nullable=False)
     lifetime_days = Column(Integer, nullable=False)
+    # Generated by Postgres so expiry can be filtered and sorted in SQL
+    expires_on = Column(Date, Computed("installation_date + lifetime_days", persisted=True), index=True)
     notes = Column(Text, nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Bumped by a database trigger on every UPDATE; compared against If-Match
+    version = Column(Integer, nullable=False, server_default="1")
+    # Generated for search (migration 0007, app/api/search.py); deferred so row loads skip them
+    search_text = deferred(Column(
+        Text, Computed("coalesce(name, '') || ' ' || coalesce(notes, '')", persisted=True)
+    ))
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(notes, '')), 'B')",
+        persisted=True
+    )))
+
+    @property
+    def days_remaining(self) -> int:
+        """Days until expires_on, never negative; read by ConsumableResponse"""
+        expires_on = self.expires_on or self.installation_date + timedelta(days=self.lifetime_days)
+        return max(0, (expires_on - current_day()).days)
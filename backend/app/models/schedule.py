@@ -1,5 +1,8 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, func
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index, Computed, func, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
+from sqlalchemy.orm import deferred, relationship
 from app.database.database import Base
+from app.models.schedule_exception import ScheduleException
 
 class Schedule(Base):
     __tablename__ = "schedules"
@@ -8,6 +11,31 @@ class Schedule(Base):
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)  # Ensure nullable=True
     start_time = Column(DateTime(timezone=True), nullable=False)
-    end_time = Column(DateTime(timezone=True), nullable=True)
+    end_time = Column(DateTime(timezone=True), nullable=True, index=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # Bumped by a database trigger on every UPDATE; compared against If-Match
+    version = Column(Integer, nullable=False, server_default="1")
+    # Generated for search (migration 0007, app/api/search.py); deferred so row loads skip them
+    search_text = deferred(Column(
+        Text, Computed("coalesce(title, '') || ' ' || coalesce(description, '')", persisted=True)
+    ))
+    search_vector = deferred(Column(TSVECTOR, Computed(
+        "setweight(to_tsvector('simple', coalesce(title, '')), 'A') || "
+        "setweight(to_tsvector('simple', coalesce(description, '')), 'B')",
+        persisted=True
+    )))
+    # RRULE subset (app/api/recurrence.py); set for a recurring series, whose
+    # start_time/end_time describe the first occurrence
+    recurrence_rule = Column(Text, nullable=True)
+    # IANA zone anchoring the wall-clock time of occurrences; NULL = server default
+    timezone = Column(String(64), nullable=True)
+
+    # Loaded explicitly (selectinload) where occurrences are expanded
+    exceptions = relationship(ScheduleException, lazy="raise", passive_deletes=True)
+
+    __table_args__ = (
+        # Serves time-window filters and the (start_time, id) keyset order
+        Index("ix_schedules_start_time_id", "start_time", "id"),
+        Index("ix_schedules_recurring_start_time", "start_time", postgresql_where=text("recurrence_rule IS NOT NULL")),
+    )
@@ -0,0 +1,23 @@
+from sqlalchemy import Column, Integer, String, Text, Boolean, DateTime, ForeignKey, UniqueConstraint, false, func
+from app.database.database import Base
+
+class ScheduleException(Base):
+    """A cancelled or modified occurrence of a recurring schedule"""
+    __tablename__ = "schedule_exceptions"
+
+    id = Column(Integer, primary_key=True)
+    schedule_id = Column(Integer, ForeignKey("schedules.id", ondelete="CASCADE"), nullable=False)
+    # Start of the occurrence as generated by the rule, before any override
+    original_start = Column(DateTime(timezone=True), nullable=False)
+    cancelled = Column(Boolean, nullable=False, server_default=false())
+    # Overrides; NULL keeps the series value
+    title = Column(String(255), nullable=True)
+    description = Column(Text, nullable=True)
+    start_time = Column(DateTime(timezone=True), nullable=True)
+    end_time = Column(DateTime(timezone=True), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    __table_args__ = (
+        UniqueConstraint("schedule_id", "original_start", name="uq_schedule_exceptions_occurrence"),
+    )
@@ -1,27 +1,41 @@
-import { Component, OnInit } from '@angular/core';
+import { Component, OnDestroy, OnInit } from '@angular/core';
 import { Router } from '@angular/router';
+import { EMPTY, Subject, Subscription, auditTime, catchError, switchMap } from 'rxjs';
 import { Schedule } from '../../shared/models/schedule.model';
 import { Consumable } from '../../shared/models/consumable.model';
 import { ScheduleService } from '../../shared/services/schedule.service';
-import { ConsumableService } from '../../shared/services/consumable.service';
+import { DashboardService } from '../../shared/services/dashboard.service';
+import { ChangeFeedService } from '../../shared/services/change-feed.service';
+import { ChangeEvent } from '../../shared/models/change-event.model';
+import { CategoryCount, DashboardSummary } from '../../shared/models/dashboard.model';
+import { CalendarComponent, CalendarRange } from '../../shared/components/calendar/calendar.component';
+
+// Change events arriving within this window share one summary request
+const SUMMARY_RELOAD_MS = 500;
 
 @Component({
   selector: 'app-dashboard',
   templateUrl: './dashboard.component.html',
   styleUrls: ['./dashboard.component.scss']
 })
-export class DashboardComponent implements OnInit {
+export class DashboardComponent implements OnInit, OnDestroy {
   schedules: Schedule[] = [];
   consumables: Consumable[] = [];
+  categories: CategoryCount[] = [];
+  upcomingSchedules: Schedule[] = [];
   isLoadingSchedules = true;
   isLoadingConsumables = true;
   error: string | null = null;
   selectedDate: Date | null = null;
   selectedDateSchedules: Schedule[] = [];
+  visibleRange: CalendarRange = CalendarComponent.visibleRange(new Date());
+  private changeSubscription?: Subscription;
+  private summaryReload$ = new Subject<void>();
 
   constructor(
     private scheduleService: ScheduleService,
-    private consumableService: ConsumableService,
+    private dashboardService: DashboardService,
+    private changeFeed: ChangeFeedService,
     private router: Router
   ) {}
 
@@ -30,6 +44,19 @@ export class DashboardComponent implements OnInit {
     // Set today as default selected date
     this.selectedDate = new Date();
     this.updateSelectedDateSchedules();
+    // Patch local state from server-pushed changes (including LINE bot edits) instead of re-polling
+    this.changeSubscription = this.changeFeed.changes$.subscribe(event => this.onChange(event));
+    // A burst of writes (bulk edits, imports) costs one summary request per window, not one per event
+    this.changeSubscription.add(
+      this.summaryReload$.pipe(
+        auditTime(SUMMARY_RELOAD_MS),
+        switchMap(() => this.dashboardService.getSummary().pipe(catchError(() => EMPTY)))
+      ).subscribe(summary => this.applySummary(summary))
+    );
+  }
+
+  ngOnDestroy(): void {
+    this.changeSubscription?.unsubscribe();
   }
   
   private updateSelectedDateSchedules(): void {
@@ -44,8 +71,11 @@ export class DashboardComponent implements OnInit {
   loadDashboardData(): void {
     this.isLoadingSchedules = true;
     this.isLoadingConsumables = true;
+    // The calendar is re-created on reload and starts from the current month again
+    this.visibleRange = CalendarComponent.visibleRange(new Date());
     
-    this.scheduleService.getSchedules().subscribe({
+    // Only fetch the month currently shown by the calendar, not the whole table
+    this.scheduleService.getSchedulesInRange(this.visibleRange.start, this.visibleRange.end).subscribe({
       next: (data) => {
         this.schedules = data || []; // Ensure it's always an array
         this.isLoadingSchedules = false;
@@ -60,20 +90,78 @@ export class DashboardComponent implements OnInit {
       }
     });
 
-    this.consumableService.getConsumables().subscribe({
-      next: (data) => {
-        this.consumables = data || []; // Ensure it's always an array
+    // Expiring consumables, category counts and upcoming events come from one bounded summary
+    this.dashboardService.getSummary().subscribe({
+      next: (summary) => {
+        this.applySummary(summary);
         this.isLoadingConsumables = false;
       },
       error: (error) => {
-        console.error('Error loading consumables', error);
+        console.error('Error loading dashboard summary', error);
         this.error = '無法載入耗材資料';
         this.consumables = []; // Set empty array on error
+        this.categories = [];
+        this.upcomingSchedules = [];
         this.isLoadingConsumables = false;
       }
     });
   }
 
+  private reloadSummary(): void {
+    this.summaryReload$.next();
+  }
+
+  private applySummary(summary: DashboardSummary): void {
+    this.consumables = summary.expiring || [];
+    this.categories = summary.categories || [];
+    this.upcomingSchedules = summary.upcoming || [];
+  }
+
+  onVisibleRangeChange(range: CalendarRange): void {
+    this.visibleRange = range;
+    // Reload quietly so the calendar keeps its state while the new month is fetched
+    this.scheduleService.getSchedulesInRange(range.start, range.end).subscribe(data => {
+      this.schedules = data || [];
+      this.updateSelectedDateSchedules();
+    });
+  }
+
+  private onChange(event: ChangeEvent): void {
+    if (event.type === 'resync') {
+      if (event.table !== 'consumables') {
+        this.onVisibleRangeChange(this.visibleRange);
+      }
+      this.reloadSummary();
+      return;
+    }
+
+    if (event.table === 'schedules') {
+      if (this.touchesRecurring(event)) {
+        // Series are expanded into occurrences server-side; a patched-in series row would show only its first start
+        this.onVisibleRangeChange(this.visibleRange);
+      } else {
+        this.schedules = ChangeFeedService.apply(this.schedules, event, schedule => this.isInVisibleRange(schedule));
+        this.updateSelectedDateSchedules();
+      }
+    }
+    // The summary is small and its ordering and counts are computed server-side, so refetch it
+    this.reloadSummary();
+  }
+
+  private touchesRecurring(event: ChangeEvent<Schedule>): boolean {
+    // A series row in the event, or occurrences of a changed id already shown (e.g. a series made one-off)
+    const ids = new Set(event.ids || []);
+    return (event.items || []).some(item => !!item.recurrence_rule)
+      || this.schedules.some(schedule => !!schedule.recurrence_rule && ids.has(schedule.id!));
+  }
+
+  private isInVisibleRange(schedule: Schedule): boolean {
+    // Same overlap rule as the /range endpoint
+    const start = new Date(schedule.start_time);
+    const end = schedule.end_time ? new Date(schedule.end_time) : start;
+    return start < this.visibleRange.end && (end > this.visibleRange.start || start >= this.visibleRange.start);
+  }
+
   onDateSelected(date: Date): void {
     this.selectedDate = date;
     this.updateSelectedDateSchedules();
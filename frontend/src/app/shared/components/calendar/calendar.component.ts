@@ -1,6 +1,11 @@
 import { Component, OnInit, Input, Output, EventEmitter, OnChanges, SimpleChanges, ViewEncapsulation } from '@angular/core';
 import { Schedule } from '../../models/schedule.model';
 
+export interface CalendarRange {
+  start: Date;
+  end: Date;
+}
+
 interface CalendarDate {
   date: Date;
   isCurrentMonth: boolean;
@@ -19,6 +24,7 @@ export class CalendarComponent implements OnInit, OnChanges {
   @Input() schedules: Schedule[] = [];
   @Output() dateSelected = new EventEmitter<Date>();
   @Output() scheduleClicked = new EventEmitter<Schedule>();
+  @Output() visibleRangeChange = new EventEmitter<CalendarRange>();
 
   currentDate = new Date();
   selectedDate: Date | null = null;
@@ -52,21 +58,35 @@ export class CalendarComponent implements OnInit, OnChanges {
     }
   }
 
-  generateCalendar() {
-    const year = this.currentDate.getFullYear();
-    const month = this.currentDate.getMonth();
+  /**
+   * Visible grid for the month containing `date`: from the Sunday before the 1st
+   * to the midnight after the Saturday following the last day (end exclusive).
+   */
+  static visibleRange(date: Date): CalendarRange {
+    const year = date.getFullYear();
+    const month = date.getMonth();
     
     // Get first day of month and last day of month
     const firstDay = new Date(year, month, 1);
     const lastDay = new Date(year, month + 1, 0);
     
     // Get first day of calendar (might be from previous month)
-    const startDate = new Date(firstDay);
-    startDate.setDate(startDate.getDate() - firstDay.getDay());
+    const start = new Date(firstDay);
+    start.setDate(start.getDate() - firstDay.getDay());
+    
+    // Get day after the last day of calendar (might be from next month)
+    const end = new Date(lastDay);
+    end.setDate(end.getDate() + (6 - lastDay.getDay()) + 1);
     
-    // Get last day of calendar (might be from next month)
-    const endDate = new Date(lastDay);
-    endDate.setDate(endDate.getDate() + (6 - lastDay.getDay()));
+    return { start, end };
+  }
+
+  generateCalendar() {
+    const month = this.currentDate.getMonth();
+    const range = CalendarComponent.visibleRange(this.currentDate);
+    const startDate = range.start;
+    const endDate = new Date(range.end);
+    endDate.setDate(endDate.getDate() - 1);
     
     this.calendarDates = [];
     const currentDay = new Date(startDate);
@@ -130,17 +150,20 @@ export class CalendarComponent implements OnInit, OnChanges {
   previousMonth() {
     this.currentDate.setMonth(this.currentDate.getMonth() - 1);
     this.generateCalendar();
+    this.visibleRangeChange.emit(CalendarComponent.visibleRange(this.currentDate));
   }
 
   nextMonth() {
     this.currentDate.setMonth(this.currentDate.getMonth() + 1);
     this.generateCalendar();
+    this.visibleRangeChange.emit(CalendarComponent.visibleRange(this.currentDate));
   }
 
   goToToday() {
     this.currentDate = new Date();
     this.selectedDate = new Date();
     this.generateCalendar();
+    this.visibleRangeChange.emit(CalendarComponent.visibleRange(this.currentDate));
   }
 
   get currentMonthYear(): string {
@@ -0,0 +1,10 @@
+export type ChangeTable = 'schedules' | 'consumables';
+
+export interface ChangeEvent<T = any> {
+  // 'resync': refetch `table`, or everything when table is null
+  type: 'change' | 'resync';
+  table: ChangeTable | null;
+  op?: 'insert' | 'update' | 'delete';
+  ids?: number[];
+  items?: T[];
+}
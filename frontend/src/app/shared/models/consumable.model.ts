@@ -7,6 +7,8 @@ export interface Consumable {
   notes?: string;
   created_at?: Date | string;
   updated_at?: Date | string;
+  version?: number;
+  expires_on?: Date | string;
   days_remaining?: number;
 }
 
@@ -0,0 +1,17 @@
+import { Schedule } from './schedule.model';
+import { Consumable } from './consumable.model';
+
+export interface CategoryCount {
+  category: string;
+  total: number;
+  expiring: number;
+}
+
+export interface DashboardSummary {
+  date: string;
+  timezone: string;
+  today: Schedule[];
+  upcoming: Schedule[];
+  expiring: Consumable[];
+  categories: CategoryCount[];
+}
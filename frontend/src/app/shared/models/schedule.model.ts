@@ -6,6 +6,11 @@ export interface Schedule {
   end_time?: Date | string;
   created_at?: Date | string;
   updated_at?: Date | string;
+  version?: number;
+  recurrence_rule?: string | null;
+  timezone?: string | null;
+  // Set on occurrences expanded from a recurring schedule (range / by-date)
+  occurrence_start?: Date | string | null;
 }
 
 export interface ScheduleCreateDto {
@@ -13,6 +18,8 @@ export interface ScheduleCreateDto {
   description?: string;
   start_time: string;
   end_time?: string;
+  recurrence_rule?: string | null;
+  timezone?: string | null;
 }
 
 export interface ScheduleUpdateDto {
@@ -20,4 +27,22 @@ export interface ScheduleUpdateDto {
   description?: string;
   start_time?: string;
   end_time?: string;
+  recurrence_rule?: string | null;
+  timezone?: string | null;
+}
+
+export interface ScheduleExceptionDto {
+  cancelled?: boolean;
+  title?: string;
+  description?: string;
+  start_time?: string;
+  end_time?: string;
+}
+
+export interface ScheduleException extends ScheduleExceptionDto {
+  id: number;
+  schedule_id: number;
+  original_start: Date | string;
+  created_at?: Date | string;
+  updated_at?: Date | string;
 }
@@ -0,0 +1,56 @@
+import { Injectable, OnDestroy } from '@angular/core';
+import { Observable, Subject, share } from 'rxjs';
+import { environment } from '../../../environments/environment';
+import { ChangeEvent } from '../models/change-event.model';
+
+@Injectable({
+  providedIn: 'root'
+})
+export class ChangeFeedService implements OnDestroy {
+  private streamUrl = `${environment.apiUrl}/events/stream`;
+  private destroyed$ = new Subject<void>();
+
+  // One EventSource shared by all subscribers, opened on first subscribe and closed with the last
+  readonly changes$: Observable<ChangeEvent> = new Observable<ChangeEvent>(subscriber => {
+    const source = new EventSource(this.streamUrl);
+    const emit = (type: ChangeEvent['type']) => (message: MessageEvent) => {
+      try {
+        subscriber.next({ type, ...JSON.parse(message.data) });
+      } catch (error) {
+        console.error('Invalid change event:', error);
+      }
+    };
+    source.addEventListener('change', emit('change'));
+    source.addEventListener('resync', emit('resync'));
+    // EventSource reconnects on its own and resumes from Last-Event-ID
+    source.onerror = () => console.warn('Change feed disconnected, reconnecting...');
+    const stop = this.destroyed$.subscribe(() => subscriber.complete());
+    return () => {
+      stop.unsubscribe();
+      source.close();
+    };
+  }).pipe(share());
+
+  /**
+   * Apply a change event to a local list and return the new list.
+   * `keep` filters inserted or updated rows, e.g. to the range currently shown.
+   */
+  static apply<T extends { id?: number }>(list: T[], event: ChangeEvent<T>, keep: (item: T) => boolean = () => true): T[] {
+    const ids = new Set(event.ids || []);
+    if (event.op === 'delete') {
+      return list.filter(item => !ids.has(item.id!));
+    }
+    // Updated rows keep their position; rows that no longer pass `keep` are dropped
+    const incoming = new Map((event.items || []).filter(keep).map(item => [item.id!, item] as [number, T]));
+    const known = new Set(list.map(item => item.id));
+    const next = list
+      .filter(item => !ids.has(item.id!) || incoming.has(item.id!))
+      .map(item => incoming.get(item.id!) ?? item);
+    return [...next, ...[...incoming.values()].filter(item => !known.has(item.id))];
+  }
+
+  ngOnDestroy(): void {
+    this.destroyed$.next();
+    this.destroyed$.complete();
+  }
+}
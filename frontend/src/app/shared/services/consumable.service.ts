@@ -1,5 +1,5 @@
 import { Injectable } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable } from 'rxjs';
 import { environment } from '../../../environments/environment';
 import { Consumable, ConsumableCreateDto, ConsumableUpdateDto } from '../models/consumable.model';
@@ -16,6 +16,15 @@ export class ConsumableService {
     return this.http.get<Consumable[]>(this.apiUrl);
   }
 
+  getExpiringConsumables(withinDays = 14, category?: string): Observable<Consumable[]> {
+    // Filtering and soonest-first ordering are done by the backend
+    let params = new HttpParams().set('within_days', withinDays);
+    if (category) {
+      params = params.set('category', category);
+    }
+    return this.http.get<Consumable[]>(`${this.apiUrl}expiring`, { params });
+  }
+
   getConsumable(id: number): Observable<Consumable> {
     return this.http.get<Consumable>(`${this.apiUrl}${id}`);
   }
@@ -0,0 +1,22 @@
+import { Injectable } from '@angular/core';
+import { HttpClient, HttpParams } from '@angular/common/http';
+import { Observable } from 'rxjs';
+import { environment } from '../../../environments/environment';
+import { DashboardSummary } from '../models/dashboard.model';
+
+@Injectable({
+  providedIn: 'root'
+})
+export class DashboardService {
+  private apiUrl = `${environment.apiUrl}/dashboard/`;
+
+  constructor(private http: HttpClient) {}
+
+  getSummary(withinDays = 14): Observable<DashboardSummary> {
+    // Today's agenda, upcoming events and expiring consumables in one response
+    const params = new HttpParams()
+      .set('tz', Intl.DateTimeFormat().resolvedOptions().timeZone)
+      .set('within_days', withinDays);
+    return this.http.get<DashboardSummary>(`${this.apiUrl}summary`, { params });
+  }
+}
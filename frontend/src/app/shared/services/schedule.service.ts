@@ -1,5 +1,5 @@
 import { Injectable } from '@angular/core';
-import { HttpClient } from '@angular/common/http';
+import { HttpClient, HttpParams } from '@angular/common/http';
 import { Observable, of, catchError, map } from 'rxjs';
 import { environment } from '../../../environments/environment';
 import { Schedule, ScheduleCreateDto, ScheduleUpdateDto } from '../models/schedule.model';
@@ -22,6 +22,22 @@ export class ScheduleService {
     );
   }
 
+  getSchedulesInRange(start: Date, end: Date): Observable<Schedule[]> {
+    // Server returns every schedule overlapping [start, end), bucketed in the browser's timezone
+    const params = new HttpParams()
+      .set('start', start.toISOString())
+      .set('end', end.toISOString())
+      .set('tz', Intl.DateTimeFormat().resolvedOptions().timeZone);
+
+    return this.http.get<Schedule[]>(`${this.apiUrl}range`, { params }).pipe(
+      map(data => Array.isArray(data) ? data : []),
+      catchError(error => {
+        console.error('Error fetching schedules in range:', error);
+        return of([]);
+      })
+    );
+  }
+
   getSchedule(id: number): Observable<Schedule> {
     return this.http.get<Schedule>(`${this.apiUrl}${id}`);
   }
@@ -0,0 +1,128 @@
+#!/usr/bin/env python3
+"""
+Serialization Micro-benchmark
+回應序列化效能測試
+
+Per-row cost of turning 10k consumables into a JSON response body, comparing the
+old path (hand-built dict per row, re-validated, then stdlib json or orjson)
+with the current one (cached TypeAdapter validating ORM objects via
+from_attributes and dumping JSON bytes in pydantic-core).
+
+No database is needed; rows are transient ORM objects.
+
+Usage: python scripts/benchmark_serialization.py [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import json
+import sys
+import timeit
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import List
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "backend"))
+
+from pydantic import TypeAdapter  # noqa: E402
+
+from app.models.consumable import Consumable  # noqa: E402
+from app.api.consumables import ConsumableResponse  # noqa: E402
+from app.api.serialization import dump_json, type_adapter  # noqa: E402
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def make_rows(count: int) -> List[Consumable]:
+    now = datetime.now(timezone.utc)
+    rows = []
+    for i in range(count):
+        installed = date(2025, 1, 1) + timedelta(days=i % 365)
+        rows.append(Consumable(
+            id=i + 1,
+            name=f"冷氣濾網 {i}",
+            category=("濾網", "電池", "燈泡")[i % 3],
+            installation_date=installed,
+            lifetime_days=90 + i % 200,
+            expires_on=installed + timedelta(days=90 + i % 200),
+            notes="客廳" if i % 2 else None,
+            created_at=now,
+            updated_at=now,
+            version=1,
+        ))
+    return rows
+
+
+def legacy_to_response(item: Consumable) -> dict:
+    # The hand-built dict the consumables handlers returned before
+    days_remaining = max(0, item.lifetime_days - (date.today() - item.installation_date).days)
+    return {
+        "id": item.id,
+        "name": item.name,
+        "category": item.category,
+        "installation_date": item.installation_date,
+        "lifetime_days": item.lifetime_days,
+        "notes": item.notes,
+        "created_at": item.created_at,
+        "updated_at": item.updated_at,
+        "expires_on": item.expires_on,
+        "days_remaining": days_remaining,
+        "version": item.version,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    response_type = List[ConsumableResponse]
+    adapter = type_adapter(response_type)
+
+    def before_stdlib_json():
+        # FastAPI re-validates the dicts against the response model, then JSONResponse uses json.dumps
+        validated = adapter.validate_python([legacy_to_response(item) for item in rows])
+        return json.dumps(adapter.dump_python(validated, mode="json"), ensure_ascii=False).encode()
+
+    def before_orjson():
+        validated = adapter.validate_python([legacy_to_response(item) for item in rows])
+        return orjson.dumps(adapter.dump_python(validated, mode="json"))
+
+    def after_uncached_adapter():
+        fresh = TypeAdapter(response_type)
+        return fresh.dump_json(fresh.validate_python(rows, from_attributes=True))
+
+    def after_cached_adapter():
+        return dump_json(response_type, rows)
+
+    cases = [
+        ("before: dict rows + json.dumps", before_stdlib_json),
+        ("before: dict rows + orjson", before_orjson if orjson else None),
+        ("after: from_attributes, new TypeAdapter", after_uncached_adapter),
+        ("after: from_attributes, cached TypeAdapter", after_cached_adapter),
+    ]
+
+    # Every path must produce the same document
+    reference = json.loads(after_cached_adapter())
+    for name, case in cases:
+        if case is not None and json.loads(case()) != reference:
+            raise SystemExit(f"{name} produced a different response")
+
+    print(f"🏠 Serializing {args.rows} consumables (best of {args.repeat})")
+    print("=" * 72)
+    baseline = None
+    for name, case in cases:
+        if case is None:
+            print(f"{name:<45} skipped (pip install orjson)")
+            continue
+        best = min(timeit.repeat(case, number=1, repeat=args.repeat))
+        baseline = baseline or best
+        print(f"{name:<45} {best * 1000:8.1f} ms  {best / args.rows * 1e6:6.2f} µs/row  {baseline / best:5.2f}x")
+
+
+if __name__ == "__main__":
+    main()